@@ -10,18 +10,106 @@ class Settings(BaseSettings):
     # API Keys
     OPENAI_API_KEY: str
 
+    # LLM Settings
+    OPENAI_BASE_URL: Optional[str] = None  # OpenAI 호환 서버 사용 시 지정
+    LLM_MODEL: str = "gpt-4o-mini"
+    LLM_MAX_CONCURRENCY: int = 64  # 워커 프로세스당 동시 LLM 호출 수
+    LLM_MAX_CONNECTIONS: int = 100  # HTTP 커넥션 풀 크기
+    LLM_TIMEOUT: float = 60.0  # 초 단위
+    LLM_CACHE_ENABLED: bool = True  # 초안 생성 응답 캐시
+    LLM_CACHE_PATH: str = str(BASE_DIR / ".cache" / "llm_cache.sqlite3")
+    LLM_CACHE_MAX_ENTRIES: int = 10000
+    LLM_CACHE_TTL: int = 86400  # 초 단위
+    LLM_DEADLINE: float = 45.0  # 재시도/fallback을 포함한 호출 전체 제한 시간 (초)
+    LLM_HEDGE_PERCENTILE: float = 95.0  # 최근 응답 시간의 이 백분위를 넘기면 hedge 요청, 0이면 사용 안 함
+    LLM_HEDGE_MIN_DELAY: float = 1.0  # hedge 요청을 보내기 전 최소 대기 시간 (초)
+    LLM_HEDGE_BUDGET: float = 0.1  # 전체 호출 중 hedge를 보낼 수 있는 비율
+    LLM_FALLBACK_MODELS: str = ""  # "gpt-4o,gpt-4.1-mini" 형식
+    LLM_BREAKER_FAILURES: int = 5  # 연속 실패 시 circuit open
+    LLM_BREAKER_COOLDOWN: float = 30.0  # 초 단위
+
+    @property
+    def LLM_FALLBACK_MODELS_LIST(self) -> List[str]:
+        return [m.strip() for m in self.LLM_FALLBACK_MODELS.split(',') if m.strip()]
+
+    # Admission Control Settings
+    ADMISSION_USER_RATE: float = 1.0  # 사용자(비로그인은 IP)별 초당 LLM 요청 수
+    ADMISSION_USER_BURST: int = 20  # 순간적으로 허용하는 요청 수
+    ADMISSION_QUEUE_TIMEOUT: float = 5.0  # LLM 슬롯 대기 시간 상한 (초), 넘기면 429
+
+    # Context Window Settings
+    CONTEXT_TOKEN_BUDGET: int = 6000  # system + 요약 + 최근 대화 토큰 상한
+    CONTEXT_SUMMARY_MAX_TOKENS: int = 500
+    CONTEXT_SUMMARY_MODEL: str = "gpt-4o-mini"
+
+    # Draft Retrieval Settings
+    RETRIEVAL_ENABLED: bool = True  # 초안 생성 시 같은 case_type/doc_type의 기존 초안 발췌를 참고로 제공
+    RETRIEVAL_INDEX_PATH: str = str(BASE_DIR / "data" / "draft_index.jsonl")  # 빈 값이면 메모리에만 유지
+    RETRIEVAL_TOP_K: int = 3
+    RETRIEVAL_TOKEN_BUDGET: int = 800  # 참고 발췌 전체 토큰 상한
+    RETRIEVAL_PASSAGE_CHARS: int = 400  # 색인 단위 문단 최대 글자 수
+    RETRIEVAL_MAX_DRAFTS: int = 1000  # case_type/doc_type별로 색인해 두는 최근 초안 수
+
+    # Search Settings
+    SEARCH_CANDIDATE_LIMIT: int = 1000  # 검색 시 source별로 점수를 매기는 최근 일치 항목 수
+
     # Database
     POSTGRES_USER: str
     POSTGRES_PASSWORD: str
     POSTGRES_HOST: str
     POSTGRES_PORT: str
     POSTGRES_DB: str
+
+    # Connection Pool Settings (비동기 엔진)
+    DB_POOL_SIZE: int = 10  # 워커 프로세스당 유지하는 커넥션 수
+    DB_MAX_OVERFLOW: int = 20  # 풀이 모두 사용 중일 때 추가로 여는 커넥션 수
+    DB_POOL_TIMEOUT: float = 10.0  # 커넥션을 받기까지 기다리는 시간 상한 (초)
+    DB_POOL_RECYCLE: int = 1800  # 이 시간(초)보다 오래된 커넥션은 다시 연결, -1이면 사용 안 함
+    DB_POOL_PRE_PING: bool = True  # 커넥션을 꺼낼 때 살아있는지 확인 (failover 후 끊긴 커넥션 제거)
+    DB_STATEMENT_TIMEOUT_MS: int = 30000  # 문장별 실행 시간 상한, 0이면 사용 안 함
+    DB_SLOW_QUERY_MS: int = 500  # 이 시간 이상 걸린 쿼리를 로그/메트릭에 기록, 0이면 사용 안 함
+    DB_BULK_STATEMENT_TIMEOUT_MS: int = 0  # /bulk 내보내기/가져오기(COPY) 트랜잭션의 실행 시간 상한, 0이면 사용 안 함
+    DB_PGBOUNCER: bool = False  # pgbouncer transaction mode 뒤에서 실행 (풀링을 pgbouncer에 맡김)
     
     # Computed Database URL
     @property
     def DATABASE_URL(self) -> str:
         return f"postgresql://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
 
+    # 비동기 드라이버(asyncpg)용 URL
+    @property
+    def ASYNC_DATABASE_URL(self) -> str:
+        return f"postgresql+asyncpg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
+
+    # Cache Settings
+    CHAT_HISTORY_CACHE_SESSIONS: int = 1000
+    CHAT_HISTORY_CACHE_TTL: int = 1800  # 초 단위
+    CHAT_HISTORY_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    PROMPT_REFRESH_INTERVAL: int = 300  # 초 단위, 0이면 주기적 재적재 안 함
+    PRINCIPAL_CACHE_SIZE: int = 10000
+    PRINCIPAL_CACHE_TTL: int = 300  # 초 단위, 다른 워커의 변경이 반영되는 최대 지연
+    USER_NAME_CACHE_SIZE: int = 50000
+    USER_NAME_CACHE_TTL: int = 300  # 초 단위
+
+    # Draft Revision Settings
+    DRAFT_SNAPSHOT_INTERVAL: int = 10  # N개 revision마다 전체 스냅샷 저장
+
+    # Job Queue Settings
+    JOB_BACKEND: str = "postgres"  # "postgres" 또는 "memory" (테스트/단일 프로세스용)
+    JOB_WORKERS: int = 4  # 워커 프로세스당 동시에 실행할 작업 수
+    JOB_POLL_INTERVAL: float = 1.0  # 초 단위
+    JOB_STALE_SECONDS: int = 60  # heartbeat가 이 시간 이상 끊기면 작업을 다시 실행
+    JOB_MAX_ATTEMPTS: int = 3
+
+    # Internal API Settings
+    BULK_API_TOKEN: Optional[str] = None  # X-Bulk-Token 헤더 값, 설정하지 않으면 /bulk API 비활성화
+    SUPPORT_API_TOKEN: Optional[str] = None  # X-Support-Token 헤더 값, 설정하지 않으면 /search API 비활성화
+
+    # OAuth Settings
+    OAUTH_TIMEOUT: float = 5.0  # 초 단위
+    OAUTH_MAX_CONNECTIONS: int = 20  # 제공자별 커넥션 풀 크기
+    OAUTH_TOKEN_CACHE_TTL: int = 300  # 검증된 토큰 캐시 유지 시간 (초)
+
     # JWT Settings
     JWT_SECRET_KEY: str
     JWT_ALGORITHM: str
@@ -1,17 +1,43 @@
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 from app.core.config import get_settings
+from app.database.pool import async_engine_options, install_query_monitor, pool_status, session_class
+from app.utils.metrics import Gauge, registry
 
 settings = get_settings()
 
-engine = create_engine(settings.DATABASE_URL)
+# 동기 엔진 (마이그레이션/스크립트용, 오래 걸리는 DDL이 있으므로 statement_timeout 없음)
+engine = create_engine(settings.DATABASE_URL, pool_pre_ping=settings.DB_POOL_PRE_PING)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# 비동기 엔진 (API 요청용, 풀 설정은 app.database.pool 참고)
+async_engine = create_async_engine(settings.ASYNC_DATABASE_URL, **async_engine_options(settings))
+install_query_monitor(async_engine.sync_engine, settings)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    autoflush=False,
+    expire_on_commit=False,
+    sync_session_class=session_class(settings),
+)
+
+def _pool_stats():
+    status = pool_status(async_engine.pool)
+    return {
+        (state,): status[state]
+        for state in ("size", "checked_out", "checked_in", "overflow")
+        if state in status
+    }
+
+registry.register(Gauge(
+    "db_pool_connections",
+    "비동기 엔진 커넥션 풀 상태",
+    ("state",),
+    collect=_pool_stats,
+))
+
 # Dependency to get DB session
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close() 
\ No newline at end of file
+async def get_db():
+    async with AsyncSessionLocal() as db:
+        yield db
\ No newline at end of file
@@ -0,0 +1,187 @@
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.core.config import get_settings
+
+# 메시지 dict 하나당 content 외에 차지하는 대략적인 메모리 (bytes)
+MESSAGE_OVERHEAD_BYTES = 256
+
+
+def _message_size(message: Dict) -> int:
+    return len(str(message.get("content", "")).encode("utf-8")) + MESSAGE_OVERHEAD_BYTES
+
+
+class ChatHistoryCache:
+    """
+    세션별 대화 기록 write-through 캐시
+
+    - 최근에 사용한 세션 순으로 유지 (LRU)
+    - 마지막 사용 후 ttl 초가 지나면 만료
+    - 세션 수와 메시지 content 총량(bytes) 상한을 넘으면 오래된 세션부터 제거
+    - 워커별 캐시이므로 조회하는 쪽(get_chat_history)이 DB의 메시지 수/마지막 id와 비교해 검증
+    """
+
+    def __init__(self, max_sessions: int = 1000, ttl: float = 1800, max_bytes: int = 64 * 1024 * 1024):
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Dict]" = OrderedDict()
+        self._bytes = 0
+
+    def get(self, session_id) -> Optional[List[Dict]]:
+        key = str(session_id)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry["expires_at"] < time.monotonic():
+            self._remove(key)
+            return None
+        entry["expires_at"] = time.monotonic() + self.ttl
+        self._entries.move_to_end(key)
+        return list(entry["messages"])
+
+    def set(self, session_id, messages: List[Dict]):
+        key = str(session_id)
+        self._remove(key)
+        size = sum(_message_size(m) for m in messages)
+        self._entries[key] = {
+            "messages": list(messages),
+            "size": size,
+            "expires_at": time.monotonic() + self.ttl,
+        }
+        self._bytes += size
+        self._evict()
+
+    def append(self, session_id, message: Dict):
+        """캐시된 세션에만 추가 (캐시에 없는 세션은 다음 조회 때 DB에서 채움)"""
+        key = str(session_id)
+        entry = self._entries.get(key)
+        if entry is None:
+            return
+        size = _message_size(message)
+        entry["messages"].append(message)
+        entry["size"] += size
+        entry["expires_at"] = time.monotonic() + self.ttl
+        self._bytes += size
+        self._entries.move_to_end(key)
+        self._evict()
+
+    def invalidate(self, session_id):
+        self._remove(str(session_id))
+
+    def clear(self):
+        self._entries.clear()
+        self._bytes = 0
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry["size"]
+
+    def _evict(self):
+        while self._entries and (
+            len(self._entries) > self.max_sessions or self._bytes > self.max_bytes
+        ):
+            _, entry = self._entries.popitem(last=False)
+            self._bytes -= entry["size"]
+
+
+class LRUCache:
+    """키 수 상한과 TTL이 있는 단순 LRU 캐시"""
+
+    def __init__(self, max_entries: int = 10000, ttl: float = 300):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[object, tuple]" = OrderedDict()
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key, value):
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key):
+        self._entries.pop(key, None)
+
+    def clear(self):
+        self._entries.clear()
+
+
+class PromptRegistry:
+    """
+    doc_prompts 테이블 전체를 메모리에 올려두고 (case_type, doc_type)으로 조회
+
+    테이블이 작고 거의 바뀌지 않으므로 기동 시 한 번 적재하고,
+    create/update/delete 시 갱신하며, 다중 워커 환경에서는 주기적으로 다시 적재합니다.
+    """
+
+    def __init__(self):
+        self._by_id: Dict[int, Dict] = {}
+        self._by_key: Dict[Tuple[str, str], Dict] = {}
+        self.loaded = False
+        self.loaded_at: Optional[float] = None
+
+    def get(self, case_type: str, doc_type: str) -> Optional[Dict]:
+        return self._by_key.get((case_type, doc_type))
+
+    def load(self, prompts: Iterable[Dict]):
+        by_id = {prompt["id"]: prompt for prompt in prompts}
+        self._by_id = by_id
+        self._by_key = self._build_index(by_id)
+        self.loaded = True
+        self.loaded_at = time.monotonic()
+
+    def put(self, prompt: Dict):
+        self._by_id[prompt["id"]] = prompt
+        self._by_key = self._build_index(self._by_id)
+
+    def remove(self, prompt_id: int):
+        if self._by_id.pop(prompt_id, None) is not None:
+            self._by_key = self._build_index(self._by_id)
+
+    def invalidate(self):
+        self.loaded = False
+
+    @staticmethod
+    def _build_index(by_id: Dict[int, Dict]) -> Dict[Tuple[str, str], Dict]:
+        # 같은 (case_type, doc_type)이 여러 개면 id가 가장 작은 것을 사용
+        index = {}
+        for prompt_id in sorted(by_id):
+            prompt = by_id[prompt_id]
+            index.setdefault((prompt["case_type"], prompt["doc_type"]), prompt)
+        return index
+
+
+settings = get_settings()
+
+chat_history_cache = ChatHistoryCache(
+    max_sessions=settings.CHAT_HISTORY_CACHE_SESSIONS,
+    ttl=settings.CHAT_HISTORY_CACHE_TTL,
+    max_bytes=settings.CHAT_HISTORY_CACHE_MAX_BYTES,
+)
+
+prompt_registry = PromptRegistry()
+
+# user_id → 인증 principal (users + attorney_verifications)
+principal_cache = LRUCache(
+    max_entries=settings.PRINCIPAL_CACHE_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL,
+)
+
+# user_id → 이름 (사건 목록의 당사자 이름 표시용)
+user_name_cache = LRUCache(
+    max_entries=settings.USER_NAME_CACHE_SIZE,
+    ttl=settings.USER_NAME_CACHE_TTL,
+)
@@ -1,6 +1,13 @@
+from app.utils.metrics import instrument_crud_module
+from . import auth, cases, chat, doc_prompts, documents, jobs, search, users
+
+# 각 CRUD 함수의 실행 시간을 db_query_duration_seconds{function="모듈.함수"}로 기록
+for _module in (auth, cases, chat, doc_prompts, documents, jobs, search, users):
+    instrument_crud_module(_module)
+
 from .users import *
 from .doc_prompts import *
 from .cases import *
 
 # For convenience, you can still import everything from crud
-# Example: from app.database.crud import get_user, create_case 
\ No newline at end of file
+# Example: from app.database.crud import get_user, create_case
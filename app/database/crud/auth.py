@@ -1,24 +1,26 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 from app.models.auth import OAuthAccount, AttorneyVerification
 from app.models.users import User
 from typing import Optional, List, Dict
 from datetime import datetime
+from app.database.pagination import decode_created_at_cursor, make_page
+from app.database.cache import principal_cache
 
 # OAuth Account CRUD
-def get_oauth_account(db: Session, provider: str, provider_account_id: str) -> Optional[Dict]:
+async def get_oauth_account(db: AsyncSession, provider: str, provider_account_id: str) -> Optional[Dict]:
     query = text("""
         SELECT * FROM oauth_accounts 
         WHERE provider = :provider 
         AND provider_account_id = :provider_account_id
     """)
-    result = db.execute(
+    result = (await db.execute(
         query, 
         {"provider": provider, "provider_account_id": provider_account_id}
-    ).first()
-    return dict(result) if result else None
+    )).first()
+    return dict(result._mapping) if result else None
 
-def create_oauth_account(db: Session, user_id: int, oauth_data: dict) -> Dict:
+async def create_oauth_account(db: AsyncSession, user_id: int, oauth_data: dict) -> Dict:
     query = text("""
         INSERT INTO oauth_accounts (
             user_id, provider, provider_account_id, provider_data,
@@ -29,7 +31,7 @@ def create_oauth_account(db: Session, user_id: int, oauth_data: dict) -> Dict:
         ) RETURNING *
     """)
     
-    result = db.execute(
+    result = (await db.execute(
         query,
         {
             "user_id": user_id,
@@ -39,12 +41,12 @@ def create_oauth_account(db: Session, user_id: int, oauth_data: dict) -> Dict:
             "created_at": datetime.now(),
             "updated_at": datetime.now()
         }
-    ).first()
+    )).first()
     
-    db.commit()
-    return dict(result)
+    await db.commit()
+    return dict(result._mapping)
 
-def update_oauth_account(db: Session, oauth_id: int, oauth_data: dict) -> Optional[Dict]:
+async def update_oauth_account(db: AsyncSession, oauth_id: int, oauth_data: dict) -> Optional[Dict]:
     query = text("""
         UPDATE oauth_accounts 
         SET provider_data = :provider_data,
@@ -53,36 +55,36 @@ def update_oauth_account(db: Session, oauth_id: int, oauth_data: dict) -> Option
         RETURNING *
     """)
     
-    result = db.execute(
+    result = (await db.execute(
         query,
         {
             "provider_data": oauth_data.get("provider_data", {}),
             "updated_at": datetime.now(),
             "oauth_id": oauth_id
         }
-    ).first()
+    )).first()
     
-    db.commit()
-    return dict(result) if result else None
+    await db.commit()
+    return dict(result._mapping) if result else None
 
 # Attorney Verification CRUD
-def get_attorney_verification(db: Session, user_id: int) -> Optional[Dict]:
+async def get_attorney_verification(db: AsyncSession, user_id: int) -> Optional[Dict]:
     query = text("""
         SELECT * FROM attorney_verifications
         WHERE user_id = :user_id
     """)
-    result = db.execute(query, {"user_id": user_id}).first()
-    return dict(result) if result else None
+    result = (await db.execute(query, {"user_id": user_id})).first()
+    return dict(result._mapping) if result else None
 
-def get_attorney_by_license(db: Session, license_number: str) -> Optional[Dict]:
+async def get_attorney_by_license(db: AsyncSession, license_number: str) -> Optional[Dict]:
     query = text("""
         SELECT * FROM attorney_verifications
         WHERE license_number = :license_number
     """)
-    result = db.execute(query, {"license_number": license_number}).first()
-    return dict(result) if result else None
+    result = (await db.execute(query, {"license_number": license_number})).first()
+    return dict(result._mapping) if result else None
 
-def create_attorney_verification(db: Session, verification_data: dict) -> Dict:
+async def create_attorney_verification(db: AsyncSession, verification_data: dict) -> Dict:
     query = text("""
         INSERT INTO attorney_verifications (
             user_id, license_number, bar_association, law_firm,
@@ -93,7 +95,7 @@ def create_attorney_verification(db: Session, verification_data: dict) -> Dict:
         ) RETURNING *
     """)
     
-    result = db.execute(
+    result = (await db.execute(
         query,
         {
             "user_id": verification_data["user_id"],
@@ -105,13 +107,14 @@ def create_attorney_verification(db: Session, verification_data: dict) -> Dict:
             "created_at": datetime.now(),
             "updated_at": datetime.now()
         }
-    ).first()
+    )).first()
     
-    db.commit()
-    return dict(result)
+    await db.commit()
+    principal_cache.invalidate(verification_data["user_id"])
+    return dict(result._mapping)
 
-def update_verification_status(
-    db: Session, 
+async def update_verification_status(
+    db: AsyncSession, 
     user_id: int, 
     status: str, 
     rejection_reason: Optional[str] = None
@@ -126,7 +129,7 @@ def update_verification_status(
         RETURNING *
     """)
     
-    result = db.execute(
+    result = (await db.execute(
         query,
         {
             "status": status,
@@ -135,19 +138,26 @@ def update_verification_status(
             "updated_at": datetime.now(),
             "user_id": user_id
         }
-    ).first()
+    )).first()
     
-    db.commit()
-    return dict(result) if result else None
+    await db.commit()
+    principal_cache.invalidate(user_id)
+    return dict(result._mapping) if result else None
 
-def get_pending_verifications(db: Session, skip: int = 0, limit: int = 100) -> List[Dict]:
-    query = text("""
+async def get_pending_verifications(db: AsyncSession, cursor: Optional[str] = None, limit: int = 100) -> Dict:
+    params = {"limit": limit + 1}
+    cursor_clause = ""
+    if cursor:
+        params["cursor_created_at"], params["cursor_id"] = decode_created_at_cursor(cursor)
+        cursor_clause = "AND (created_at, id) < (:cursor_created_at, :cursor_id)"
+
+    query = text(f"""
         SELECT * FROM attorney_verifications
         WHERE verification_status = 'pending'
-        ORDER BY created_at DESC
-        OFFSET :skip
+        {cursor_clause}
+        ORDER BY created_at DESC, id DESC
         LIMIT :limit
     """)
     
-    results = db.execute(query, {"skip": skip, "limit": limit}).fetchall()
-    return [dict(row) for row in results] 
\ No newline at end of file
+    results = (await db.execute(query, params)).fetchall()
+    return make_page([dict(row._mapping) for row in results], limit, ("created_at", "id")) 
\ No newline at end of file
@@ -0,0 +1,186 @@
+import asyncio
+import json
+from typing import AsyncIterator, Dict, List, Sequence
+
+from asyncpg.exceptions import PostgresError
+from sqlalchemy import JSON, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.database.cache import chat_history_cache, principal_cache, user_name_cache
+from app.utils.bulk import encode_csv_row
+
+settings = get_settings()
+
+# 내보내기/가져오기 가능한 테이블: 컬럼, 내보내기 정렬 순서(인덱스 순서), JSON 컬럼,
+# 명시적으로 요청할 때만 내보내는 민감 컬럼
+BULK_TABLES: Dict[str, Dict] = {
+    "users": {
+        "columns": ("id", "email", "password", "name", "user_type", "subscription_type", "created_at", "updated_at"),
+        "order": "id",
+        "json": (),
+        "secret": ("password",),
+    },
+    "cases": {
+        "columns": ("id", "case_type", "plaintiff_id", "defendant_id", "assigned_attorney_id", "status", "created_at", "updated_at"),
+        "order": "id",
+        "json": (),
+    },
+    "chat_sessions": {
+        "columns": ("id", "context_data", "created_at", "updated_at"),
+        "order": "id",
+        "json": ("context_data",),
+    },
+    "chat_messages": {
+        "columns": ("id", "session_id", "role", "content", "created_at"),
+        "order": "session_id, created_at",
+        "json": (),
+    },
+}
+
+def get_bulk_table(table: str) -> Dict:
+    spec = BULK_TABLES.get(table)
+    if spec is None:
+        raise ValueError(f"Unsupported table: {table}")
+    return spec
+
+def validate_columns(table: str, columns: Sequence[str]) -> List[str]:
+    allowed = get_bulk_table(table)["columns"]
+    unknown = [column for column in columns if column not in allowed]
+    if unknown or not columns:
+        raise ValueError(f"Unknown columns for {table}: {', '.join(unknown) or '(none)'}")
+    return list(columns)
+
+async def set_bulk_statement_timeout(db: AsyncSession):
+    """
+    테이블 전체를 읽고 쓰는 COPY는 DB_STATEMENT_TIMEOUT_MS(일반 요청용)보다 오래 걸리므로
+    이 트랜잭션에서만 DB_BULK_STATEMENT_TIMEOUT_MS로 바꿈 (SET LOCAL은 트랜잭션이 끝나면 원래대로)
+    """
+    await db.execute(text(f"SET LOCAL statement_timeout = {int(settings.DB_BULK_STATEMENT_TIMEOUT_MS)}"))
+
+def export_query(table: str, include_secrets: bool = False) -> str:
+    spec = get_bulk_table(table)
+    secret = () if include_secrets else spec.get("secret", ())
+    columns = [column for column in spec["columns"] if column not in secret]
+    return f"SELECT {', '.join(columns)} FROM {table} ORDER BY {spec['order']}"
+
+async def stream_rows(
+    db: AsyncSession, table: str, batch_size: int = 1000, include_secrets: bool = False
+) -> AsyncIterator[List[Dict]]:
+    """server-side cursor로 batch_size건씩 읽어 dict 목록으로 내보냄"""
+    spec = get_bulk_table(table)
+    query = text(export_query(table, include_secrets)).columns(**{column: JSON for column in spec["json"]})
+    await set_bulk_statement_timeout(db)
+    result = await db.stream(query.execution_options(yield_per=batch_size))
+    async for partition in result.partitions(batch_size):
+        yield [dict(row._mapping) for row in partition]
+
+async def stream_csv(db: AsyncSession, table: str, include_secrets: bool = False) -> AsyncIterator[bytes]:
+    """COPY (SELECT ...) TO STDOUT (FORMAT csv, HEADER)의 출력을 청크 단위로 내보냄"""
+    query = export_query(table, include_secrets)
+    await set_bulk_statement_timeout(db)
+    sa_connection = await db.connection()
+    connection = await sa_connection.get_raw_connection()
+    chunks: asyncio.Queue = asyncio.Queue(maxsize=16)  # 소비가 느리면 COPY도 기다림
+
+    async def sink(chunk: bytes):
+        await chunks.put(chunk)
+
+    async def copy():
+        try:
+            await connection.driver_connection.copy_from_query(query, output=sink, format="csv", header=True)
+        except asyncio.CancelledError:
+            raise  # 소비 쪽이 먼저 끝나 취소됨: 기다리는 쪽이 없으므로 종료 표시를 넣지 않음
+        except BaseException:
+            await chunks.put(None)
+            raise
+        await chunks.put(None)
+
+    task = asyncio.create_task(copy())
+    finished = False
+    try:
+        while True:
+            chunk = await chunks.get()
+            if chunk is None:
+                break
+            yield chunk
+        await task
+        finished = True
+    finally:
+        if not finished:
+            # 클라이언트가 끊겼거나 COPY가 실패함: 세션이 닫히기 전에 태스크를 끝내고,
+            # COPY 도중에 멈춘 커넥션은 풀에 돌려보내지 않음
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            await sa_connection.invalidate()
+
+async def copy_csv(db: AsyncSession, table: str, columns: Sequence[str], source: AsyncIterator[bytes]) -> int:
+    """
+    CSV 본문(헤더 제외)을 COPY ... FROM STDIN으로 한 번에 적재하고 commit. 적재한 행 수를 반환
+    id를 직접 넣은 경우 시퀀스를 최댓값 이후로 맞춘다. 실패하면 전체를 rollback하고 ValueError
+    """
+    columns = validate_columns(table, columns)
+    await set_bulk_statement_timeout(db)
+    connection = await (await db.connection()).get_raw_connection()
+    try:
+        status = await connection.driver_connection.copy_to_table(
+            table, source=source, columns=columns, format="csv"
+        )
+        if "id" in columns:
+            await db.execute(text(f"""
+                SELECT setval(pg_get_serial_sequence('{table}', 'id'), COALESCE((SELECT max(id) FROM {table}), 1))
+            """))
+    except (PostgresError, DBAPIError, ValueError) as exc:  # ValueError: source에서 잘못된 행
+        await db.rollback()
+        raise ValueError(str(exc))
+
+    await db.commit()
+    if table == "chat_messages":
+        chat_history_cache.clear()
+    elif table == "users":
+        # 덮어쓴 사용자 정보가 캐시에 남지 않도록
+        principal_cache.clear()
+        user_name_cache.clear()
+    return int(status.split()[-1])
+
+async def import_rows(
+    db: AsyncSession,
+    table: str,
+    rows: AsyncIterator[Dict],
+    batch_size: int = 1000
+) -> int:
+    """
+    dict 스트림을 CSV로 바꿔 COPY로 적재 (컬럼은 첫 행의 키 기준, 없는 키는 NULL)
+    batch_size건씩 묶어 COPY에 전달하므로 메모리 사용량은 batch 크기로 제한된다
+    """
+    iterator = rows.__aiter__()
+    try:
+        first = await iterator.__anext__()
+    except StopAsyncIteration:
+        return 0
+    if not isinstance(first, dict):
+        raise ValueError(f"Row must be a JSON object: {first!r}"[:500])
+    columns = validate_columns(table, list(first.keys()))
+    json_columns = set(get_bulk_table(table)["json"])
+
+    def encode(row: Dict) -> str:
+        if not isinstance(row, dict) or set(row) - set(columns):
+            raise ValueError(f"Row does not match columns {columns}: {row!r}"[:500])
+        return encode_csv_row([
+            json.dumps(row.get(column), ensure_ascii=False) if column in json_columns and row.get(column) is not None
+            else row.get(column)
+            for column in columns
+        ])
+
+    async def source() -> AsyncIterator[bytes]:
+        batch = [encode(first)]
+        async for row in iterator:
+            batch.append(encode(row))
+            if len(batch) >= batch_size:
+                yield "".join(batch).encode("utf-8")
+                batch = []
+        if batch:
+            yield "".join(batch).encode("utf-8")
+
+    return await copy_csv(db, table, columns, source())
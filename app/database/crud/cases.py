@@ -1,66 +1,111 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Iterable
 from datetime import datetime
+from app.database.pagination import decode_created_at_cursor, make_page
+from app.database.cache import user_name_cache
 
-def get_case(db: Session, case_id: int) -> Optional[Dict]:
-    query = text("""
-        SELECT c.*, 
-               p.name as plaintiff_name,
-               d.name as defendant_name,
-               a.name as attorney_name
-        FROM cases c
-        LEFT JOIN users p ON c.plaintiff_id = p.id
-        LEFT JOIN users d ON c.defendant_id = d.id
-        LEFT JOIN users a ON c.assigned_attorney_id = a.id
-        WHERE c.id = :case_id
-    """)
-    result = db.execute(query, {"case_id": case_id}).first()
-    return dict(result) if result else None
+# 사건 목록/상세 공통 SELECT. 당사자 이름은 JOIN 대신 resolve_user_names로 한 번에 채운다
+CASE_COLUMNS = "c.*"
+CASE_ORDER = "ORDER BY c.created_at DESC, c.id DESC"
 
-def get_user_cases(db: Session, user_id: int, skip: int = 0, limit: int = 100) -> List[Dict]:
-    query = text("""
-        SELECT c.*, 
-               p.name as plaintiff_name,
-               d.name as defendant_name,
-               a.name as attorney_name
+def build_case_query(where: str, cursor: Optional[str], limit: int, params: Dict) -> str:
+    """
+    WHERE 조건에 (created_at, id) keyset cursor와 LIMIT을 붙인 사건 목록 쿼리를 만든다
+    params에 cursor/limit 값이 추가된다 (cursor 형식이 잘못되면 ValueError)
+    """
+    cursor_clause = ""
+    if cursor:
+        params["cursor_created_at"], params["cursor_id"] = decode_created_at_cursor(cursor)
+        cursor_clause = "AND (c.created_at, c.id) < (:cursor_created_at, :cursor_id)"
+    params["limit"] = limit + 1
+    return f"""
+        SELECT {CASE_COLUMNS}
         FROM cases c
-        LEFT JOIN users p ON c.plaintiff_id = p.id
-        LEFT JOIN users d ON c.defendant_id = d.id
-        LEFT JOIN users a ON c.assigned_attorney_id = a.id
-        WHERE c.plaintiff_id = :user_id
-        ORDER BY c.created_at DESC
-        OFFSET :skip
+        WHERE {where}
+        {cursor_clause}
+        {CASE_ORDER}
         LIMIT :limit
+    """
+
+async def resolve_user_names(db: AsyncSession, user_ids: Iterable[Optional[int]]) -> Dict[int, Optional[str]]:
+    """user id 목록 → 이름. 캐시에 없는 id만 한 번의 쿼리로 조회"""
+    names: Dict[int, Optional[str]] = {}
+    missing = []
+    for user_id in {user_id for user_id in user_ids if user_id is not None}:
+        name = user_name_cache.get(user_id)
+        if name is None:
+            missing.append(user_id)
+        else:
+            names[user_id] = name
+
+    if missing:
+        query = text("""
+            SELECT id, name FROM users WHERE id = ANY(:user_ids)
+        """)
+        for row in (await db.execute(query, {"user_ids": missing})).fetchall():
+            names[row.id] = row.name
+            if row.name is not None:
+                user_name_cache.set(row.id, row.name)
+    return names
+
+async def attach_user_names(db: AsyncSession, cases: List[Dict]) -> List[Dict]:
+    """사건 목록에 plaintiff_name / defendant_name / attorney_name을 채움"""
+    names = await resolve_user_names(
+        db,
+        [case[field] for case in cases for field in ("plaintiff_id", "defendant_id", "assigned_attorney_id")],
+    )
+    for case in cases:
+        case["plaintiff_name"] = names.get(case["plaintiff_id"])
+        case["defendant_name"] = names.get(case["defendant_id"])
+        case["attorney_name"] = names.get(case["assigned_attorney_id"])
+    return cases
+
+async def get_case(db: AsyncSession, case_id: int) -> Optional[Dict]:
+    query = text(f"""
+        SELECT {CASE_COLUMNS} FROM cases c WHERE c.id = :case_id
     """)
-    results = db.execute(
-        query, 
-        {"user_id": user_id, "skip": skip, "limit": limit}
-    ).fetchall()
-    return [dict(row) for row in results]
+    result = (await db.execute(query, {"case_id": case_id})).first()
+    if not result:
+        return None
+    return (await attach_user_names(db, [dict(result._mapping)]))[0]
 
-def get_attorney_cases(db: Session, attorney_id: int, skip: int = 0, limit: int = 100) -> List[Dict]:
-    query = text("""
-        SELECT c.*, 
-               p.name as plaintiff_name,
-               d.name as defendant_name,
-               a.name as attorney_name
-        FROM cases c
-        LEFT JOIN users p ON c.plaintiff_id = p.id
-        LEFT JOIN users d ON c.defendant_id = d.id
-        LEFT JOIN users a ON c.assigned_attorney_id = a.id
-        WHERE c.assigned_attorney_id = :attorney_id
-        ORDER BY c.created_at DESC
-        OFFSET :skip
+async def list_cases(db: AsyncSession, where: str, params: Dict, cursor: Optional[str], limit: int) -> Dict:
+    query = text(build_case_query(where, cursor, limit, params))
+    results = (await db.execute(query, params)).fetchall()
+    page = make_page([dict(row._mapping) for row in results], limit, ("created_at", "id"))
+    await attach_user_names(db, page["items"])
+    return page
+
+async def get_user_cases(db: AsyncSession, user_id: int, cursor: Optional[str] = None, limit: int = 100) -> Dict:
+    return await list_cases(db, "c.plaintiff_id = :user_id", {"user_id": user_id}, cursor, limit)
+
+async def get_attorney_cases(db: AsyncSession, attorney_id: int, cursor: Optional[str] = None, limit: int = 100) -> Dict:
+    return await list_cases(db, "c.assigned_attorney_id = :attorney_id", {"attorney_id": attorney_id}, cursor, limit)
+
+async def get_my_cases(db: AsyncSession, user_id: int, cursor: Optional[str] = None, limit: int = 100) -> Dict:
+    """
+    원고/피고/담당 변호사 중 하나로 참여한 사건 목록을 한 쿼리로 조회
+    역할별로 인덱스 순서대로 limit + 1건씩만 읽어 합친 뒤(UNION으로 중복 제거) 다시 정렬
+    """
+    params = {"user_id": user_id}
+    branches = [
+        build_case_query(f"c.{column} = :user_id", cursor, limit, params)
+        for column in ("plaintiff_id", "defendant_id", "assigned_attorney_id")
+    ]
+    query = text(f"""
+        SELECT * FROM (
+            {" UNION ".join(f"({branch})" for branch in branches)}
+        ) c
+        {CASE_ORDER}
         LIMIT :limit
     """)
-    results = db.execute(
-        query, 
-        {"attorney_id": attorney_id, "skip": skip, "limit": limit}
-    ).fetchall()
-    return [dict(row) for row in results]
+    results = (await db.execute(query, params)).fetchall()
+    page = make_page([dict(row._mapping) for row in results], limit, ("created_at", "id"))
+    await attach_user_names(db, page["items"])
+    return page
 
-def create_case(db: Session, case_data: dict) -> Dict:
+async def create_case(db: AsyncSession, case_data: dict) -> Dict:
     query = text("""
         INSERT INTO cases (
             case_type, plaintiff_id, defendant_id, assigned_attorney_id,
@@ -71,7 +116,7 @@ def create_case(db: Session, case_data: dict) -> Dict:
         ) RETURNING *
     """)
     
-    result = db.execute(
+    result = (await db.execute(
         query,
         {
             "case_type": case_data["case_type"],
@@ -82,12 +127,12 @@ def create_case(db: Session, case_data: dict) -> Dict:
             "created_at": datetime.now(),
             "updated_at": datetime.now()
         }
-    ).first()
+    )).first()
     
-    db.commit()
-    return dict(result)
+    await db.commit()
+    return dict(result._mapping)
 
-def update_case(db: Session, case_id: int, case_data: dict) -> Optional[Dict]:
+async def update_case(db: AsyncSession, case_id: int, case_data: dict) -> Optional[Dict]:
     # 동적으로 업데이트할 필드 생성
     update_fields = []
     params = {"case_id": case_id, "updated_at": datetime.now()}
@@ -108,22 +153,22 @@ def update_case(db: Session, case_id: int, case_data: dict) -> Optional[Dict]:
         RETURNING *
     """)
     
-    result = db.execute(query, params).first()
-    db.commit()
-    return dict(result) if result else None
+    result = (await db.execute(query, params)).first()
+    await db.commit()
+    return dict(result._mapping) if result else None
 
-def delete_case(db: Session, case_id: int) -> bool:
+async def delete_case(db: AsyncSession, case_id: int) -> bool:
     query = text("""
         DELETE FROM cases
         WHERE id = :case_id
         RETURNING id
     """)
     
-    result = db.execute(query, {"case_id": case_id}).first()
-    db.commit()
+    result = (await db.execute(query, {"case_id": case_id})).first()
+    await db.commit()
     return bool(result)
 
-def assign_attorney(db: Session, case_id: int, attorney_id: int) -> Optional[Dict]:
+async def assign_attorney(db: AsyncSession, case_id: int, attorney_id: int) -> Optional[Dict]:
     query = text("""
         UPDATE cases
         SET assigned_attorney_id = :attorney_id,
@@ -133,14 +178,14 @@ def assign_attorney(db: Session, case_id: int, attorney_id: int) -> Optional[Dic
         RETURNING *
     """)
     
-    result = db.execute(
+    result = (await db.execute(
         query,
         {
             "case_id": case_id,
             "attorney_id": attorney_id,
             "updated_at": datetime.now()
         }
-    ).first()
+    )).first()
     
-    db.commit()
-    return dict(result) if result else None 
\ No newline at end of file
+    await db.commit()
+    return dict(result._mapping) if result else None 
\ No newline at end of file
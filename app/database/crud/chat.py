@@ -1,9 +1,39 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import text, bindparam, JSON
 from typing import Optional, List, Dict
-from datetime import datetime
+from datetime import datetime, timedelta
+from app.database.cache import chat_history_cache
 
-def create_chat_message(db: Session, session_id: int, role: str, content: str) -> Dict:
+def to_session_id(session_id) -> int:
+    """
+    chat_sessions.id는 정수 컬럼이므로 라우터가 문자열로 받은 session_id를 정수로 통일
+    (asyncpg는 정수 컬럼에 문자열 파라미터를 받지 않고, 캐시 key도 하나로 맞춰야 함)
+    숫자가 아니면 ValueError
+    """
+    try:
+        return int(session_id)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid session_id: {session_id!r}")
+
+async def create_chat_session(db: AsyncSession) -> Dict:
+    query = text("""
+        INSERT INTO chat_sessions (context_data, created_at, updated_at)
+        VALUES (NULL, :now, :now)
+        RETURNING id, created_at, updated_at
+    """)
+    result = (await db.execute(query, {"now": datetime.now()})).first()
+    await db.commit()
+    return dict(result._mapping)
+
+async def chat_session_exists(db: AsyncSession, session_id: int) -> bool:
+    session_id = to_session_id(session_id)
+    query = text("""
+        SELECT 1 FROM chat_sessions WHERE id = :session_id
+    """)
+    return (await db.execute(query, {"session_id": session_id})).first() is not None
+
+async def create_chat_message(db: AsyncSession, session_id: int, role: str, content: str) -> Dict:
+    session_id = to_session_id(session_id)
     query = text("""
         INSERT INTO chat_messages (
             session_id, role, content, created_at
@@ -12,7 +42,7 @@ def create_chat_message(db: Session, session_id: int, role: str, content: str) -
         ) RETURNING *
     """)
 
-    result = db.execute(
+    result = (await db.execute(
         query,
         {
             "session_id": session_id,
@@ -20,12 +50,78 @@ def create_chat_message(db: Session, session_id: int, role: str, content: str) -
             "content": content,
             "created_at": datetime.now()
         }
-    ).first()
+    )).first()
     
-    db.commit()
-    return dict(result._mapping) if result else None
+    await db.commit()
+    if not result:
+        return None
+
+    message = dict(result._mapping)
+    chat_history_cache.append(session_id, message)
+    return message
+
+async def create_chat_messages(
+    db: AsyncSession,
+    session_id: int,
+    messages: List[Dict]
+) -> List[Dict]:
+    """
+    여러 메시지 저장과 세션 updated_at 갱신을 한 statement, 한 commit으로 처리
+    messages = [{"role": ..., "content": ...}, ...]
+    """
+    session_id = to_session_id(session_id)
+    if not messages:
+        return []
+
+    values = []
+    params = {"session_id": session_id, "updated_at": datetime.now()}
+    base_time = datetime.now()
+    for i, message in enumerate(messages):
+        values.append(f"(:session_id, :role_{i}, :content_{i}, :created_at_{i})")
+        params[f"role_{i}"] = message["role"]
+        params[f"content_{i}"] = message["content"]
+        # created_at 정렬 순서가 입력 순서와 같도록 1µs씩 증가
+        params[f"created_at_{i}"] = base_time + timedelta(microseconds=i)
+
+    query = text(f"""
+        WITH inserted AS (
+            INSERT INTO chat_messages (
+                session_id, role, content, created_at
+            ) VALUES {", ".join(values)}
+            RETURNING *
+        ), touched AS (
+            UPDATE chat_sessions
+            SET updated_at = :updated_at
+            WHERE id = :session_id
+        )
+        SELECT * FROM inserted
+        ORDER BY created_at ASC
+    """)
+
+    results = (await db.execute(query, params)).fetchall()
+    await db.commit()
+
+    inserted = [dict(row._mapping) for row in results]
+    for message in inserted:
+        chat_history_cache.append(session_id, message)
+    return inserted
+
+async def get_chat_history(db: AsyncSession, session_id: int) -> List[Dict]:
+    session_id = to_session_id(session_id)
+    cached = chat_history_cache.get(session_id)
+    if cached is not None:
+        # 다른 워커가 같은 세션에 메시지를 추가했을 수 있으므로 DB의 메시지 수와 마지막 id로 캐시를 검증
+        # (이 워커가 append한 메시지 사이에 다른 워커의 메시지가 끼어든 경우도 개수로 걸러냄)
+        latest_query = text("""
+            SELECT count(*) AS message_count, max(id) AS last_id
+            FROM chat_messages
+            WHERE session_id = :session_id
+        """)
+        latest = (await db.execute(latest_query, {"session_id": session_id})).first()
+        cached_last_id = max((message["id"] for message in cached), default=None)
+        if latest.message_count == len(cached) and latest.last_id == cached_last_id:
+            return cached
 
-def get_chat_history(db: Session, session_id: int) -> List[Dict]:
     query = text("""
         SELECT 
             id,
@@ -35,29 +131,42 @@ def get_chat_history(db: Session, session_id: int) -> List[Dict]:
             created_at
         FROM chat_messages
         WHERE session_id = :session_id
-        ORDER BY created_at ASC
+        ORDER BY created_at ASC, id ASC
     """)
     
-    results = db.execute(query, {"session_id": session_id}).fetchall()
-    return [dict(row._mapping) for row in results]
+    results = (await db.execute(query, {"session_id": session_id})).fetchall()
+    history = [dict(row._mapping) for row in results]
+    chat_history_cache.set(session_id, history)
+    return history
 
-def update_session_context(db: Session, session_id: int, context_data: dict) -> Dict:
+async def get_session_context(db: AsyncSession, session_id: int) -> Optional[Dict]:
+    session_id = to_session_id(session_id)
+    query = text("""
+        SELECT context_data FROM chat_sessions
+        WHERE id = :session_id
+    """).columns(context_data=JSON)
+
+    result = (await db.execute(query, {"session_id": session_id})).first()
+    return result.context_data if result else None
+
+async def update_session_context(db: AsyncSession, session_id: int, context_data: dict) -> Optional[Dict]:
+    session_id = to_session_id(session_id)
     query = text("""
         UPDATE chat_sessions
         SET context_data = :context_data,
             updated_at = :updated_at
         WHERE id = :session_id
         RETURNING *
-    """)
+    """).bindparams(bindparam("context_data", type_=JSON))
     
-    result = db.execute(
+    result = (await db.execute(
         query,
         {
             "session_id": session_id,
             "context_data": context_data,
             "updated_at": datetime.now()
         }
-    ).first()
+    )).first()
     
-    db.commit()
-    return dict(result)
\ No newline at end of file
+    await db.commit()
+    return dict(result._mapping) if result else None
\ No newline at end of file
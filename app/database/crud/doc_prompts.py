@@ -1,31 +1,47 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 from typing import Optional, List, Dict
 from datetime import datetime
+from app.database.cache import prompt_registry
+from app.database.pagination import decode_cursor, make_page
 
-def get_doc_prompt(db: Session, case_type: str, doc_type: str) -> Optional[Dict]:
+async def load_doc_prompts(db: AsyncSession) -> int:
+    """doc_prompts 전체를 레지스트리에 (재)적재하고 건수를 반환"""
     query = text("""
-        SELECT * FROM doc_prompts 
-        WHERE case_type = :case_type 
-        AND doc_type = :doc_type
+        SELECT * FROM doc_prompts
+        ORDER BY id
     """)
-    result = db.execute(
-        query, 
-        {"case_type": case_type, "doc_type": doc_type}
-    ).first()
-    return dict(result._mapping) if result else None
+    results = (await db.execute(query)).fetchall()
+    prompt_registry.load(dict(row._mapping) for row in results)
+    return len(results)
 
-def get_doc_prompts(db: Session, skip: int = 0, limit: int = 100) -> List[Dict]:
-    query = text("""
+async def get_doc_prompt(db: AsyncSession, case_type: str, doc_type: str) -> Optional[Dict]:
+    # 레지스트리가 비어 있을 때만 DB에서 적재
+    if not prompt_registry.loaded:
+        await load_doc_prompts(db)
+    return prompt_registry.get(case_type, doc_type)
+
+async def get_doc_prompts(db: AsyncSession, cursor: Optional[str] = None, limit: int = 100) -> Dict:
+    # (case_type, doc_type, id) 기준 keyset 페이지네이션
+    params = {"limit": limit + 1}
+    cursor_clause = ""
+    if cursor:
+        case_type, doc_type, prompt_id = decode_cursor(cursor, 3)
+        if not (isinstance(case_type, str) and isinstance(doc_type, str) and isinstance(prompt_id, int)):
+            raise ValueError("Invalid cursor")
+        params.update(cursor_case_type=case_type, cursor_doc_type=doc_type, cursor_id=prompt_id)
+        cursor_clause = "WHERE (case_type, doc_type, id) > (:cursor_case_type, :cursor_doc_type, :cursor_id)"
+
+    query = text(f"""
         SELECT * FROM doc_prompts
-        ORDER BY case_type, doc_type
-        OFFSET :skip
+        {cursor_clause}
+        ORDER BY case_type, doc_type, id
         LIMIT :limit
     """)
-    results = db.execute(query, {"skip": skip, "limit": limit}).fetchall()
-    return [dict(row) for row in results]
+    results = (await db.execute(query, params)).fetchall()
+    return make_page([dict(row._mapping) for row in results], limit, ("case_type", "doc_type", "id"))
 
-def create_doc_prompt(db: Session, prompt_data: dict) -> Dict:
+async def create_doc_prompt(db: AsyncSession, prompt_data: dict) -> Dict:
     query = text("""
         INSERT INTO doc_prompts (
             case_type, doc_type, prompt_text
@@ -34,19 +50,21 @@ def create_doc_prompt(db: Session, prompt_data: dict) -> Dict:
         ) RETURNING *
     """)
     
-    result = db.execute(
+    result = (await db.execute(
         query,
         {
             "case_type": prompt_data["case_type"],
             "doc_type": prompt_data["doc_type"],
             "prompt_text": prompt_data["prompt_text"]
         }
-    ).first()
+    )).first()
     
-    db.commit()
-    return dict(result)
+    await db.commit()
+    prompt = dict(result._mapping)
+    prompt_registry.put(prompt)
+    return prompt
 
-def update_doc_prompt(db: Session, prompt_id: int, prompt_data: dict) -> Optional[Dict]:
+async def update_doc_prompt(db: AsyncSession, prompt_id: int, prompt_data: dict) -> Optional[Dict]:
     query = text("""
         UPDATE doc_prompts 
         SET case_type = :case_type,
@@ -56,7 +74,7 @@ def update_doc_prompt(db: Session, prompt_id: int, prompt_data: dict) -> Optiona
         RETURNING *
     """)
     
-    result = db.execute(
+    result = (await db.execute(
         query,
         {
             "prompt_id": prompt_id,
@@ -64,18 +82,24 @@ def update_doc_prompt(db: Session, prompt_id: int, prompt_data: dict) -> Optiona
             "doc_type": prompt_data["doc_type"],
             "prompt_text": prompt_data["prompt_text"]
         }
-    ).first()
+    )).first()
     
-    db.commit()
-    return dict(result) if result else None
+    await db.commit()
+    if not result:
+        return None
+
+    prompt = dict(result._mapping)
+    prompt_registry.put(prompt)
+    return prompt
 
-def delete_doc_prompt(db: Session, prompt_id: int) -> bool:
+async def delete_doc_prompt(db: AsyncSession, prompt_id: int) -> bool:
     query = text("""
         DELETE FROM doc_prompts
         WHERE id = :prompt_id
         RETURNING id
     """)
     
-    result = db.execute(query, {"prompt_id": prompt_id}).first()
-    db.commit()
+    result = (await db.execute(query, {"prompt_id": prompt_id})).first()
+    await db.commit()
+    prompt_registry.remove(prompt_id)
     return bool(result) 
\ No newline at end of file
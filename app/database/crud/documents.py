@@ -1,23 +1,61 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import text
-from typing import Optional, Dict
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import text, bindparam, JSON
+from typing import Optional, List, Dict
 from app.models.documents import Draft
+from app.core.config import get_settings
+from app.utils.delta import make_delta, apply_delta, delta_size
+from app.utils.diff import DiffCostExceeded
 from datetime import datetime
+import asyncio
 
-def create_draft(db: Session, session_id: str, doc_type: str, draft: str) -> Draft:
+settings = get_settings()
+
+async def lock_draft_session(db: AsyncSession, session_id: str):
+    """세션의 초안/revision 쓰기를 트랜잭션 끝까지 직렬화 (워커 간에도 적용되는 advisory lock)"""
+    await db.execute(
+        text("SELECT pg_advisory_xact_lock(hashtext(:lock_key))"),
+        {"lock_key": f"drafts:{session_id}"}
+    )
+
+async def create_draft(
+    db: AsyncSession,
+    session_id: str,
+    doc_type: str,
+    draft: str,
+    case_type: Optional[str] = None
+) -> Draft:
+    await lock_draft_session(db, session_id)
     query = text("""
-        INSERT INTO drafts (session_id, title, content, updated_at)
-        VALUES (:session_id, :title, :content, :updated_at) RETURNING *
+        INSERT INTO drafts (session_id, case_type, title, content, updated_at)
+        VALUES (:session_id, :case_type, :title, :content, :updated_at) RETURNING *
     """)
-    result =db.execute(query,
+    result = (await db.execute(query,
                {"session_id": session_id,
+                "case_type": case_type,
                 "title": doc_type,
                 "content": draft,
-                "updated_at": datetime.now()}).first()
-    db.commit()
+                "updated_at": datetime.now()})).first()
+    await add_draft_revision(db, session_id, draft)
+    await db.commit()
     return dict(result._mapping) if result else None
 
-def update_draft(db: Session, session_id: str, content: str) -> Dict:
+async def update_draft(
+    db: AsyncSession,
+    session_id: str,
+    content: str,
+    expected_updated_at: Optional[datetime] = None
+) -> Optional[Dict]:
+    """
+    expected_updated_at을 주면 읽은 뒤 다른 요청이 초안을 수정하지 않았을 때만 저장
+    (수정됐거나 초안이 없으면 None)
+    """
+    await lock_draft_session(db, session_id)
+    if expected_updated_at is not None:
+        current = await get_draft(db, session_id)
+        if not current or current["updated_at"] != expected_updated_at:
+            await db.rollback()
+            return None
+
     query = text("""
         UPDATE drafts
         SET content = :content,
@@ -26,21 +64,129 @@ def update_draft(db: Session, session_id: str, content: str) -> Dict:
         RETURNING *
     """)
     
-    result = db.execute(
+    result = (await db.execute(
         query,
         {
             "session_id": session_id,
             "content": content,
             "updated_at": datetime.now()
         }
-    ).first()
+    )).first()
     
-    db.commit()
+    if result:
+        await add_draft_revision(db, session_id, content)
+    await db.commit()
     return dict(result._mapping) if result else None
 
-def get_draft(db: Session, session_id: str) -> Optional[Draft]:
+async def get_draft(db: AsyncSession, session_id: str) -> Optional[Draft]:
     query = text("""
         SELECT * FROM drafts WHERE session_id = :session_id
+        ORDER BY updated_at DESC, id DESC
+        LIMIT 1
     """)
-    result = db.execute(query, {"session_id": session_id}).first()
-    return dict(result._mapping) if result else None
\ No newline at end of file
+    result = (await db.execute(query, {"session_id": session_id})).first()
+    return dict(result._mapping) if result else None
+
+async def add_draft_revision(db: AsyncSession, session_id: str, content: str) -> Dict:
+    """
+    새 revision 저장 (commit은 호출한 쪽에서)
+
+    DRAFT_SNAPSHOT_INTERVAL개마다, 또는 delta가 원문의 절반을 넘으면 전체 스냅샷을 저장하고,
+    그 외에는 트랜잭션 안에서 복원한 최신 revision 대비 delta만 저장한다.
+    늘어난 길이만으로 절반을 넘거나 diff 탐색량 상한에 걸리면 delta 계산 없이 바로 스냅샷.
+    같은 세션의 revision 번호 계산과 저장은 advisory lock으로 직렬화 (commit/rollback 때 해제)
+    """
+    await lock_draft_session(db, session_id)
+
+    query = text("""
+        SELECT max(revision) AS latest,
+               max(revision) FILTER (WHERE is_snapshot) AS last_snapshot
+        FROM draft_revisions
+        WHERE session_id = :session_id
+    """)
+    state = (await db.execute(query, {"session_id": session_id})).first()
+    revision = (state.latest or 0) + 1
+
+    delta = None
+    if state.last_snapshot is not None and revision - state.last_snapshot < settings.DRAFT_SNAPSHOT_INTERVAL:
+        try:
+            latest = await get_draft_revision(db, session_id, state.latest)
+        except ValueError:
+            latest = None  # 복원할 수 없는 이력이면 스냅샷부터 다시 시작
+        # 삽입된 글자 수는 늘어난 길이 이상이므로 그것만으로 절반을 넘으면 diff할 필요 없음
+        if latest is not None and len(content) - len(latest["content"]) <= len(content) // 2:
+            try:
+                # lock을 잡고 있는 동안 이벤트 루프를 막지 않도록 스레드에서 계산
+                delta = await asyncio.to_thread(make_delta, latest["content"], content)
+            except DiffCostExceeded:
+                delta = None
+            if delta is not None and delta_size(delta) > len(content) // 2:
+                delta = None
+
+    query = text("""
+        INSERT INTO draft_revisions (
+            session_id, revision, is_snapshot, content, delta, created_at
+        ) VALUES (
+            :session_id, :revision, :is_snapshot, :content, :delta, :created_at
+        ) RETURNING id, session_id, revision, is_snapshot, created_at
+    """).bindparams(bindparam("delta", type_=JSON))
+
+    result = (await db.execute(
+        query,
+        {
+            "session_id": session_id,
+            "revision": revision,
+            "is_snapshot": delta is None,
+            "content": content if delta is None else None,
+            "delta": delta,
+            "created_at": datetime.now()
+        }
+    )).first()
+    return dict(result._mapping)
+
+async def get_draft_revisions(db: AsyncSession, session_id: str) -> List[Dict]:
+    query = text("""
+        SELECT revision, is_snapshot, created_at
+        FROM draft_revisions
+        WHERE session_id = :session_id
+        ORDER BY revision
+    """)
+    results = (await db.execute(query, {"session_id": session_id})).fetchall()
+    return [dict(row._mapping) for row in results]
+
+async def get_draft_revision(db: AsyncSession, session_id: str, revision: int) -> Optional[Dict]:
+    """
+    가장 가까운 이전 스냅샷부터 해당 revision까지의 delta만 읽어 복원
+    (최대 DRAFT_SNAPSHOT_INTERVAL개 row). delta가 이력과 맞지 않으면 ValueError
+    """
+    query = text("""
+        SELECT revision, is_snapshot, content, delta, created_at
+        FROM draft_revisions
+        WHERE session_id = :session_id
+        AND revision <= :revision
+        AND revision >= (
+            SELECT max(revision) FROM draft_revisions
+            WHERE session_id = :session_id
+            AND revision <= :revision
+            AND is_snapshot
+        )
+        ORDER BY revision
+    """).columns(delta=JSON)
+
+    rows = (await db.execute(
+        query,
+        {"session_id": session_id, "revision": revision}
+    )).fetchall()
+    if not rows or rows[-1].revision != revision:
+        return None
+
+    content = rows[0].content
+    for row in rows[1:]:
+        content = apply_delta(content, row.delta)
+
+    return {
+        "session_id": session_id,
+        "revision": revision,
+        "content": content,
+        "created_at": rows[-1].created_at
+    }
\ No newline at end of file
@@ -0,0 +1,132 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import text, bindparam, JSON
+from typing import Optional, Dict
+from datetime import datetime, timedelta
+
+async def create_job(db: AsyncSession, job_id: str, kind: str, payload: dict) -> Dict:
+    query = text("""
+        INSERT INTO jobs (id, kind, status, payload, created_at)
+        VALUES (:id, :kind, 'pending', :payload, :created_at)
+        RETURNING *
+    """).bindparams(bindparam("payload", type_=JSON)).columns(payload=JSON, result=JSON)
+
+    result = (await db.execute(
+        query,
+        {
+            "id": job_id,
+            "kind": kind,
+            "payload": payload,
+            "created_at": datetime.now()
+        }
+    )).first()
+
+    await db.commit()
+    return dict(result._mapping)
+
+async def get_job(db: AsyncSession, job_id: str) -> Optional[Dict]:
+    query = text("""
+        SELECT * FROM jobs WHERE id = :id
+    """).columns(payload=JSON, result=JSON)
+    result = (await db.execute(query, {"id": job_id})).first()
+    return dict(result._mapping) if result else None
+
+async def claim_job(db: AsyncSession) -> Optional[Dict]:
+    """가장 오래된 pending 작업 하나를 running으로 바꿔 가져옴 (다른 워커와 경합 없이)"""
+    query = text("""
+        UPDATE jobs
+        SET status = 'running',
+            started_at = :now,
+            heartbeat_at = :now,
+            attempts = attempts + 1
+        WHERE id = (
+            SELECT id FROM jobs
+            WHERE status = 'pending'
+            ORDER BY created_at
+            FOR UPDATE SKIP LOCKED
+            LIMIT 1
+        )
+        RETURNING *
+    """).columns(payload=JSON, result=JSON)
+
+    result = (await db.execute(query, {"now": datetime.now()})).first()
+    await db.commit()
+    return dict(result._mapping) if result else None
+
+async def heartbeat_job(db: AsyncSession, job_id: str) -> None:
+    query = text("""
+        UPDATE jobs SET heartbeat_at = :now
+        WHERE id = :id AND status = 'running'
+    """)
+    await db.execute(query, {"id": job_id, "now": datetime.now()})
+    await db.commit()
+
+async def finish_job(
+    db: AsyncSession,
+    job_id: str,
+    status: str,
+    result: Optional[dict] = None,
+    error: Optional[str] = None
+) -> None:
+    query = text("""
+        UPDATE jobs
+        SET status = :status,
+            result = :result,
+            error = :error,
+            finished_at = :now
+        WHERE id = :id
+    """).bindparams(bindparam("result", type_=JSON))
+
+    await db.execute(
+        query,
+        {
+            "id": job_id,
+            "status": status,
+            "result": result,
+            "error": error,
+            "now": datetime.now()
+        }
+    )
+    await db.commit()
+
+async def requeue_job(db: AsyncSession, job_id: str) -> None:
+    query = text("""
+        UPDATE jobs SET status = 'pending', started_at = NULL, heartbeat_at = NULL
+        WHERE id = :id AND status = 'running'
+    """)
+    await db.execute(query, {"id": job_id})
+    await db.commit()
+
+async def requeue_stale_jobs(db: AsyncSession, stale_seconds: int, max_attempts: int) -> int:
+    """
+    heartbeat가 끊긴 running 작업(재시작/장애로 중단된 워커)을 다시 pending으로,
+    재시도 횟수를 다 쓴 작업은 failed로 바꿈
+    """
+    params = {
+        "threshold": datetime.now() - timedelta(seconds=stale_seconds),
+        "max_attempts": max_attempts,
+        "now": datetime.now()
+    }
+    await db.execute(text("""
+        UPDATE jobs
+        SET status = 'failed', error = 'worker lost', finished_at = :now
+        WHERE status = 'running' AND heartbeat_at < :threshold AND attempts >= :max_attempts
+    """), params)
+    requeued = await db.execute(text("""
+        UPDATE jobs
+        SET status = 'pending', started_at = NULL, heartbeat_at = NULL
+        WHERE status = 'running' AND heartbeat_at < :threshold AND attempts < :max_attempts
+    """), params)
+    await db.commit()
+    return requeued.rowcount
+
+async def get_job_stats(db: AsyncSession) -> Dict:
+    query = text("""
+        SELECT
+            count(*) FILTER (WHERE status = 'pending') AS pending,
+            count(*) FILTER (WHERE status = 'running') AS running,
+            extract(epoch FROM CAST(:now AS TIMESTAMP) - min(created_at) FILTER (WHERE status = 'pending')) AS oldest_pending_seconds
+        FROM jobs
+        WHERE status IN ('pending', 'running')
+    """)
+    result = (await db.execute(query, {"now": datetime.now()})).first()
+    return dict(result._mapping)
@@ -0,0 +1,103 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import text
+from typing import Optional, List, Dict
+from datetime import datetime
+from app.core.config import get_settings
+from app.database.pagination import decode_cursor, make_page
+
+settings = get_settings()
+
+SEARCH_SOURCES = ("message", "draft")
+SNIPPET_BEFORE = 40  # 첫 번째 검색어 앞으로 보여줄 글자 수
+SNIPPET_LENGTH = 160
+
+def split_terms(query: str) -> List[str]:
+    """공백으로 나눈 검색어 (소문자, 중복 제거). 2글자 이상인 검색어가 없으면 ValueError"""
+    terms = list(dict.fromkeys(term.lower() for term in query.split()))
+    if not any(len(term) >= 2 for term in terms):
+        raise ValueError("검색어는 2글자 이상이어야 합니다.")
+    return terms
+
+def decode_search_cursor(cursor: str) -> Dict:
+    score, created_at, source, row_id = decode_cursor(cursor, 4)
+    try:
+        return {
+            "cursor_score": int(score),
+            "cursor_created_at": datetime.fromisoformat(created_at),
+            "cursor_source": str(source),
+            "cursor_id": int(row_id),
+        }
+    except (TypeError, ValueError):
+        raise ValueError("Invalid cursor")
+
+def source_query(table: str, source: str, session_id: str, role: str, created_at: str, terms: List[str]) -> str:
+    """
+    한 테이블에서 모든 검색어를 포함하는 행 중 최근 :candidate_limit건을 찾는 SELECT
+    text_bigrams GIN 인덱스로 후보를 좁히고 strpos로 실제 포함 여부를 다시 확인한 뒤,
+    최근 항목만 남기고(top-N 정렬) 그 안에서만 snippet과 score를 계산한다
+    score는 검색어별 등장 횟수의 합
+    """
+    contains = " AND ".join(f"strpos(lower(t.content), :term_{i}) > 0" for i in range(len(terms)))
+    score = " + ".join(
+        f"(char_length(t.content) - char_length(replace(lower(t.content), :term_{i}, ''))) / char_length(:term_{i})"
+        for i in range(len(terms))
+    )
+    return f"""
+        SELECT '{source}' AS source, t.id, t.session_id, t.role, t.created_at,
+               substr(t.content, greatest(strpos(lower(t.content), :term_0) - {SNIPPET_BEFORE}, 1), {SNIPPET_LENGTH}) AS snippet,
+               ({score}) AS score
+        FROM (
+            SELECT t.id, {session_id} AS session_id, {role} AS role, {created_at} AS created_at, t.content
+            FROM {table} t
+            WHERE text_bigrams(t.content) @> text_bigrams(:query)
+            AND {contains}
+            ORDER BY {created_at} DESC, t.id DESC
+            LIMIT :candidate_limit
+        ) t
+    """
+
+async def search_content(
+    db: AsyncSession,
+    query: str,
+    source: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = 20,
+    candidate_limit: Optional[int] = None
+) -> Dict:
+    """
+    채팅 메시지와 초안 본문 검색 (공백으로 나눈 검색어를 모두 포함하는 항목)
+    score(등장 횟수) 높은 순, 같으면 최신 순. 초안의 created_at은 마지막 수정 시각
+    source가 "message" 또는 "draft"면 해당 항목만 검색
+    전체 일치 항목을 정렬하지 않도록 source별로 가장 최근에 일치한 candidate_limit건
+    (기본 SEARCH_CANDIDATE_LIMIT)만 순위를 매긴다. 그보다 오래된 일치 항목은 결과에 나오지 않음
+    """
+    terms = split_terms(query)
+    params: Dict = {f"term_{i}": term for i, term in enumerate(terms)}
+    params["query"] = " ".join(terms)
+
+    selects = []
+    if source in (None, "message"):
+        selects.append(source_query("chat_messages", "message", "t.session_id::text", "t.role", "t.created_at", terms))
+    if source in (None, "draft"):
+        selects.append(source_query("drafts", "draft", "t.session_id", "NULL", "t.updated_at", terms))
+    if not selects:
+        raise ValueError(f"Unsupported source: {source}")
+
+    cursor_clause = ""
+    if cursor:
+        params.update(decode_search_cursor(cursor))
+        cursor_clause = """
+            WHERE (h.score, h.created_at, h.source, h.id)
+                < (:cursor_score, :cursor_created_at, :cursor_source, :cursor_id)
+        """
+    params["limit"] = limit + 1
+    params["candidate_limit"] = candidate_limit or settings.SEARCH_CANDIDATE_LIMIT
+
+    sql = text(f"""
+        SELECT h.* FROM ({" UNION ALL ".join(selects)}) h
+        {cursor_clause}
+        ORDER BY h.score DESC, h.created_at DESC, h.source DESC, h.id DESC
+        LIMIT :limit
+    """)
+    results = (await db.execute(sql, params)).fetchall()
+    return make_page([dict(row._mapping) for row in results], limit, ("score", "created_at", "source", "id"))
@@ -1,35 +1,44 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 from typing import Optional, List, Dict
 from datetime import datetime
+from app.database.pagination import decode_created_at_cursor, make_page
+from app.database.cache import principal_cache, user_name_cache
 
-def get_user(db: Session, user_id: int) -> Optional[Dict]:
+async def get_user(db: AsyncSession, user_id: int) -> Optional[Dict]:
     query = text("""
         SELECT * FROM users 
         WHERE id = :user_id
     """)
-    result = db.execute(query, {"user_id": user_id}).first()
-    return dict(result) if result else None
+    result = (await db.execute(query, {"user_id": user_id})).first()
+    return dict(result._mapping) if result else None
 
-def get_user_by_email(db: Session, email: str) -> Optional[Dict]:
+async def get_user_by_email(db: AsyncSession, email: str) -> Optional[Dict]:
     query = text("""
         SELECT * FROM users 
         WHERE email = :email
     """)
-    result = db.execute(query, {"email": email}).first()
-    return dict(result) if result else None
+    result = (await db.execute(query, {"email": email})).first()
+    return dict(result._mapping) if result else None
 
-def get_users(db: Session, skip: int = 0, limit: int = 100) -> List[Dict]:
-    query = text("""
+async def get_users(db: AsyncSession, cursor: Optional[str] = None, limit: int = 100) -> Dict:
+    # (created_at, id) 기준 keyset 페이지네이션
+    params = {"limit": limit + 1}
+    cursor_clause = ""
+    if cursor:
+        params["cursor_created_at"], params["cursor_id"] = decode_created_at_cursor(cursor)
+        cursor_clause = "WHERE (created_at, id) < (:cursor_created_at, :cursor_id)"
+
+    query = text(f"""
         SELECT * FROM users
-        ORDER BY created_at DESC
-        OFFSET :skip
+        {cursor_clause}
+        ORDER BY created_at DESC, id DESC
         LIMIT :limit
     """)
-    results = db.execute(query, {"skip": skip, "limit": limit}).fetchall()
-    return [dict(row) for row in results]
+    results = (await db.execute(query, params)).fetchall()
+    return make_page([dict(row._mapping) for row in results], limit, ("created_at", "id"))
 
-def create_user(db: Session, user_data: dict) -> Dict:
+async def create_user(db: AsyncSession, user_data: dict) -> Dict:
     query = text("""
         INSERT INTO users (
             email, password, name, user_type, subscription_type,
@@ -40,7 +49,7 @@ def create_user(db: Session, user_data: dict) -> Dict:
         ) RETURNING *
     """)
     
-    result = db.execute(
+    result = (await db.execute(
         query,
         {
             "email": user_data["email"],
@@ -51,12 +60,12 @@ def create_user(db: Session, user_data: dict) -> Dict:
             "created_at": datetime.now(),
             "updated_at": datetime.now()
         }
-    ).first()
+    )).first()
     
-    db.commit()
-    return dict(result)
+    await db.commit()
+    return dict(result._mapping)
 
-def update_user(db: Session, user_id: int, user_data: dict) -> Optional[Dict]:
+async def update_user(db: AsyncSession, user_id: int, user_data: dict) -> Optional[Dict]:
     # 동적으로 업데이트할 필드 생성
     update_fields = []
     params = {"user_id": user_id, "updated_at": datetime.now()}
@@ -77,17 +86,21 @@ def update_user(db: Session, user_id: int, user_data: dict) -> Optional[Dict]:
         RETURNING *
     """)
     
-    result = db.execute(query, params).first()
-    db.commit()
-    return dict(result) if result else None
+    result = (await db.execute(query, params)).first()
+    await db.commit()
+    principal_cache.invalidate(user_id)
+    user_name_cache.invalidate(user_id)
+    return dict(result._mapping) if result else None
 
-def delete_user(db: Session, user_id: int) -> bool:
+async def delete_user(db: AsyncSession, user_id: int) -> bool:
     query = text("""
         DELETE FROM users
         WHERE id = :user_id
         RETURNING id
     """)
     
-    result = db.execute(query, {"user_id": user_id}).first()
-    db.commit()
+    result = (await db.execute(query, {"user_id": user_id})).first()
+    await db.commit()
+    principal_cache.invalidate(user_id)
+    user_name_cache.invalidate(user_id)
     return bool(result) 
\ No newline at end of file
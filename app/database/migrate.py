@@ -0,0 +1,87 @@
+"""
+버전별 SQL 마이그레이션 적용
+
+migrations/ 디렉토리의 NNNN_설명.sql 파일을 번호 순으로 한 번씩 적용하고
+schema_migrations 테이블에 기록합니다. 파일 하나는 하나의 트랜잭션으로 실행됩니다.
+
+    python -m app.database.migrate           # 미적용 마이그레이션 모두 적용
+    python -m app.database.migrate --status  # 적용 현황 출력
+"""
+import argparse
+from pathlib import Path
+from typing import List, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from app.core.config import BASE_DIR
+
+MIGRATIONS_DIR = BASE_DIR / "migrations"
+
+
+def list_migrations(directory: Path = MIGRATIONS_DIR) -> List[Tuple[str, Path]]:
+    migrations = []
+    for path in sorted(directory.glob("*.sql")):
+        version = path.name.split("_", 1)[0]
+        migrations.append((version, path))
+    return migrations
+
+
+def ensure_migrations_table(engine: Engine):
+    with engine.begin() as conn:
+        conn.execute(text("""
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                version VARCHAR(20) PRIMARY KEY,
+                name VARCHAR(255) NOT NULL,
+                applied_at TIMESTAMP NOT NULL DEFAULT now()
+            )
+        """))
+
+
+def applied_versions(engine: Engine) -> set:
+    with engine.connect() as conn:
+        rows = conn.execute(text("SELECT version FROM schema_migrations")).fetchall()
+    return {row.version for row in rows}
+
+
+def migrate(engine: Engine, directory: Path = MIGRATIONS_DIR) -> List[str]:
+    """미적용 마이그레이션을 적용하고 적용한 파일 이름 목록을 반환"""
+    ensure_migrations_table(engine)
+    done = applied_versions(engine)
+    applied = []
+    for version, path in list_migrations(directory):
+        if version in done:
+            continue
+        with engine.begin() as conn:
+            conn.exec_driver_sql(path.read_text(encoding="utf-8"))
+            conn.execute(
+                text("INSERT INTO schema_migrations (version, name) VALUES (:version, :name)"),
+                {"version": version, "name": path.name},
+            )
+        applied.append(path.name)
+    return applied
+
+
+def main():
+    from app.database import engine
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--status", action="store_true")
+    args = parser.parse_args()
+
+    if args.status:
+        ensure_migrations_table(engine)
+        done = applied_versions(engine)
+        for version, path in list_migrations():
+            print(f"[{'x' if version in done else ' '}] {path.name}")
+        return
+
+    applied = migrate(engine)
+    for name in applied:
+        print(f"applied {name}")
+    if not applied:
+        print("nothing to apply")
+
+
+if __name__ == "__main__":
+    main()
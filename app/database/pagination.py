@@ -0,0 +1,44 @@
+import base64
+import json
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+def encode_cursor(values: Sequence) -> str:
+    """정렬 키 값들을 불투명한 cursor 문자열로 인코딩"""
+    payload = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    raw = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> List:
+    """cursor를 정렬 키 값 목록으로 디코딩. 형식이 잘못되면 ValueError"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("Invalid cursor")
+    return values
+
+
+def decode_created_at_cursor(cursor: str) -> Tuple[datetime, int]:
+    """(created_at, id) cursor 디코딩"""
+    created_at, row_id = decode_cursor(cursor, 2)
+    try:
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (TypeError, ValueError):
+        raise ValueError("Invalid cursor")
+
+
+def make_page(rows: List[Dict], limit: int, cursor_fields: Sequence[str]) -> Dict:
+    """
+    limit + 1건을 조회한 결과로 페이지를 구성
+    다음 페이지가 있으면 마지막 항목의 정렬 키로 next_cursor를 만든다
+    """
+    items = rows[:limit]
+    next_cursor: Optional[str] = None
+    if len(rows) > limit and items:
+        next_cursor = encode_cursor([items[-1][field] for field in cursor_fields])
+    return {"items": items, "next_cursor": next_cursor}
@@ -0,0 +1,183 @@
+"""
+커넥션 풀 설정과 모니터링
+
+- DB_POOL_* 설정으로 풀 크기/overflow/대기 시간/recycle/pre-ping을 지정
+- DB_STATEMENT_TIMEOUT_MS: 문장별 실행 시간 상한 (접속 시 server_settings로 지정)
+  /bulk의 COPY 트랜잭션은 SET LOCAL로 DB_BULK_STATEMENT_TIMEOUT_MS를 대신 사용
+- DB_PGBOUNCER: pgbouncer transaction mode 뒤에서 실행. 풀링은 pgbouncer에 맡기고(NullPool),
+  prepared statement 캐시를 끄고, statement_timeout은 트랜잭션마다 SET LOCAL로 지정
+- 커넥션 대기 시간, 느린 쿼리, statement timeout 횟수를 메트릭과 /health/db로 노출
+"""
+import logging
+import time
+from collections import deque
+from typing import Dict
+from uuid import uuid4
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
+
+from app.utils.metrics import db_pool_checkout_wait, db_pool_timeouts, db_slow_queries, db_statement_timeouts
+
+logger = logging.getLogger(__name__)
+
+QUERY_CANCELED_SQLSTATE = "57014"
+
+
+class PoolMonitor:
+    """최근 커넥션 대기 시간과 느린 쿼리/timeout 횟수 (워커 프로세스 단위)"""
+
+    def __init__(self, window: int = 1000):
+        self.checkout_waits = deque(maxlen=window)
+        self.checkouts = 0
+        self.pool_timeouts = 0
+        self.slow_queries = 0
+        self.statement_timeouts = 0
+
+    def observe_checkout(self, seconds: float):
+        self.checkouts += 1
+        self.checkout_waits.append(seconds)
+        db_pool_checkout_wait.observe(seconds)
+
+    def checkout_summary(self) -> Dict:
+        waits = sorted(self.checkout_waits)
+        if not waits:
+            return {"checkouts": self.checkouts, "recent": 0}
+
+        def percentile(p: float) -> float:
+            return round(waits[min(len(waits) - 1, int(len(waits) * p / 100))] * 1000, 2)
+
+        return {
+            "checkouts": self.checkouts,
+            "recent": len(waits),
+            "p50_ms": percentile(50),
+            "p95_ms": percentile(95),
+            "p99_ms": percentile(99),
+            "max_ms": round(waits[-1] * 1000, 2),
+        }
+
+
+pool_monitor = PoolMonitor()
+
+
+class _TimedCheckout:
+    """풀에서 커넥션을 받기까지의 시간을 기록 (대기 + 새 커넥션 생성)"""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            pool_monitor.pool_timeouts += 1
+            db_pool_timeouts.inc()
+            raise
+        finally:
+            pool_monitor.observe_checkout(time.perf_counter() - started)
+
+
+class TimedAsyncQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    pass
+
+
+class TimedNullPool(_TimedCheckout, NullPool):
+    pass
+
+
+def async_engine_options(settings) -> Dict:
+    """create_async_engine 인자"""
+    connect_args: Dict = {}
+    if settings.DB_PGBOUNCER:
+        # transaction mode에서는 트랜잭션마다 서버 커넥션이 바뀌므로 이름 있는 prepared statement를 재사용할 수 없음
+        connect_args["statement_cache_size"] = 0
+        connect_args["prepared_statement_cache_size"] = 0
+        connect_args["prepared_statement_name_func"] = lambda: f"__asyncpg_{uuid4()}__"
+        return {"poolclass": TimedNullPool, "connect_args": connect_args}
+
+    if settings.DB_STATEMENT_TIMEOUT_MS > 0:
+        connect_args["server_settings"] = {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)}
+    return {
+        "poolclass": TimedAsyncQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "connect_args": connect_args,
+    }
+
+
+def install_query_monitor(engine: Engine, settings):
+    """느린 쿼리/statement timeout 횟수 집계"""
+    slow_seconds = settings.DB_SLOW_QUERY_MS / 1000
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_started"].pop()
+        if slow_seconds > 0 and elapsed >= slow_seconds:
+            pool_monitor.slow_queries += 1
+            db_slow_queries.inc()
+            logger.warning("느린 쿼리 %.0fms: %s", elapsed * 1000, " ".join(statement.split())[:300])
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(context):
+        started = context.connection.info.get("query_started") if context.connection is not None else None
+        if started:
+            started.pop()
+        original = context.original_exception
+        sqlstate = getattr(original, "sqlstate", None) or getattr(original.__cause__, "sqlstate", None)
+        if sqlstate == QUERY_CANCELED_SQLSTATE:
+            pool_monitor.statement_timeouts += 1
+            db_statement_timeouts.inc()
+
+
+def session_class(settings):
+    """
+    pgbouncer transaction mode에서는 접속 시 server_settings를 쓸 수 없으므로
+    트랜잭션을 시작할 때마다 SET LOCAL statement_timeout을 실행하는 Session을 사용
+    """
+    if not (settings.DB_PGBOUNCER and settings.DB_STATEMENT_TIMEOUT_MS > 0):
+        return Session
+    timeout = int(settings.DB_STATEMENT_TIMEOUT_MS)
+
+    class StatementTimeoutSession(Session):
+        pass
+
+    @event.listens_for(StatementTimeoutSession, "after_begin")
+    def set_statement_timeout(session, transaction, connection):
+        connection.exec_driver_sql(f"SET LOCAL statement_timeout = {timeout}")
+
+    return StatementTimeoutSession
+
+
+def pool_status(pool) -> Dict:
+    """풀 사용 현황 (NullPool이면 풀링을 pgbouncer가 담당)"""
+    if not isinstance(pool, AsyncAdaptedQueuePool):
+        return {"class": type(pool).__name__}
+    return {
+        "class": type(pool).__name__,
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": pool.overflow(),
+        "max_overflow": pool._max_overflow,
+        "timeout": pool.timeout(),
+    }
+
+
+def monitor_status(settings, pool) -> Dict:
+    return {
+        "pool": pool_status(pool),
+        "checkout_wait": pool_monitor.checkout_summary(),
+        "pool_timeouts": pool_monitor.pool_timeouts,
+        "slow_queries": pool_monitor.slow_queries,
+        "slow_query_ms": settings.DB_SLOW_QUERY_MS,
+        "statement_timeouts": pool_monitor.statement_timeouts,
+        "statement_timeout_ms": settings.DB_STATEMENT_TIMEOUT_MS,
+        "pgbouncer": settings.DB_PGBOUNCER,
+    }
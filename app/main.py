@@ -1,6 +1,26 @@
-from fastapi import FastAPI
+import asyncio
+import logging
+import time
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from app.router import documents, chat
+from fastapi.responses import JSONResponse, PlainTextResponse
+from openai import APIError, APITimeoutError
+from sqlalchemy import exc as sa_exc, text
+from app.router import documents, chat, cases, auth, bulk, search
+from app.database import async_engine, AsyncSessionLocal
+from app.database.pool import monitor_status
+from app.database.crud import doc_prompts as crud_prompts
+from app.core.config import get_settings
+from app.utils.llm import get_llm_gateway
+from app.utils.llm_policy import LLMDeadlineExceeded, LLMUnavailable
+from app.utils.admission import AdmissionRejected
+from app.utils.oauth import get_oauth_handler
+from app.utils.jobs import get_job_queue
+from app.utils.retrieval import get_draft_retriever
+from app.utils.metrics import registry, http_request_duration, monitor_event_loop_lag
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
 
 app = FastAPI(title="AI Legal Document API")
 
@@ -18,9 +38,127 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        # 라벨 수가 늘지 않도록 실제 경로 대신 라우트 템플릿(/cases/{case_id})으로 기록
+        route = request.scope.get("route")
+        http_request_duration.observe(
+            time.perf_counter() - started,
+            method=request.method,
+            route=route.path if route else "unmatched",
+            status=status,
+        )
+
 # API 라우터 등록
 app.include_router(documents.router, tags=["Documents"])
 app.include_router(chat.router, tags=["Chat"])
+app.include_router(cases.router, tags=["Cases"])
+app.include_router(auth.router, tags=["Auth"])
+app.include_router(bulk.router, tags=["Bulk"])
+app.include_router(search.router, tags=["Search"])
+
+async def load_doc_prompts():
+    try:
+        async with AsyncSessionLocal() as db:
+            await crud_prompts.load_doc_prompts(db)
+    except Exception:
+        logger.exception("doc_prompts 적재 실패")
+
+async def refresh_doc_prompts(interval: int):
+    # 다른 워커에서 변경된 doc_prompts를 반영하기 위해 주기적으로 재적재
+    while True:
+        await asyncio.sleep(interval)
+        await load_doc_prompts()
+
+@app.on_event("startup")
+async def startup():
+    await load_doc_prompts()
+    if settings.PROMPT_REFRESH_INTERVAL > 0:
+        app.state.prompt_refresh_task = asyncio.create_task(
+            refresh_doc_prompts(settings.PROMPT_REFRESH_INTERVAL)
+        )
+    if settings.RETRIEVAL_ENABLED:
+        # 초안 참고 인덱스 로그를 첫 요청 전에 읽어 둠 (초안 수에 비례해 수 초 걸릴 수 있음)
+        await asyncio.to_thread(get_draft_retriever)
+    await get_job_queue().start()
+    app.state.loop_lag_task = asyncio.create_task(monitor_event_loop_lag())
+
+@app.on_event("shutdown")
+async def shutdown():
+    if getattr(app.state, "prompt_refresh_task", None):
+        app.state.prompt_refresh_task.cancel()
+    app.state.loop_lag_task.cancel()
+
+    # 실행 중인 작업은 pending으로 되돌려 다른 워커/다음 기동 시 이어서 실행
+    await get_job_queue().stop()
+
+    # LLM / OAuth / DB 커넥션 풀 정리
+    await get_llm_gateway().aclose()
+    await get_oauth_handler().aclose()
+    await async_engine.dispose()
+
+@app.exception_handler(APITimeoutError)
+async def llm_timeout_handler(request: Request, exc: APITimeoutError):
+    return JSONResponse(status_code=504, content={"detail": "LLM 응답 시간이 초과되었습니다."})
+
+@app.exception_handler(LLMDeadlineExceeded)
+async def llm_deadline_handler(request: Request, exc: LLMDeadlineExceeded):
+    return JSONResponse(status_code=504, content={"detail": "LLM 응답 시간이 초과되었습니다."})
+
+@app.exception_handler(LLMUnavailable)
+async def llm_unavailable_handler(request: Request, exc: LLMUnavailable):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "LLM 서비스가 일시적으로 불안정합니다. 잠시 후 다시 시도해주세요."},
+        headers={"Retry-After": str(max(1, int(exc.retry_after + 0.999)))},
+    )
+
+@app.exception_handler(AdmissionRejected)
+async def admission_rejected_handler(request: Request, exc: AdmissionRejected):
+    return JSONResponse(
+        status_code=429,
+        content={"detail": "요청이 많아 처리하지 못했습니다. 잠시 후 다시 시도해주세요."},
+        headers={"Retry-After": exc.retry_after_header},
+    )
+
+@app.exception_handler(APIError)
+async def llm_error_handler(request: Request, exc: APIError):
+    return JSONResponse(status_code=502, content={"detail": "LLM 호출에 실패했습니다."})
+
+@app.exception_handler(sa_exc.TimeoutError)
+async def db_pool_timeout_handler(request: Request, exc: sa_exc.TimeoutError):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "요청이 많아 처리하지 못했습니다. 잠시 후 다시 시도해주세요."},
+        headers={"Retry-After": "1"},
+    )
+
+@app.get("/health/db")
+async def health_db():
+    """
+    DB 연결 확인(SELECT 1)과 커넥션 풀 사용 현황, 커넥션 대기 시간, 느린 쿼리/timeout 횟수
+    (값은 요청을 받은 워커 프로세스 기준)
+    """
+    status = monitor_status(settings, async_engine.pool)
+    started = time.perf_counter()
+    try:
+        async with AsyncSessionLocal() as db:
+            await asyncio.wait_for(db.execute(text("SELECT 1")), timeout=settings.DB_POOL_TIMEOUT + 1)
+    except Exception as exc:
+        logger.warning("DB health check 실패: %r", exc)
+        return JSONResponse(status_code=503, content={"status": "error", "error": type(exc).__name__, **status})
+    return {"status": "ok", "ping_ms": round((time.perf_counter() - started) * 1000, 2), **status}
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
 
 # 기본 엔드포인트
 @app.get("/")
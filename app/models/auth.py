@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, JSON
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, JSON, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.models import Base
@@ -14,6 +14,10 @@ class OAuthAccount(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    __table_args__ = (
+        Index("uq_oauth_accounts_provider_account_id", "provider", "provider_account_id", unique=True),
+    )
+
     # Relationship
     user = relationship("User", back_populates="oauth_accounts")
 
@@ -32,5 +36,11 @@ class AttorneyVerification(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    __table_args__ = (
+        Index("ix_attorney_verifications_user_id", "user_id"),
+        # get_pending_verifications keyset 페이지네이션
+        Index("ix_attorney_verifications_status_created_at_id", "verification_status", "created_at", "id"),
+    )
+
     # Relationship
     user = relationship("User", back_populates="attorney_verification") 
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, func
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index, func
 from sqlalchemy.orm import relationship
 from app.models import Base
 
@@ -14,6 +14,13 @@ class Case(Base):
     created_at = Column(DateTime, default=func.now())
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
 
+    __table_args__ = (
+        # get_user_cases / get_attorney_cases / get_my_cases keyset 페이지네이션
+        Index("ix_cases_plaintiff_created_at_id", "plaintiff_id", "created_at", "id"),
+        Index("ix_cases_defendant_created_at_id", "defendant_id", "created_at", "id"),
+        Index("ix_cases_attorney_created_at_id", "assigned_attorney_id", "created_at", "id"),
+    )
+
     # Relationships
     plaintiff = relationship("User", back_populates="plaintiff_cases", foreign_keys=[plaintiff_id])
     defendant = relationship("User", back_populates="defendant_cases", foreign_keys=[defendant_id])
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text
+from sqlalchemy import Column, Integer, String, Text, Index
 from app.models import Base
 
 class DocPrompt(Base):
@@ -7,4 +7,10 @@ class DocPrompt(Base):
     id = Column(Integer, primary_key=True, index=True)
     case_type = Column(String(50), nullable=False)  # '민사-임대차', '형사-사기' 등
     doc_type = Column(String(50), nullable=False)   # '소장', '항소장', '준비서면' 등
-    prompt_text = Column(Text, nullable=False)      # ChatGPT system role / template prompt 
\ No newline at end of file
+    prompt_text = Column(Text, nullable=False)      # ChatGPT system role / template prompt
+
+    __table_args__ = (
+        Index("uq_doc_prompts_case_type_doc_type", "case_type", "doc_type", unique=True),
+        # get_doc_prompts keyset 페이지네이션
+        Index("ix_doc_prompts_case_type_doc_type_id", "case_type", "doc_type", "id"),
+    )
\ No newline at end of file
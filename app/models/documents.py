@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, JSON, Index, UniqueConstraint
 from app.models import Base
 
 class Draft(Base):
@@ -6,6 +6,26 @@ class Draft(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     session_id = Column(String(50), nullable=False)
-    title = Column(Text, nullable=False)
+    case_type = Column(String(50))  # 생성 시 case_type (0006 이전 초안은 NULL)
+    title = Column(Text, nullable=False)  # doc_type
     content = Column(Text, nullable=False)
-    updated_at = Column(DateTime, nullable=False)
\ No newline at end of file
+    updated_at = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        Index("ix_drafts_session_id", "session_id"),
+    )
+
+class DraftRevision(Base):
+    __tablename__ = "draft_revisions"
+
+    id = Column(Integer, primary_key=True, index=True)
+    session_id = Column(String(50), nullable=False)
+    revision = Column(Integer, nullable=False)  # 세션별 1부터 증가
+    is_snapshot = Column(Boolean, nullable=False)  # True면 content에 전체 원문 저장
+    content = Column(Text)  # 스냅샷 원문
+    delta = Column(JSON)  # 직전 revision 대비 delta (app.utils.delta)
+    created_at = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("session_id", "revision", name="uq_draft_revisions_session_id_revision"),
+    )
\ No newline at end of file
@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, JSON, Index
+from app.models import Base
+
+class Job(Base):
+    __tablename__ = "jobs"
+
+    id = Column(String(36), primary_key=True)  # uuid4
+    kind = Column(String(50), nullable=False)  # 'generate_draft' 등
+    status = Column(String(20), nullable=False, default="pending")  # pending, running, succeeded, failed
+    payload = Column(JSON, nullable=False)
+    result = Column(JSON)
+    error = Column(Text)
+    attempts = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, nullable=False)
+    started_at = Column(DateTime)
+    heartbeat_at = Column(DateTime)
+    finished_at = Column(DateTime)
+
+    __table_args__ = (
+        Index("ix_jobs_status_created_at", "status", "created_at"),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, func
+from sqlalchemy import Column, Integer, String, DateTime, Index, func
 from sqlalchemy.orm import relationship
 from app.models import Base
 
@@ -14,6 +14,11 @@ class User(Base):
     created_at = Column(DateTime, default=func.now())
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
 
+    __table_args__ = (
+        # get_users keyset 페이지네이션
+        Index("ix_users_created_at_id", "created_at", "id"),
+    )
+
     # Relationships
     plaintiff_cases = relationship("Case", back_populates="plaintiff", foreign_keys="Case.plaintiff_id")
     defendant_cases = relationship("Case", back_populates="defendant", foreign_keys="Case.defendant_id")
@@ -0,0 +1,85 @@
+import json
+from contextlib import aclosing
+from typing import AsyncIterator, Dict, Literal
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
+from fastapi.responses import StreamingResponse
+from app.database.crud import bulk as crud_bulk
+from app.database import AsyncSessionLocal
+from app.utils.bulk import iter_lines, split_csv_header, to_ndjson
+from app.utils.security import require_api_token
+
+router = APIRouter(prefix="/bulk", tags=["bulk"])
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+# 테넌트 이전/분석용 내부 API
+verify_bulk_token = require_api_token("BULK_API_TOKEN", "X-Bulk-Token")
+
+def check_table(table: str):
+    if table not in crud_bulk.BULK_TABLES:
+        raise HTTPException(status_code=404, detail="지원하지 않는 테이블입니다.")
+
+@router.get("/export/{table}", dependencies=[Depends(verify_bulk_token)])
+async def export_table(
+    table: str,
+    format: Literal["ndjson", "csv"] = "ndjson",
+    batch_size: int = Query(1000, ge=1, le=10000),
+    include_secrets: bool = False
+):
+    """
+    테이블 전체를 NDJSON 또는 CSV(헤더 포함)로 스트리밍
+    NDJSON은 server-side cursor, CSV는 COPY TO STDOUT을 사용하므로 메모리 사용량이 테이블 크기와 무관
+    비밀번호 해시 같은 민감 컬럼은 include_secrets=true일 때만 포함
+    """
+    check_table(table)
+
+    # 응답이 중간에 끊겨도 세션을 닫기 전에 내부 스트림(COPY 태스크 등)을 먼저 정리
+    async def ndjson() -> AsyncIterator[str]:
+        async with AsyncSessionLocal() as db:
+            async with aclosing(crud_bulk.stream_rows(db, table, batch_size, include_secrets)) as batches:
+                async for rows in batches:
+                    yield "".join(to_ndjson(row) for row in rows)
+
+    async def csv() -> AsyncIterator[bytes]:
+        async with AsyncSessionLocal() as db:
+            async with aclosing(crud_bulk.stream_csv(db, table, include_secrets)) as chunks:
+                async for chunk in chunks:
+                    yield chunk
+
+    return StreamingResponse(
+        ndjson() if format == "ndjson" else csv(),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{table}.{format}"'},
+    )
+
+@router.post("/import/{table}", dependencies=[Depends(verify_bulk_token)])
+async def import_table(
+    table: str,
+    request: Request,
+    format: Literal["ndjson", "csv"] = "ndjson",
+    batch_size: int = Query(1000, ge=1, le=10000)
+) -> Dict:
+    """
+    요청 본문(NDJSON 또는 헤더가 있는 CSV)을 COPY FROM STDIN으로 한 번에 적재
+    한 행이라도 실패하면 전체가 rollback됩니다
+    """
+    check_table(table)
+
+    async def rows() -> AsyncIterator[Dict]:
+        async for line in iter_lines(request.stream()):
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as exc:
+                raise ValueError(f"잘못된 NDJSON 행입니다: {exc}")
+
+    try:
+        async with AsyncSessionLocal() as db:
+            if format == "ndjson":
+                imported = await crud_bulk.import_rows(db, table, rows(), batch_size)
+            else:
+                columns, body = await split_csv_header(request.stream())
+                imported = await crud_bulk.copy_csv(db, table, columns, body)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    return {"table": table, "imported": imported}
@@ -0,0 +1,99 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, Optional
+from app.database import get_db
+from app.database.crud import cases as crud_cases
+from app.utils.security import get_current_user
+
+router = APIRouter(prefix="/cases", tags=["cases"])
+
+def check_owner(user: Dict, user_id: int):
+    """다른 사용자의 사건 목록은 조회할 수 없음"""
+    if user["id"] != user_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not allowed to view other users' cases"
+        )
+
+@router.get("/user/{user_id}")
+async def list_user_cases(
+    user_id: int,
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    user: Dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    원고로 등록된 사건 목록 (cursor 기반 페이지네이션, 본인만 조회 가능)
+    """
+    check_owner(user, user_id)
+    try:
+        return await crud_cases.get_user_cases(db, user_id, cursor=cursor, limit=limit)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+@router.get("/attorney/{attorney_id}")
+async def list_attorney_cases(
+    attorney_id: int,
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    user: Dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    변호사에게 배정된 사건 목록 (cursor 기반 페이지네이션, 담당 변호사 본인만 조회 가능)
+    """
+    check_owner(user, attorney_id)
+    try:
+        return await crud_cases.get_attorney_cases(db, attorney_id, cursor=cursor, limit=limit)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+@router.get("/me")
+async def list_my_cases(
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    user: Dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    로그인한 사용자가 원고, 피고 또는 담당 변호사인 사건 목록 (cursor 기반 페이지네이션)
+    """
+    try:
+        return await crud_cases.get_my_cases(db, user["id"], cursor=cursor, limit=limit)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+def is_case_party(user: Dict, case: Dict) -> bool:
+    """원고, 피고 또는 담당 변호사인지 확인"""
+    return user["id"] in (
+        case.get("plaintiff_id"),
+        case.get("defendant_id"),
+        case.get("assigned_attorney_id"),
+    )
+
+@router.get("/{case_id}")
+async def get_case(
+    case_id: int,
+    user: Dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    사건 상세 조회 (당사자와 담당 변호사만 조회 가능, 그 외에는 사건 존재 여부도 알리지 않도록 404)
+    """
+    case = await crud_cases.get_case(db, case_id)
+    if not case or not is_case_party(user, case):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Case not found"
+        )
+    return case
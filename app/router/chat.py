@@ -2,81 +2,132 @@ from fastapi import APIRouter, UploadFile, File, HTTPException, Depends
 from typing import List, Optional, Dict
 from pydantic import BaseModel
 from enum import Enum
-import uuid
 from datetime import datetime
-from openai import OpenAI
-from sqlalchemy.orm import Session
-from app.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_db, AsyncSessionLocal
 from app.database.crud import chat as crud_chat
 from app.database.crud import doc_prompts as crud_prompts
 from app.core.config import get_settings
+from app.utils.llm import get_llm_gateway
+from app.utils.context import context_builder
+from app.utils.sse import sse_event, sse_response
+from app.utils.security import admit_llm_request
+from app.utils.admission import SlotReservation
 import json
 
 router = APIRouter(prefix="/chat", tags=["chat"])
 settings = get_settings()
-client = OpenAI(api_key=settings.OPENAI_API_KEY)
 
 class ChatRequest(BaseModel):
     message: Dict
     session_id: Optional[str] = None
+    stream: bool = False  # True면 토큰을 SSE로 전송
 
 @router.post("/")
-async def chat_endpoint(request: ChatRequest, db: Session = Depends(get_db)):
+async def chat_endpoint(
+    request: ChatRequest,
+    user: Optional[Dict] = Depends(admit_llm_request)  # 토큰 검증 + 사용자별 호출 빈도/우선순위
+):
     # 1) unpack fields
     session_id = request.session_id
     msg_dict = request.message
     role = msg_dict['role']
     content = msg_dict['content']
 
-    if session_id is None:
-        # 세션ID가 없다면 새로 생성
-        print("session_id is None")
-        session_id = str(uuid.uuid4())
+    if session_id is not None:
+        try:
+            session_id = crud_chat.to_session_id(session_id)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="잘못된 session_id입니다.")
 
     # 2) DB에서 과거 대화 불러오기
-    chat_history = crud_chat.get_chat_history(db, session_id)
-    # chat_history = [] if no prior messages
+    # LLM 호출 동안 커넥션을 잡고 있지 않도록 읽기(2~4)와 저장(6)을 각각 짧은 세션으로 나눔
+    async with AsyncSessionLocal() as db:
+        if session_id is None:
+            # 세션ID가 없다면 chat_sessions에 새로 생성
+            session_id = (await crud_chat.create_chat_session(db))["id"]
+            chat_history = []
+        else:
+            chat_history = await crud_chat.get_chat_history(db, session_id)
+            # 대화가 없으면 세션이 실제로 있는지 확인 (없는 세션에 저장하면 FK 위반)
+            if not chat_history and not await crud_chat.chat_session_exists(db, session_id):
+                raise HTTPException(status_code=404, detail="대화 세션을 찾을 수 없습니다.")
 
-    # 3) 메시지 배열 구성
-    messages = []
+        # 3) system 메시지 구성
+        system_messages = []
 
-    if not chat_history:
-        # 대화가 없는 세션 => system 메시지 딱 한 번 추가
-        system_prompt = """
-        당신은 비법조인의 법률 전문가입니다. 아래 사항을 준수하세요.
-        1. 사용자가 초안 작성에 도움이 되도록 1가지 대답만 할 수 있는 질문을 하세요.
-        2. 사용자가 법률 문서 작성 외의 질문을 하면 관련 질문을 하도록 유도해주세요.
-        3. 사용자가 요청한 문서 작성에 필요한 정보를 모두 받았다면 초안 작성 버튼을 누르도록 유도해주세요.
-        4. 당신은 절대로 초안 작성 또는 예시 작성을 하지마세요.
-        """
-        messages.append({"role": "system", "content": system_prompt})
+        if not chat_history:
+            # 대화가 없는 세션 => system 메시지 딱 한 번 추가
+            system_prompt = """
+            당신은 비법조인의 법률 전문가입니다. 아래 사항을 준수하세요.
+            1. 사용자가 초안 작성에 도움이 되도록 1가지 대답만 할 수 있는 질문을 하세요.
+            2. 사용자가 법률 문서 작성 외의 질문을 하면 관련 질문을 하도록 유도해주세요.
+            3. 사용자가 요청한 문서 작성에 필요한 정보를 모두 받았다면 초안 작성 버튼을 누르도록 유도해주세요.
+            4. 당신은 절대로 초안 작성 또는 예시 작성을 하지마세요.
+            """
+            system_messages.append({"role": "system", "content": system_prompt})
 
-    # 이제 기존 대화 DB에 있는 메시지를 messages 에 추가
-    for old_msg in chat_history:
-        messages.append({
-            "role": old_msg['role'],
-            "content": old_msg['content']
-        })
-
-    # 4) 이번에 들어온 user 메시지도 DB에 저장
-    #    (role='user'인 경우)
-    crud_chat.create_chat_message(db, session_id, role, content)
-
-    # 그리고 messages에도 append
-    messages.append({"role": role, "content": content})
+        # 4) 토큰 예산 안의 최근 대화 + 이전 대화 요약 + 이번 메시지로 messages 구성
+        messages = await context_builder.build(
+            db,
+            session_id,
+            system_messages,
+            chat_history,
+            pending=[{"role": role, "content": content}],
+        )
 
     # 5) ChatGPT 호출
-    response = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=messages,
+    if request.stream:
+        # 200 응답 본문을 시작하기 전에 슬롯을 받아 둠 (혼잡하면 여기서 429 + Retry-After)
+        reservation = await get_llm_gateway().limiter.reserve()
+        return sse_response(stream_chat_response(session_id, messages, role, content, reservation))
+
+    gpt_response = await get_llm_gateway().chat_completion(
+        messages,
         temperature=0.7
     )
-    gpt_response = response.choices[0].message.content
 
-    # 6) assistant 메시지를 DB에 저장
-    crud_chat.create_chat_message(db, session_id, "assistant", gpt_response)
+    # 6) 이번 user 메시지와 assistant 메시지를 한 트랜잭션으로 저장
+    async with AsyncSessionLocal() as db:
+        await crud_chat.create_chat_messages(db, session_id, [
+            {"role": role, "content": content},
+            {"role": "assistant", "content": gpt_response},
+        ])
 
     return {
-        "session_id": session_id,
+        "session_id": str(session_id),
         "response": gpt_response
-    }
\ No newline at end of file
+    }
+
+async def stream_chat_response(
+    session_id: int,
+    messages: List[Dict],
+    role: str,
+    content: str,
+    reservation: Optional[SlotReservation] = None
+):
+    """
+    토큰을 SSE로 흘려보내고 스트림이 끝나면 user/assistant 메시지를 저장
+    (요청 스코프 DB 세션은 응답 전에 닫힐 수 있으므로 별도 세션 사용)
+    """
+    chunks = []
+    try:
+        async for delta in get_llm_gateway().stream_chat_completion(
+            messages,
+            temperature=0.7,
+            reservation=reservation,
+        ):
+            chunks.append(delta)
+            yield sse_event({"delta": delta})
+    except Exception:
+        yield sse_event({"detail": "LLM 호출에 실패했습니다."}, event="error")
+        return
+
+    gpt_response = "".join(chunks)
+    async with AsyncSessionLocal() as db:
+        await crud_chat.create_chat_messages(db, session_id, [
+            {"role": role, "content": content},
+            {"role": "assistant", "content": gpt_response},
+        ])
+
+    yield sse_event({"session_id": str(session_id), "response": gpt_response}, event="done")
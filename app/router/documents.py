@@ -4,15 +4,23 @@ from pydantic import BaseModel
 from app.database.crud import doc_prompts as crud_prompts
 from app.database.crud import chat as crud_chat
 from app.database.crud import documents as crud_documents
-from app.database import get_db
-from sqlalchemy.orm import Session
+from app.database import get_db, AsyncSessionLocal
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.config import get_settings
-from openai import OpenAI
+from app.utils.llm import get_llm_gateway
+from app.utils.context import context_builder, reference_message
+from app.utils.retrieval import get_draft_retriever
+from app.utils.sse import sse_event, sse_response
+from app.utils.diff import get_text_changes
+from app.utils.security import admit_llm_request
+from app.utils.admission import PRIORITY_ANONYMOUS, SlotReservation, current_llm_priority, set_llm_priority
+from app.utils.singleflight import SingleFlight, StreamFlight, KeyedLock
+from app.utils.jobs import get_job_queue
+from typing import Dict, Optional
+import asyncio
 import markdown
-import difflib
 
 settings = get_settings()
-client = OpenAI(api_key=settings.OPENAI_API_KEY)
 
 router = APIRouter(prefix="/documents", tags=["documents"])
 
@@ -20,9 +28,79 @@ class GenerateDraftRequest(BaseModel):
     session_id: str
     case_type: str
     doc_type: str
+    stream: bool = False  # True면 토큰을 SSE로 전송
+    use_cache: bool = True  # False면 캐시된 응답을 쓰지 않고 새로 생성
+
+# 같은 세션의 중복 생성 요청은 진행 중인 결과를 공유하고, 세션별 쓰기는 직렬화
+draft_flights = SingleFlight()
+draft_streams = StreamFlight()
+draft_locks = KeyedLock()
+
+async def build_draft_messages(db: AsyncSession, session_id: str, case_type: str, doc_type: str) -> list:
+    doc_prompt = await crud_prompts.get_doc_prompt(db, case_type, doc_type)
+    if not doc_prompt:
+        raise HTTPException(status_code=404, detail="문서 유형을 찾을 수 없습니다.")
+
+    try:
+        chat_history = await crud_chat.get_chat_history(db, session_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="잘못된 session_id입니다.")
+    system_messages = [{"role": "system", "content": doc_prompt["prompt_text"]}]
+    reference = await draft_reference(session_id, case_type, doc_type, chat_history)
+    if reference:
+        system_messages.append(reference)
+    return await context_builder.build(db, session_id, system_messages, chat_history)
+
+# 참고 발췌 검색에 쓰는 최근 사용자 발화 길이 (글자 수)
+REFERENCE_QUERY_CHARS = 2000
+
+async def draft_reference(session_id: str, case_type: str, doc_type: str, chat_history: list) -> Optional[Dict]:
+    """
+    같은 case_type/doc_type의 다른 세션 초안 중 대화 내용과 가까운 발췌를
+    RETRIEVAL_TOKEN_BUDGET 안에서 참고 system 메시지로 만든다
+    """
+    if not settings.RETRIEVAL_ENABLED:
+        return None
+    query = "\n".join(m["content"] for m in chat_history if m["role"] == "user")[-REFERENCE_QUERY_CHARS:]
+    passages = await get_draft_retriever().asearch(
+        case_type, doc_type, query, k=settings.RETRIEVAL_TOP_K, exclude=session_id
+    )
+    return reference_message(passages, settings.RETRIEVAL_TOKEN_BUDGET)
+
+async def index_draft(session_id: str, case_type: str, doc_type: str, draft: str):
+    """저장된 초안을 이후 생성 요청의 참고 인덱스에 반영"""
+    if settings.RETRIEVAL_ENABLED:
+        await get_draft_retriever().aadd_draft(session_id, case_type, doc_type, draft)
+
+async def run_generate_draft(session_id: str, case_type: str, doc_type: str, use_cache: bool = True) -> Dict:
+    """
+    초안 생성 본체 (중복 요청이 결과를 공유하므로 요청 스코프가 아닌 별도 DB 세션 사용)
+    LLM 호출 동안 커넥션을 잡고 있지 않도록 읽기와 쓰기를 각각 짧은 세션으로 나눔
+    """
+    async with AsyncSessionLocal() as db:
+        messages = await build_draft_messages(db, session_id, case_type, doc_type)
+
+    content = await get_llm_gateway().chat_completion(
+        messages,
+        cache=True,
+        use_cache=use_cache,
+        max_tokens=500,
+        temperature=0.7,
+    )
+
+    draft = markdown.markdown(content)
+    async with draft_locks.acquire(session_id):
+        async with AsyncSessionLocal() as db:
+            await crud_documents.create_draft(db, session_id, doc_type, draft, case_type=case_type)
+    await index_draft(session_id, case_type, doc_type, draft)
+
+    return {"session_id": session_id, "draft": draft}
 
 @router.post("/generate_draft")
-async def generate_draft(request: GenerateDraftRequest, db: Session = Depends(get_db)):
+async def generate_draft(
+    request: GenerateDraftRequest,
+    user: Optional[Dict] = Depends(admit_llm_request)
+):
     """
     사용자가 입력한 문서 필수 항목을 ChatGPT를 이용하여 문맥을 다듬어 반환
     """
@@ -30,62 +108,77 @@ async def generate_draft(request: GenerateDraftRequest, db: Session = Depends(ge
     case_type = request.case_type
     doc_type = request.doc_type
 
-    doc_prompt = crud_prompts.get_doc_prompt(db, case_type, doc_type)
-    if not doc_prompt:
-        raise HTTPException(status_code=404, detail="문서 유형을 찾을 수 없습니다.")
-    
-    messages = [{"role": "system", "content": doc_prompt["prompt_text"]}]
-
-    chat_history = crud_chat.get_chat_history(db, session_id)
-    for message in chat_history:
-        messages.append({
-            "role": message["role"],
-            "content": message["content"]
-        })
-
-    response = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=messages,
-        max_tokens=500,
-        temperature=0.7,
+    if request.stream:
+        key = ("generate", session_id, case_type, doc_type, request.use_cache)
+        if not draft_streams.in_flight(key):
+            async with AsyncSessionLocal() as db:
+                messages = await build_draft_messages(db, session_id, case_type, doc_type)
+            # 200 응답 본문을 시작하기 전에 슬롯을 받아 둠 (혼잡하면 여기서 429 + Retry-After)
+            reservation = await get_llm_gateway().limiter.reserve()
+            if draft_streams.in_flight(key):
+                reservation.release()  # 기다리는 사이 같은 요청이 먼저 스트림을 시작함
+            else:
+                draft_streams.start(
+                    key, stream_draft(session_id, case_type, doc_type, messages, request.use_cache, reservation)
+                )
+        # 같은 key의 스트림이 진행 중이면 LLM을 다시 호출하지 않고 그 스트림을 함께 받음
+        return sse_response(draft_streams.follow(key))
+
+    return await draft_flights.do(
+        ("generate", session_id, case_type, doc_type, request.use_cache),
+        lambda: run_generate_draft(session_id, case_type, doc_type, request.use_cache),
     )
 
-    draft = markdown.markdown(response.choices[0].message.content)
-    crud_documents.create_draft(db, session_id, doc_type, draft)
+async def stream_draft(
+    session_id: str,
+    case_type: str,
+    doc_type: str,
+    messages: list,
+    use_cache: bool = True,
+    reservation: Optional[SlotReservation] = None
+):
+    """
+    markdown 원문 토큰을 SSE로 흘려보내고, 완료 시 HTML로 변환해 저장
+    """
+    chunks = []
+    try:
+        async for delta in get_llm_gateway().stream_chat_completion(
+            messages,
+            cache=True,
+            use_cache=use_cache,
+            max_tokens=500,
+            temperature=0.7,
+            reservation=reservation,
+        ):
+            chunks.append(delta)
+            yield sse_event({"delta": delta})
+    except Exception:
+        yield sse_event({"detail": "LLM 호출에 실패했습니다."}, event="error")
+        return
 
-    return {"session_id": session_id, "draft": draft}
+    draft = markdown.markdown("".join(chunks))
+    async with draft_locks.acquire(session_id):
+        async with AsyncSessionLocal() as db:
+            await crud_documents.create_draft(db, session_id, doc_type, draft, case_type=case_type)
+    await index_draft(session_id, case_type, doc_type, draft)
+
+    yield sse_event({"session_id": session_id, "draft": draft}, event="done")
 
 class UpdateDraftRequest(BaseModel):
     session_id: str
 
-def get_text_changes(old_text: str, new_text: str) -> dict:
-    """텍스트 간의 차이점을 찾아 반환"""
-    differ = difflib.SequenceMatcher(None, old_text, new_text)
-    changes = []
-    
-    for tag, i1, i2, j1, j2 in differ.get_opcodes():
-        if tag != 'equal':  # 변경된 부분만 추출
-            changes.append({
-                'type': tag,  # 'replace', 'delete', 'insert' 중 하나
-                'oldText': old_text[i1:i2],
-                'newText': new_text[j1:j2],
-                'position': {'start': i1, 'end': i2}
-            })
-    
-    return {'changes': changes}
-
-@router.post("/update_draft")
-async def update_draft(request: UpdateDraftRequest, db: Session = Depends(get_db)):
+async def run_update_draft(session_id: str) -> Dict:
     """
-    사용자가 입력한 문서 필수 항목을 ChatGPT를 이용하여 문맥을 다듬어 반환
+    초안 수정 본체. LLM 호출 동안 커넥션과 lock을 잡고 있지 않도록 읽기와 쓰기를 나누고,
+    그사이 다른 요청이 초안을 바꿨으면 덮어쓰지 않고 409를 반환한다
     """
-    draft = crud_documents.get_draft(db, request.session_id)
+    async with AsyncSessionLocal() as db:
+        draft = await crud_documents.get_draft(db, session_id)
     if not draft:
         raise HTTPException(status_code=404, detail="문서를 찾을 수 없습니다.")
-    
+
     old_content = draft["content"]
-    session_id = request.session_id
-    
+
     messages = [
         {"role": "system", "content": '''
             1. 사용자의 수정 요청을 반영하여 초안을 수정하여 반환해주세요.
@@ -94,22 +187,176 @@ async def update_draft(request: UpdateDraftRequest, db: Session = Depends(get_db
         {"role": "user", "content": f"Draft content: {old_content}"}
     ]
 
-    response = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=messages,
+    content = await get_llm_gateway().chat_completion(
+        messages,
         max_tokens=500,
         temperature=0.7,
     )
 
-    updated_draft = markdown.markdown(response.choices[0].message.content)
-    crud_documents.update_draft(db, request.session_id, updated_draft)
-    
-    # 변경사항 찾기
-    changes = get_text_changes(old_content, updated_draft)
+    updated_draft = markdown.markdown(content)
+    async with draft_locks.acquire(session_id):
+        async with AsyncSessionLocal() as db:
+            updated = await crud_documents.update_draft(
+                db, session_id, updated_draft, expected_updated_at=draft["updated_at"]
+            )
+    if not updated:
+        raise HTTPException(status_code=409, detail="초안이 다른 요청으로 수정되었습니다. 다시 시도해주세요.")
+    if settings.RETRIEVAL_ENABLED:
+        await get_draft_retriever().aupdate_draft(
+            session_id, updated_draft, case_type=draft.get("case_type"), doc_type=draft["title"]
+        )
+
+    # 변경사항 찾기 (긴 초안은 수백 ms 걸릴 수 있으므로 이벤트 루프 밖에서)
+    changes = await asyncio.to_thread(get_text_changes, old_content, updated_draft)
 
     return {
         "session_id": session_id,
         "updated_draft": updated_draft,
         "changes": changes,
         "message": "요청하신 내용을 반영하여 수정하였습니다."
-    }
\ No newline at end of file
+    }
+
+@router.post("/update_draft")
+async def update_draft(
+    request: UpdateDraftRequest,
+    user: Optional[Dict] = Depends(admit_llm_request)
+):
+    """
+    사용자가 입력한 문서 필수 항목을 ChatGPT를 이용하여 문맥을 다듬어 반환
+    """
+    return await draft_flights.do(
+        ("update", request.session_id),
+        lambda: run_update_draft(request.session_id),
+    )
+
+async def run_generate_draft_job(payload: Dict) -> Dict:
+    # 작업을 등록한 요청의 LLM 우선순위를 워커에서도 그대로 사용
+    set_llm_priority(payload.get("priority", PRIORITY_ANONYMOUS))
+    return await run_generate_draft(
+        payload["session_id"], payload["case_type"], payload["doc_type"], payload.get("use_cache", True)
+    )
+
+get_job_queue().register("generate_draft", run_generate_draft_job)
+
+@router.post("/generate_draft/jobs", status_code=202)
+async def submit_generate_draft_job(
+    request: GenerateDraftRequest,
+    user: Optional[Dict] = Depends(admit_llm_request)
+):
+    """
+    초안 생성을 백그라운드 작업으로 등록하고 job id를 바로 반환
+    (/documents/jobs/{job_id}로 상태 조회, /documents/jobs/{job_id}/events로 완료 대기)
+    """
+    job = await get_job_queue().submit(
+        "generate_draft",
+        {
+            "session_id": request.session_id,
+            "case_type": request.case_type,
+            "doc_type": request.doc_type,
+            "use_cache": request.use_cache,
+            "priority": current_llm_priority(),
+        },
+    )
+    return {"job_id": job["id"], "status": job["status"]}
+
+@router.get("/jobs/stats")
+async def job_queue_stats():
+    """
+    대기 중인 작업 수, 가장 오래 기다린 작업의 대기 시간, 최근 작업의 대기 시간 (워커 수 산정용)
+    """
+    return await get_job_queue().stats()
+
+def job_response(job: Dict) -> Dict:
+    return {
+        "job_id": job["id"],
+        "status": job["status"],
+        "attempts": job["attempts"],
+        "result": job["result"],
+        "error": job["error"],
+        "created_at": job["created_at"],
+        "finished_at": job["finished_at"],
+    }
+
+@router.get("/jobs/{job_id}")
+async def get_job(job_id: str, wait: float = 0):
+    """
+    작업 상태 조회. wait(초)를 주면 그 시간 동안 완료를 기다렸다가 응답 (long polling, 최대 30초)
+    """
+    queue = get_job_queue()
+    job = await queue.wait(job_id, min(wait, 30)) if wait > 0 else await queue.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다.")
+    return job_response(job)
+
+@router.get("/jobs/{job_id}/events")
+async def job_events(job_id: str):
+    """
+    작업이 끝나면 결과를 SSE done 이벤트로 전송 (대기 중에는 status 이벤트로 연결 유지)
+    """
+    queue = get_job_queue()
+    job = await queue.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다.")
+
+    async def events():
+        current = job
+        while current and current["status"] not in ("succeeded", "failed"):
+            yield sse_event({"status": current["status"]}, event="status")
+            current = await queue.wait(job_id, 15) or current
+        yield sse_event(job_response(current), event="done")
+
+    return sse_response(events())
+
+@router.get("/cache/stats")
+async def llm_cache_stats():
+    """
+    초안 생성 응답 캐시 적중/미적중 횟수
+    """
+    cache = get_llm_gateway().response_cache
+    return cache.stats() if cache else {"enabled": False}
+
+@router.get("/{session_id}/revisions")
+async def list_draft_revisions(session_id: str, db: AsyncSession = Depends(get_db)):
+    """
+    초안 revision 목록
+    """
+    return {"session_id": session_id, "revisions": await crud_documents.get_draft_revisions(db, session_id)}
+
+@router.get("/{session_id}/revisions/{revision}")
+async def get_draft_revision(session_id: str, revision: int, db: AsyncSession = Depends(get_db)):
+    """
+    특정 revision의 초안 내용
+    """
+    try:
+        draft_revision = await crud_documents.get_draft_revision(db, session_id, revision)
+    except ValueError:
+        raise HTTPException(status_code=409, detail="해당 버전의 이력을 복원할 수 없습니다.")
+    if not draft_revision:
+        raise HTTPException(status_code=404, detail="해당 버전을 찾을 수 없습니다.")
+    return draft_revision
+
+@router.get("/{session_id}/revisions/{from_revision}/diff/{to_revision}")
+async def diff_draft_revisions(
+    session_id: str,
+    from_revision: int,
+    to_revision: int,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    두 revision 사이의 변경사항
+    """
+    try:
+        old = await crud_documents.get_draft_revision(db, session_id, from_revision)
+        new = await crud_documents.get_draft_revision(db, session_id, to_revision)
+    except ValueError:
+        raise HTTPException(status_code=409, detail="해당 버전의 이력을 복원할 수 없습니다.")
+    if not old or not new:
+        raise HTTPException(status_code=404, detail="해당 버전을 찾을 수 없습니다.")
+
+    changes = await asyncio.to_thread(get_text_changes, old["content"], new["content"])
+    return {
+        "session_id": session_id,
+        "from_revision": from_revision,
+        "to_revision": to_revision,
+        "changes": changes
+    }
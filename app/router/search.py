@@ -0,0 +1,32 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Literal, Optional
+from app.database import get_db
+from app.database.crud import search as crud_search
+from app.utils.security import require_api_token
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+# 지원팀용 내부 API (모든 세션의 대화/초안을 검색하므로 토큰으로 보호)
+verify_support_token = require_api_token("SUPPORT_API_TOKEN", "X-Support-Token")
+
+@router.get("", dependencies=[Depends(verify_support_token)])
+async def search_content(
+    q: str = Query(..., min_length=2, max_length=200),
+    source: Optional[Literal["message", "draft"]] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    채팅 메시지/초안 본문 검색 (관련도 순, cursor 기반 페이지네이션)
+    예: 임대인 이름이나 "보증금 5000만원"처럼 공백으로 나눈 검색어를 모두 포함하는 항목
+    메시지와 초안 각각 가장 최근에 일치한 SEARCH_CANDIDATE_LIMIT건(기본 1000건) 안에서만 순위를 매김
+    """
+    try:
+        return await crud_search.search_content(db, q, source=source, cursor=cursor, limit=limit)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc)
+        )
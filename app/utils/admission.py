@@ -0,0 +1,231 @@
+"""
+LLM 호출 admission control
+
+- 사용자별 token bucket: 요청 시점에 토큰이 없으면 바로 429 (비로그인 사용자는 IP 기준)
+- 전역 동시 호출 상한: 워커 프로세스당 LLM_MAX_CONCURRENCY개의 슬롯을 LLMGateway가 나눠 씀
+- 우선순위 대기열: 슬롯이 없으면 구독(subscription) > 건별 결제(per_doc 등) > 비로그인 순서로 배정
+- 대기열에서 queue_timeout 안에 슬롯을 받지 못하면 AdmissionRejected (429 + Retry-After)
+- SSE 응답은 본문을 시작하기 전에 슬롯을 예약(reserve)해 200 대신 429를 바로 돌려줌
+
+요청의 우선순위는 admit_llm_request 의존성(app.utils.security)이 contextvar에 기록하고,
+같은 요청에서 만들어지는 LLM 호출(hedge, 요약, 스트리밍 포함)이 이를 그대로 사용합니다.
+"""
+import asyncio
+import heapq
+import itertools
+import math
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Dict, Optional
+
+from app.core.config import get_settings
+from app.utils.metrics import llm_admission_rejected
+
+PRIORITY_SUBSCRIPTION = 0
+PRIORITY_USER = 1
+PRIORITY_ANONYMOUS = 2
+PRIORITY_NAMES = {PRIORITY_SUBSCRIPTION: "subscription", PRIORITY_USER: "user", PRIORITY_ANONYMOUS: "anonymous"}
+
+_llm_priority: ContextVar[int] = ContextVar("llm_priority", default=PRIORITY_ANONYMOUS)
+
+
+class AdmissionRejected(Exception):
+    def __init__(self, retry_after: float, reason: str):
+        super().__init__(f"LLM admission rejected: {reason}")
+        self.retry_after = retry_after
+        self.reason = reason
+
+    @property
+    def retry_after_header(self) -> str:
+        return str(max(1, math.ceil(self.retry_after)))
+
+
+def priority_for(user: Optional[Dict]) -> int:
+    if user is None:
+        return PRIORITY_ANONYMOUS
+    if user.get("subscription_type") == "subscription":
+        return PRIORITY_SUBSCRIPTION
+    return PRIORITY_USER
+
+
+def set_llm_priority(priority: int):
+    _llm_priority.set(priority)
+
+
+def current_llm_priority() -> int:
+    return _llm_priority.get()
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def take(self) -> float:
+        """토큰을 하나 쓰고 0을 반환. 토큰이 없으면 다음 토큰까지 남은 시간(초)"""
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class UserRateLimiter:
+    """key(사용자/IP)별 token bucket. 최근에 쓰지 않은 bucket부터 max_keys개를 넘으면 정리"""
+
+    def __init__(self, rate: float, burst: float, max_keys: int = 100000):
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()
+
+    def check(self, key: str):
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = TokenBucket(self.rate, self.burst)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+
+        wait = bucket.take()
+        if wait:
+            llm_admission_rejected.inc(reason="rate_limit")
+            raise AdmissionRejected(wait, "rate_limit")
+
+
+class PriorityLimiter:
+    """
+    동시 실행 슬롯 max_concurrency개. 슬롯이 반납되면 대기 중인 요청 중
+    우선순위가 가장 높은(값이 작은) 요청, 같으면 먼저 온 요청에게 넘긴다
+    """
+
+    def __init__(self, max_concurrency: int, queue_timeout: float = 5.0):
+        self.max_concurrency = max_concurrency
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        self._waiters = []  # (priority, 순번, future)
+        self._sequence = itertools.count()
+        self._service_time = 1.0  # 슬롯 점유 시간 이동 평균 (Retry-After 추정용)
+
+    def queued(self) -> Dict[int, int]:
+        counts = {priority: 0 for priority in PRIORITY_NAMES}
+        for priority, _, future in self._waiters:
+            if not future.done():
+                counts[priority] = counts.get(priority, 0) + 1
+        return counts
+
+    def _estimate_wait(self, priority: int) -> float:
+        ahead = sum(1 for p, _, future in self._waiters if p <= priority and not future.done())
+        return self._service_time * (ahead + 1) / self.max_concurrency
+
+    async def _acquire(self, priority: int, timeout: float):
+        if self.in_flight < self.max_concurrency:
+            self.in_flight += 1
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), future))
+        try:
+            await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError:
+            if future.done() and not future.cancelled():
+                return  # 시간 초과와 동시에 슬롯을 넘겨받음
+            future.cancel()
+            llm_admission_rejected.inc(reason="queue_timeout")
+            raise AdmissionRejected(self._estimate_wait(priority), "queue_timeout")
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self._release()
+            else:
+                future.cancel()
+            raise
+
+    def try_acquire(self) -> bool:
+        """기다리지 않고 남는 슬롯이 있을 때만 점유 (hedge용, 실패해도 거절 메트릭에 집계하지 않음)"""
+        if self.in_flight < self.max_concurrency:
+            self.in_flight += 1
+            return True
+        return False
+
+    async def reserve(
+        self,
+        priority: Optional[int] = None,
+        timeout: Optional[float] = None,
+        ttl: float = 10.0,
+    ) -> "SlotReservation":
+        """
+        응답을 시작하기 전에 슬롯을 미리 받아 둠 (SSE 응답 전에 429를 돌려주기 위해)
+        slot(reservation=...)이 넘겨받으며, ttl 초 안에 쓰지 않으면 자동으로 반납
+        """
+        priority = current_llm_priority() if priority is None else priority
+        await self._acquire(priority, self.queue_timeout if timeout is None else timeout)
+        return SlotReservation(self, ttl)
+
+    def _release(self):
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(None)  # 슬롯을 그대로 넘김 (in_flight 유지)
+                return
+        self.in_flight -= 1
+
+    @asynccontextmanager
+    async def slot(
+        self,
+        priority: Optional[int] = None,
+        timeout: Optional[float] = None,
+        hedge: bool = False,
+        reservation: Optional["SlotReservation"] = None,
+    ):
+        """
+        hedge=True면 남는 슬롯이 없을 때 기다리지 않고 바로 AdmissionRejected
+        reservation이 아직 유효하면 새로 기다리지 않고 그 슬롯을 사용
+        """
+        if hedge:
+            if not self.try_acquire():
+                raise AdmissionRejected(0, "no_free_slot")
+        elif reservation is None or not reservation.take():
+            priority = current_llm_priority() if priority is None else priority
+            await self._acquire(priority, self.queue_timeout if timeout is None else timeout)
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self._service_time = 0.9 * self._service_time + 0.1 * (time.monotonic() - started)
+            self._release()
+
+
+class SlotReservation:
+    """PriorityLimiter.reserve로 미리 받은 슬롯 (take 또는 release 중 한 번만 유효)"""
+
+    def __init__(self, limiter: PriorityLimiter, ttl: float):
+        self._limiter = limiter
+        self._active = True
+        # 응답 본문이 시작되지 않고 끝나도(클라이언트가 먼저 끊는 등) 슬롯이 새지 않도록
+        self._timer = asyncio.get_running_loop().call_later(ttl, self.release)
+
+    def take(self) -> bool:
+        """슬롯 소유권을 slot()으로 넘김. 이미 쓰였거나 반납됐으면 False"""
+        if not self._active:
+            return False
+        self._active = False
+        self._timer.cancel()
+        return True
+
+    def release(self):
+        if self.take():
+            self._limiter._release()
+
+
+@lru_cache()
+def get_rate_limiter() -> UserRateLimiter:
+    settings = get_settings()
+    return UserRateLimiter(settings.ADMISSION_USER_RATE, settings.ADMISSION_USER_BURST)
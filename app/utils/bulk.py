@@ -0,0 +1,75 @@
+"""
+대량 내보내기/가져오기용 NDJSON / CSV 스트림 변환
+
+요청/응답 본문을 청크 단위로 처리하므로 메모리 사용량이 데이터 크기와 무관합니다.
+CSV는 Postgres COPY ... (FORMAT csv) 규칙을 따릅니다: 따옴표 없는 빈 값은 NULL, ""는 빈 문자열.
+"""
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import AsyncIterator, List, Sequence, Tuple
+
+
+def json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Object of type {value.__class__.__name__} is not JSON serializable")
+
+
+def to_ndjson(row: dict) -> str:
+    return json.dumps(row, ensure_ascii=False, default=json_default) + "\n"
+
+
+def encode_csv_value(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float, Decimal)):
+        return str(value)
+    if isinstance(value, (dict, list)):
+        value = json.dumps(value, ensure_ascii=False)
+    elif isinstance(value, (datetime, date)):
+        value = value.isoformat()
+    return '"' + str(value).replace('"', '""') + '"'
+
+
+def encode_csv_row(values: Sequence) -> str:
+    return ",".join(encode_csv_value(value) for value in values) + "\n"
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """바이트 청크 스트림을 줄 단위 문자열로 (빈 줄은 건너뜀)"""
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield line.decode("utf-8")
+    if buffer.strip():
+        yield buffer.decode("utf-8")
+
+
+async def split_csv_header(chunks: AsyncIterator[bytes]) -> Tuple[List[str], AsyncIterator[bytes]]:
+    """
+    CSV 스트림의 첫 줄(컬럼 이름)을 읽고, (컬럼 목록, 나머지 본문 스트림)을 반환
+    본문은 파싱하지 않고 그대로 COPY에 넘긴다
+    """
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        if b"\n" in buffer:
+            break
+    header, _, rest = buffer.partition(b"\n")
+    columns = [name.strip().strip('"') for name in header.decode("utf-8-sig").rstrip("\r").split(",")]
+
+    async def body() -> AsyncIterator[bytes]:
+        if rest:
+            yield rest
+        async for chunk in chunks:
+            yield chunk
+
+    return [c for c in columns if c], body()
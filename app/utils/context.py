@@ -0,0 +1,151 @@
+from typing import Dict, List, Optional, Sequence
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.database.crud import chat as crud_chat
+from app.utils.llm import get_llm_gateway
+
+try:
+    import tiktoken
+    _encoding = tiktoken.get_encoding("o200k_base")
+except ImportError:  # tiktoken이 없으면 근사치 사용
+    _encoding = None
+
+# 메시지 하나당 role/구분자 등으로 추가되는 토큰 수
+MESSAGE_OVERHEAD_TOKENS = 4
+
+SUMMARY_PROMPT = """
+당신은 법률 상담 대화를 요약하는 도우미입니다.
+기존 요약에 새로 추가된 대화 내용을 반영하여 갱신된 요약만 출력하세요.
+당사자, 날짜, 금액, 주소, 계약 조건 등 문서 작성에 필요한 사실은 빠짐없이 남기세요.
+"""
+
+REFERENCE_HEADER = """
+다음은 같은 유형의 기존 문서에서 발췌한 참고 문단입니다.
+문서 구성과 표현 방식만 참고하고, 당사자 이름, 금액, 주소, 날짜 등 사실관계는 절대 옮겨 쓰지 마세요.
+
+"""
+
+
+def count_tokens(text: str) -> int:
+    if _encoding is not None:
+        return len(_encoding.encode(text))
+    # 한글은 대략 1~2 bytes/token, 영문은 약 4 bytes/token → 3 bytes/token으로 근사
+    return len(text.encode("utf-8")) // 3 + 1
+
+
+def message_tokens(message: Dict) -> int:
+    return count_tokens(message["content"]) + MESSAGE_OVERHEAD_TOKENS
+
+
+def reference_message(passages: Sequence[str], budget: int) -> Optional[Dict]:
+    """
+    관련도 순 참고 발췌를 budget 토큰 안에 들어가는 만큼 system 메시지 하나로 묶음
+    (예산을 넘는 발췌는 건너뛰고 다음 발췌를 시도). 넣을 발췌가 없으면 None
+    """
+    used = count_tokens(REFERENCE_HEADER) + MESSAGE_OVERHEAD_TOKENS
+    selected = []
+    for passage in passages:
+        tokens = count_tokens(passage) + 2  # 구분자
+        if used + tokens > budget:
+            continue
+        selected.append(passage)
+        used += tokens
+    if not selected:
+        return None
+    return {"role": "system", "content": REFERENCE_HEADER + "\n\n---\n".join(selected)}
+
+
+class ContextBuilder:
+    """
+    토큰 예산 안에서 LLM에 보낼 메시지 배열을 구성
+
+    최근 대화는 원문 그대로 유지하고, 예산 밖으로 밀려난 이전 대화는
+    chat_sessions.context_data의 요약에 점진적으로 합쳐서 system 메시지 하나로 전달합니다.
+    context_data = {"summary": str, "summarized_until": 요약에 반영된 마지막 message id}
+    """
+
+    def __init__(self, budget: int, summary_max_tokens: int, summary_model: str):
+        self.budget = budget
+        self.summary_max_tokens = summary_max_tokens
+        self.summary_model = summary_model
+
+    async def build(
+        self,
+        db: AsyncSession,
+        session_id,
+        system_messages: List[Dict],
+        history: List[Dict],
+        pending: Sequence[Dict] = (),
+    ) -> List[Dict]:
+        fixed_tokens = sum(message_tokens(m) for m in system_messages)
+        fixed_tokens += sum(message_tokens(m) for m in pending)
+
+        # 전체 대화가 예산 안에 들어오면 요약이 필요 없음
+        history_tokens = [message_tokens(m) for m in history]
+        if fixed_tokens + sum(history_tokens) <= self.budget:
+            return self._assemble(system_messages, None, history, pending)
+
+        # 요약 자리를 남기고 가장 최근 대화부터 예산만큼 유지
+        available = self.budget - fixed_tokens - self.summary_max_tokens
+        keep_from = len(history)
+        while keep_from > 0 and history_tokens[keep_from - 1] <= available:
+            available -= history_tokens[keep_from - 1]
+            keep_from -= 1
+
+        context = await crud_chat.get_session_context(db, session_id) or {}
+        summary = context.get("summary")
+        summarized_until = context.get("summarized_until") or 0
+
+        # 아직 요약에 반영되지 않은 밀려난 대화만 기존 요약에 합친다
+        evicted = [m for m in history[:keep_from] if m["id"] > summarized_until]
+        if evicted:
+            # 요약 LLM 호출 동안 커넥션을 잡고 있지 않도록 읽기 트랜잭션을 먼저 끝냄
+            await db.commit()
+            summary = await self._summarize(summary, evicted)
+            summarized_until = evicted[-1]["id"]
+            await crud_chat.update_session_context(
+                db,
+                session_id,
+                {**context, "summary": summary, "summarized_until": summarized_until},
+            )
+
+        recent = [m for m in history[keep_from:] if m["id"] > summarized_until]
+        return self._assemble(system_messages, summary, recent, pending)
+
+    async def _summarize(self, summary: Optional[str], evicted: List[Dict]) -> str:
+        transcript = "\n".join(f"{m['role']}: {m['content']}" for m in evicted)
+        return await get_llm_gateway().chat_completion(
+            [
+                {"role": "system", "content": SUMMARY_PROMPT},
+                {"role": "user", "content": f"기존 요약:\n{summary or '(없음)'}\n\n새 대화:\n{transcript}"},
+            ],
+            model=self.summary_model,
+            max_tokens=self.summary_max_tokens,
+            temperature=0,
+        )
+
+    @staticmethod
+    def _assemble(
+        system_messages: List[Dict],
+        summary: Optional[str],
+        history: List[Dict],
+        pending: Sequence[Dict],
+    ) -> List[Dict]:
+        messages = list(system_messages)
+        if summary:
+            messages.append({"role": "system", "content": f"이전 대화 요약:\n{summary}"})
+        for message in history:
+            messages.append({"role": message["role"], "content": message["content"]})
+        messages.extend({"role": m["role"], "content": m["content"]} for m in pending)
+        return messages
+
+
+settings = get_settings()
+
+context_builder = ContextBuilder(
+    budget=settings.CONTEXT_TOKEN_BUDGET,
+    summary_max_tokens=settings.CONTEXT_SUMMARY_MAX_TOKENS,
+    summary_model=settings.CONTEXT_SUMMARY_MODEL,
+)
@@ -0,0 +1,64 @@
+"""
+초안 revision 간 delta 인코딩
+
+delta는 JSON으로 저장 가능한 op 목록입니다.
+    양의 정수 n  → 이전 텍스트에서 n글자 복사
+    음의 정수 -n → 이전 텍스트에서 n글자 건너뜀 (삭제)
+    문자열 s     → s 삽입
+"""
+from typing import List, Optional, Union
+
+from app.utils.diff import MAX_DIFF_COST, diff_opcodes, tokenize
+
+DeltaOp = Union[int, str]
+
+
+def _push(delta: List[DeltaOp], op: DeltaOp):
+    # 같은 종류의 op가 이어지면 하나로 합침
+    if delta:
+        last = delta[-1]
+        if isinstance(op, str) and isinstance(last, str):
+            delta[-1] = last + op
+            return
+        if isinstance(op, int) and isinstance(last, int) and (op > 0) == (last > 0):
+            delta[-1] = last + op
+            return
+    delta.append(op)
+
+
+def make_delta(old_text: str, new_text: str, max_cost: Optional[int] = MAX_DIFF_COST) -> List[DeltaOp]:
+    """diff 탐색량이 max_cost를 넘으면 DiffCostExceeded (delta가 작을 가능성이 낮음)"""
+    old_tokens = tokenize(old_text)
+    new_tokens = tokenize(new_text)
+    delta: List[DeltaOp] = []
+    for tag, i1, i2, j1, j2 in diff_opcodes(old_tokens, new_tokens, max_cost=max_cost, strict=True):
+        old_len = sum(len(token) for token in old_tokens[i1:i2])
+        if tag == "equal":
+            _push(delta, old_len)
+            continue
+        if old_len:
+            _push(delta, -old_len)
+        if j2 > j1:
+            _push(delta, "".join(new_tokens[j1:j2]))
+    return delta
+
+
+def apply_delta(old_text: str, delta: List[DeltaOp]) -> str:
+    parts = []
+    position = 0
+    for op in delta:
+        if isinstance(op, str):
+            parts.append(op)
+        elif op > 0:
+            parts.append(old_text[position:position + op])
+            position += op
+        else:
+            position -= op
+    if position != len(old_text):
+        raise ValueError("delta does not match base text")
+    return "".join(parts)
+
+
+def delta_size(delta: List[DeltaOp]) -> int:
+    """저장 크기 근사치 (삽입 문자 수 + op 수)"""
+    return sum(len(op) if isinstance(op, str) else 1 for op in delta)
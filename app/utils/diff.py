@@ -0,0 +1,249 @@
+"""
+단어/HTML 토큰 단위 diff
+
+- 텍스트를 HTML 태그, 엔티티, 단어, 공백, 기호 단위 토큰으로 분리
+- 양쪽에서 한 번씩만 등장하는 토큰을 기준점으로 삼는 patience 휴리스틱으로 구간을 나누고,
+  기준점이 없는 구간은 선형 공간 Myers 알고리즘(middle snake)으로 비교
+- Myers 탐색량이 max_cost를 넘으면 남은 구간은 통째로 replace로 처리 (전면 수정 시 O(ND) 폭주 방지)
+- 변경 위치는 기존 get_text_changes와 같이 이전 텍스트의 문자 위치로 반환
+"""
+import re
+from typing import Dict, List, Optional, Sequence, Tuple
+
+TOKEN_PATTERN = re.compile(r"<[^>]*>|&#?\w+;|\s+|\w+|[^\w\s]", re.UNICODE)
+
+Opcode = Tuple[str, int, int, int, int]
+
+# diff 한 번에 허용하는 Myers 대각선 탐색 횟수 (대략 수십~수백 ms)
+MAX_DIFF_COST = 200_000
+
+
+class DiffCostExceeded(Exception):
+    """Myers 탐색량이 max_cost를 넘음"""
+
+
+class _Budget:
+    def __init__(self, remaining: Optional[int]):
+        self.remaining = remaining
+
+    def spend(self, cost: int):
+        if self.remaining is None:
+            return
+        self.remaining -= cost
+        if self.remaining < 0:
+            raise DiffCostExceeded()
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(text)
+
+
+def _middle_snake(a: Sequence[int], alo: int, ahi: int, b: Sequence[int], blo: int, bhi: int, budget: _Budget) -> Tuple[int, int, int, int]:
+    """
+    Myers 선형 공간 알고리즘의 middle snake를 찾아 (x, y, u, v) 절대 좌표로 반환
+    a[x:u]와 b[y:v]가 최단 편집 경로 중간의 일치 구간 (budget을 다 쓰면 DiffCostExceeded)
+    """
+    n = ahi - alo
+    m = bhi - blo
+    delta = n - m
+    odd = delta & 1
+    offset = n + m + 1
+    forward = [0] * (2 * offset + 1)
+    backward = [0] * (2 * offset + 1)
+
+    for d in range((n + m + 1) // 2 + 1):
+        budget.spend(2 * (d + 1))
+        # 정방향 탐색
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and forward[offset + k - 1] < forward[offset + k + 1]):
+                x = forward[offset + k + 1]
+            else:
+                x = forward[offset + k - 1] + 1
+            y = x - k
+            x0, y0 = x, y
+            while x < n and y < m and a[alo + x] == b[blo + y]:
+                x += 1
+                y += 1
+            forward[offset + k] = x
+            # 역방향 대각선 delta - k가 직전 단계에서 도달한 범위 안이면 겹침 확인
+            if odd and -(d - 1) <= delta - k <= d - 1:
+                if x + backward[offset + delta - k] >= n:
+                    return alo + x0, blo + y0, alo + x, blo + y
+
+        # 역방향 탐색 (끝에서부터 소비한 길이로 기록)
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and backward[offset + k - 1] < backward[offset + k + 1]):
+                x = backward[offset + k + 1]
+            else:
+                x = backward[offset + k - 1] + 1
+            y = x - k
+            x0, y0 = x, y
+            while x < n and y < m and a[ahi - 1 - x] == b[bhi - 1 - y]:
+                x += 1
+                y += 1
+            backward[offset + k] = x
+            if not odd and -d <= delta - k <= d:
+                if x + forward[offset + delta - k] >= n:
+                    return ahi - x, bhi - y, ahi - x0, bhi - y0
+
+    raise AssertionError("middle snake not found")
+
+
+def _myers(a: Sequence[int], alo: int, ahi: int, b: Sequence[int], blo: int, bhi: int, matches: List[Tuple[int, int]], budget: _Budget):
+    # 공통 접두/접미 제거
+    while alo < ahi and blo < bhi and a[alo] == b[blo]:
+        matches.append((alo, blo))
+        alo += 1
+        blo += 1
+    suffix = []
+    while alo < ahi and blo < bhi and a[ahi - 1] == b[bhi - 1]:
+        ahi -= 1
+        bhi -= 1
+        suffix.append((ahi, bhi))
+
+    if alo < ahi and blo < bhi:
+        x, y, u, v = _middle_snake(a, alo, ahi, b, blo, bhi, budget)
+        _myers(a, alo, x, b, blo, y, matches, budget)
+        matches.extend((x + i, y + i) for i in range(u - x))
+        _myers(a, u, ahi, b, v, bhi, matches, budget)
+
+    matches.extend(reversed(suffix))
+
+
+def _unique_anchors(a: Sequence[int], alo: int, ahi: int, b: Sequence[int], blo: int, bhi: int) -> List[Tuple[int, int]]:
+    """양쪽 구간에서 한 번씩만 등장하는 토큰 쌍 중 순서가 보존되는 최장 부분열 (patience)"""
+    counts: Dict[int, List[int]] = {}
+    for i in range(alo, ahi):
+        entry = counts.setdefault(a[i], [0, 0, i, 0])
+        entry[0] += 1
+    for j in range(blo, bhi):
+        entry = counts.get(b[j])
+        if entry is not None:
+            entry[1] += 1
+            entry[3] = j
+    pairs = sorted((e[2], e[3]) for e in counts.values() if e[0] == 1 and e[1] == 1)
+    if not pairs:
+        return []
+
+    # j 기준 최장 증가 부분열 (patience sorting)
+    tails: List[int] = []
+    tail_index: List[int] = []
+    previous = [-1] * len(pairs)
+    for idx, (_, j) in enumerate(pairs):
+        lo, hi = 0, len(tails)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if tails[mid] < j:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo > 0:
+            previous[idx] = tail_index[lo - 1]
+        if lo == len(tails):
+            tails.append(j)
+            tail_index.append(idx)
+        else:
+            tails[lo] = j
+            tail_index[lo] = idx
+
+    anchors = []
+    idx = tail_index[-1]
+    while idx != -1:
+        anchors.append(pairs[idx])
+        idx = previous[idx]
+    anchors.reverse()
+    return anchors
+
+
+def _patience(a: Sequence[int], alo: int, ahi: int, b: Sequence[int], blo: int, bhi: int, matches: List[Tuple[int, int]], budget: _Budget, strict: bool):
+    while alo < ahi and blo < bhi and a[alo] == b[blo]:
+        matches.append((alo, blo))
+        alo += 1
+        blo += 1
+    suffix = []
+    while alo < ahi and blo < bhi and a[ahi - 1] == b[bhi - 1]:
+        ahi -= 1
+        bhi -= 1
+        suffix.append((ahi, bhi))
+
+    if alo < ahi and blo < bhi:
+        anchors = _unique_anchors(a, alo, ahi, b, blo, bhi)
+        if anchors:
+            i, j = alo, blo
+            for ai, bj in anchors:
+                _patience(a, i, ai, b, j, bj, matches, budget, strict)
+                matches.append((ai, bj))
+                i, j = ai + 1, bj + 1
+            _patience(a, i, ahi, b, j, bhi, matches, budget, strict)
+        else:
+            region: List[Tuple[int, int]] = []
+            try:
+                _myers(a, alo, ahi, b, blo, bhi, region, budget)
+            except DiffCostExceeded:
+                if strict:
+                    raise
+                region = []  # 구간 전체를 하나의 replace로
+            matches.extend(region)
+
+    matches.extend(reversed(suffix))
+
+
+def diff_opcodes(a: Sequence[str], b: Sequence[str], max_cost: Optional[int] = MAX_DIFF_COST, strict: bool = False) -> List[Opcode]:
+    """
+    두 토큰 목록의 차이를 difflib.SequenceMatcher.get_opcodes()와 같은 형식으로 반환
+    (tag, i1, i2, j1, j2), tag는 'equal', 'replace', 'delete', 'insert'
+    max_cost를 넘으면 남은 구간은 replace로 처리, strict이면 DiffCostExceeded (None이면 제한 없음)
+    """
+    # 비교 비용을 줄이기 위해 토큰을 정수 id로 치환
+    ids: Dict[str, int] = {}
+    a_ids = [ids.setdefault(token, len(ids)) for token in a]
+    b_ids = [ids.setdefault(token, len(ids)) for token in b]
+
+    matches: List[Tuple[int, int]] = []
+    _patience(a_ids, 0, len(a_ids), b_ids, 0, len(b_ids), matches, _Budget(max_cost), strict)
+    matches.append((len(a_ids), len(b_ids)))  # 종료 표시
+
+    opcodes: List[Opcode] = []
+    i = j = 0
+    for mi, mj in matches:
+        if i < mi and j < mj:
+            opcodes.append(("replace", i, mi, j, mj))
+        elif i < mi:
+            opcodes.append(("delete", i, mi, j, j))
+        elif j < mj:
+            opcodes.append(("insert", i, i, j, mj))
+        if mi < len(a_ids):
+            if opcodes and opcodes[-1][0] == "equal" and opcodes[-1][2] == mi:
+                tag, i1, _, j1, _ = opcodes[-1]
+                opcodes[-1] = (tag, i1, mi + 1, j1, mj + 1)
+            else:
+                opcodes.append(("equal", mi, mi + 1, mj, mj + 1))
+        i, j = mi + 1, mj + 1
+    return opcodes
+
+
+def get_text_changes(old_text: str, new_text: str) -> dict:
+    """텍스트 간의 차이점을 토큰 단위로 찾아 반환"""
+    old_tokens = tokenize(old_text)
+    new_tokens = tokenize(new_text)
+
+    # 토큰 인덱스 → 문자 위치
+    old_offsets = [0]
+    for token in old_tokens:
+        old_offsets.append(old_offsets[-1] + len(token))
+    new_offsets = [0]
+    for token in new_tokens:
+        new_offsets.append(new_offsets[-1] + len(token))
+
+    changes = []
+    for tag, i1, i2, j1, j2 in diff_opcodes(old_tokens, new_tokens):
+        if tag != 'equal':  # 변경된 부분만 추출
+            start, end = old_offsets[i1], old_offsets[i2]
+            changes.append({
+                'type': tag,  # 'replace', 'delete', 'insert' 중 하나
+                'oldText': old_text[start:end],
+                'newText': new_text[new_offsets[j1]:new_offsets[j2]],
+                'position': {'start': start, 'end': end}
+            })
+
+    return {'changes': changes}
@@ -0,0 +1,279 @@
+"""
+백그라운드 작업 큐
+
+POST 요청은 작업을 저장하고 job id를 바로 반환하며, 워커 풀이 작업을 꺼내 실행합니다.
+작업 상태는 Postgres(jobs 테이블) 또는 테스트용 메모리 저장소에 보관합니다.
+Postgres 저장소에서는 실행 중인 작업이 heartbeat를 갱신하고, heartbeat가 끊긴 작업은
+다음 기동 시(또는 주기적 점검 시) 다시 pending으로 돌아가므로 워커 재시작 후에도 이어서 실행됩니다.
+"""
+import asyncio
+import logging
+import time
+import uuid
+from collections import deque
+from datetime import datetime
+from functools import lru_cache
+from typing import Awaitable, Callable, Dict, Optional
+
+from fastapi import HTTPException
+
+from app.core.config import get_settings
+from app.database import AsyncSessionLocal
+from app.database.crud import jobs as crud_jobs
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[[Dict], Awaitable[Dict]]
+
+FINISHED_STATUSES = ("succeeded", "failed")
+
+
+class MemoryJobStore:
+    """프로세스 메모리 저장소 (테스트/단일 프로세스용, 재시작 시 유실)"""
+
+    def __init__(self):
+        self._jobs: Dict[str, Dict] = {}
+        self._pending: deque = deque()
+
+    async def create(self, job_id: str, kind: str, payload: Dict) -> Dict:
+        job = {
+            "id": job_id, "kind": kind, "status": "pending", "payload": payload,
+            "result": None, "error": None, "attempts": 0, "created_at": datetime.now(),
+            "started_at": None, "heartbeat_at": None, "finished_at": None,
+        }
+        self._jobs[job_id] = job
+        self._pending.append(job_id)
+        return dict(job)
+
+    async def get(self, job_id: str) -> Optional[Dict]:
+        job = self._jobs.get(job_id)
+        return dict(job) if job else None
+
+    async def claim(self) -> Optional[Dict]:
+        while self._pending:
+            job = self._jobs.get(self._pending.popleft())
+            if job and job["status"] == "pending":
+                job.update(status="running", started_at=datetime.now(), heartbeat_at=datetime.now())
+                job["attempts"] += 1
+                return dict(job)
+        return None
+
+    async def heartbeat(self, job_id: str):
+        self._jobs[job_id]["heartbeat_at"] = datetime.now()
+
+    async def finish(self, job_id: str, status: str, result: Optional[Dict] = None, error: Optional[str] = None):
+        self._jobs[job_id].update(status=status, result=result, error=error, finished_at=datetime.now())
+
+    async def requeue(self, job_id: str):
+        job = self._jobs.get(job_id)
+        if job and job["status"] == "running":
+            job.update(status="pending", started_at=None, heartbeat_at=None)
+            self._pending.appendleft(job_id)
+
+    async def requeue_stale(self, stale_seconds: int, max_attempts: int) -> int:
+        return 0
+
+    async def stats(self) -> Dict:
+        pending = [j for j in self._jobs.values() if j["status"] == "pending"]
+        oldest = min((j["created_at"] for j in pending), default=None)
+        return {
+            "pending": len(pending),
+            "running": sum(1 for j in self._jobs.values() if j["status"] == "running"),
+            "oldest_pending_seconds": (datetime.now() - oldest).total_seconds() if oldest else None,
+        }
+
+
+class PostgresJobStore:
+    """jobs 테이블 저장소 (여러 워커 프로세스가 FOR UPDATE SKIP LOCKED로 나눠 가져감)"""
+
+    async def create(self, job_id: str, kind: str, payload: Dict) -> Dict:
+        async with AsyncSessionLocal() as db:
+            return await crud_jobs.create_job(db, job_id, kind, payload)
+
+    async def get(self, job_id: str) -> Optional[Dict]:
+        async with AsyncSessionLocal() as db:
+            return await crud_jobs.get_job(db, job_id)
+
+    async def claim(self) -> Optional[Dict]:
+        async with AsyncSessionLocal() as db:
+            return await crud_jobs.claim_job(db)
+
+    async def heartbeat(self, job_id: str):
+        async with AsyncSessionLocal() as db:
+            await crud_jobs.heartbeat_job(db, job_id)
+
+    async def finish(self, job_id: str, status: str, result: Optional[Dict] = None, error: Optional[str] = None):
+        async with AsyncSessionLocal() as db:
+            await crud_jobs.finish_job(db, job_id, status, result, error)
+
+    async def requeue(self, job_id: str):
+        async with AsyncSessionLocal() as db:
+            await crud_jobs.requeue_job(db, job_id)
+
+    async def requeue_stale(self, stale_seconds: int, max_attempts: int) -> int:
+        async with AsyncSessionLocal() as db:
+            return await crud_jobs.requeue_stale_jobs(db, stale_seconds, max_attempts)
+
+    async def stats(self) -> Dict:
+        async with AsyncSessionLocal() as db:
+            return await crud_jobs.get_job_stats(db)
+
+
+class JobQueue:
+    def __init__(
+        self,
+        store,
+        workers: int = 4,
+        poll_interval: float = 1.0,
+        heartbeat_interval: Optional[float] = None,
+        stale_seconds: int = 60,
+        max_attempts: int = 3,
+    ):
+        self.store = store
+        self.workers = workers
+        self.poll_interval = poll_interval
+        # heartbeat가 한두 번 늦어도 stale로 판정되지 않도록 기본값은 stale_seconds의 1/3
+        if heartbeat_interval is None:
+            heartbeat_interval = stale_seconds / 3
+        if heartbeat_interval >= stale_seconds:
+            raise ValueError("heartbeat_interval must be shorter than stale_seconds")
+        self.heartbeat_interval = heartbeat_interval
+        self.stale_seconds = stale_seconds
+        self.max_attempts = max_attempts
+        self._handlers: Dict[str, JobHandler] = {}
+        self._tasks = []
+        self._running: Dict[str, asyncio.Task] = {}
+        self._wakeup = asyncio.Event()
+        self._finished: Dict[str, asyncio.Event] = {}
+        self._wait_times: deque = deque(maxlen=1000)  # 최근 작업의 대기 시간 (초)
+
+    def register(self, kind: str, handler: JobHandler):
+        self._handlers[kind] = handler
+
+    async def submit(self, kind: str, payload: Dict) -> Dict:
+        if kind not in self._handlers:
+            raise ValueError(f"Unknown job kind: {kind}")
+        job = await self.store.create(str(uuid.uuid4()), kind, payload)
+        self._wakeup.set()
+        return job
+
+    async def get(self, job_id: str) -> Optional[Dict]:
+        return await self.store.get(job_id)
+
+    async def wait(self, job_id: str, timeout: float) -> Optional[Dict]:
+        """작업이 끝나거나 timeout이 지날 때까지 기다렸다가 현재 상태를 반환"""
+        deadline = time.monotonic() + timeout
+        while True:
+            job = await self.store.get(job_id)
+            remaining = deadline - time.monotonic()
+            if job is None or job["status"] in FINISHED_STATUSES or remaining <= 0:
+                self._finished.pop(job_id, None)
+                return job
+            # 같은 프로세스에서 실행 중이면 완료 이벤트를, 아니면 poll_interval마다 확인
+            event = self._finished.setdefault(job_id, asyncio.Event())
+            try:
+                await asyncio.wait_for(event.wait(), min(self.poll_interval, remaining))
+            except asyncio.TimeoutError:
+                pass
+
+    async def stats(self) -> Dict:
+        stats = await self.store.stats()
+        wait_times = sorted(self._wait_times)
+        stats.update({
+            "workers": self.workers,
+            "busy_workers": len(self._running),
+            "recent_wait_seconds_avg": sum(wait_times) / len(wait_times) if wait_times else None,
+            "recent_wait_seconds_p95": wait_times[min(len(wait_times) - 1, int(len(wait_times) * 0.95))] if wait_times else None,
+        })
+        return stats
+
+    async def start(self):
+        # 저장소(DB)에 접속할 수 없어도 기동은 계속하고, 워커와 reaper가 백그라운드에서 재시도
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._reaper()))
+
+    async def stop(self):
+        running = list(self._running)
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        # 실행 중이던 작업은 다른 워커가 이어받도록 되돌림
+        for job_id in running:
+            await self.store.requeue(job_id)
+
+    async def _reaper(self):
+        # 기동 직후 한 번: 이전 프로세스가 실행하다 중단된 작업을 다시 pending으로
+        # 실패하면 poll_interval 뒤 다시 시도하고, 성공한 뒤에는 stale_seconds마다 정리
+        started = False
+        while True:
+            try:
+                if await self.store.requeue_stale(self.stale_seconds, self.max_attempts):
+                    self._wakeup.set()
+                started = True
+            except Exception:
+                logger.exception("stale 작업 정리 실패")
+            await asyncio.sleep(self.stale_seconds if started else self.poll_interval)
+
+    async def _worker(self):
+        while True:
+            try:
+                job = await self.store.claim()
+            except Exception:
+                logger.exception("작업 가져오기 실패")
+                job = None
+
+            if job is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            self._wait_times.append((job["started_at"] - job["created_at"]).total_seconds())
+            self._running[job["id"]] = asyncio.current_task()
+            try:
+                await self._run(job)
+            finally:
+                self._running.pop(job["id"], None)
+                event = self._finished.pop(job["id"], None)
+                if event:
+                    event.set()
+
+    async def _run(self, job: Dict):
+        heartbeat = asyncio.create_task(self._heartbeat(job["id"]))
+        try:
+            result = await self._handlers[job["kind"]](job["payload"])
+        except asyncio.CancelledError:
+            raise
+        except HTTPException as exc:
+            await self.store.finish(job["id"], "failed", error=str(exc.detail))
+        except Exception as exc:
+            logger.exception("작업 실패: %s", job["id"])
+            await self.store.finish(job["id"], "failed", error=str(exc) or exc.__class__.__name__)
+        else:
+            await self.store.finish(job["id"], "succeeded", result=result)
+        finally:
+            heartbeat.cancel()
+
+    async def _heartbeat(self, job_id: str):
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            try:
+                await self.store.heartbeat(job_id)
+            except Exception:
+                logger.exception("heartbeat 실패: %s", job_id)
+
+
+@lru_cache()
+def get_job_queue() -> JobQueue:
+    settings = get_settings()
+    store = PostgresJobStore() if settings.JOB_BACKEND == "postgres" else MemoryJobStore()
+    return JobQueue(
+        store,
+        workers=settings.JOB_WORKERS,
+        poll_interval=settings.JOB_POLL_INTERVAL,
+        stale_seconds=settings.JOB_STALE_SECONDS,
+        max_attempts=settings.JOB_MAX_ATTEMPTS,
+    )
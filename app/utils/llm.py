@@ -0,0 +1,259 @@
+import asyncio
+import time
+from functools import lru_cache
+from typing import AsyncIterator, Dict, List, Optional
+
+import httpx
+from openai import APIConnectionError, APIStatusError, AsyncOpenAI
+
+from app.core.config import get_settings
+from app.utils.admission import PRIORITY_NAMES, PriorityLimiter, SlotReservation
+from app.utils.llm_cache import LLMResponseCache
+from app.utils.llm_policy import LLMCallPolicy
+from app.utils.metrics import Gauge, llm_request_duration, record_llm_usage, registry
+
+
+def is_retryable_error(exc: BaseException) -> bool:
+    """공급자 쪽 문제(연결 실패, 타임아웃, 429, 5xx)만 hedge/fallback/circuit breaker 대상"""
+    if isinstance(exc, APIStatusError):
+        return exc.status_code == 429 or exc.status_code >= 500
+    return isinstance(exc, APIConnectionError)
+
+
+class LLMGateway:
+    """
+    워커 프로세스 전체가 공유하는 비동기 LLM 호출 게이트웨이
+
+    - AsyncOpenAI 클라이언트와 keep-alive HTTP 커넥션 풀을 재사용
+    - PriorityLimiter로 프로세스당 동시 호출 수를 제한 (슬롯이 없으면 요청 우선순위 순서로 대기)
+    - 호출마다 타임아웃 적용
+    - cache=True인 호출은 응답 캐시를 먼저 조회 (use_cache=False면 조회 없이 새로 생성 후 저장)
+    - 호출마다 LLMCallPolicy(deadline, hedge, fallback 모델, circuit breaker) 적용
+      (스트리밍은 첫 토큰 전까지만 fallback, hedge 없음)
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        base_url: Optional[str] = None,
+        model: str = "gpt-4o-mini",
+        max_concurrency: int = 64,
+        max_connections: int = 100,
+        timeout: float = 60.0,
+        max_retries: int = 2,
+        response_cache: Optional[LLMResponseCache] = None,
+        policy: Optional[LLMCallPolicy] = None,
+        limiter: Optional[PriorityLimiter] = None,
+    ):
+        self.model = model
+        self.response_cache = response_cache
+        self.policy = policy or LLMCallPolicy(is_retryable=is_retryable_error)
+        self.timeout = timeout
+        self._http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+            timeout=httpx.Timeout(timeout, connect=10.0),
+        )
+        self._client = AsyncOpenAI(
+            api_key=api_key,
+            base_url=base_url,
+            http_client=self._http_client,
+            max_retries=max_retries,
+        )
+        self.limiter = limiter or PriorityLimiter(max_concurrency)
+
+    def _cache_key(self, cache: bool, messages: List[Dict], model: str, params: Dict) -> Optional[str]:
+        if not cache or self.response_cache is None:
+            return None
+        return self.response_cache.make_key(model, messages, params)
+
+    async def chat_completion(
+        self,
+        messages: List[Dict],
+        model: Optional[str] = None,
+        cache: bool = False,
+        use_cache: bool = True,
+        deadline: Optional[float] = None,
+        **params
+    ) -> str:
+        model = model or self.model
+        cache_key = self._cache_key(cache, messages, model, params)
+        if cache_key and use_cache:
+            cached = await self.response_cache.get(cache_key)
+            if cached is not None:
+                llm_request_duration.observe(0.0, model=model, outcome="cache_hit")
+                return cached
+
+        async def attempt(candidate: str, hedge: bool):
+            return candidate, await self._completion_once(messages, candidate, params, hedge)
+
+        answered_by, content = await self.policy.run(model, attempt, deadline)
+
+        # fallback 모델의 응답은 요청한 모델의 캐시 key로 저장하지 않음
+        if cache_key and answered_by == model:
+            await self.response_cache.set(cache_key, content)
+        return content
+
+    async def _completion_once(self, messages: List[Dict], model: str, params: Dict, hedge: bool = False) -> str:
+        # hedge 요청은 남는 슬롯이 있을 때만 보냄
+        async with self.limiter.slot(hedge=hedge):
+            started = time.perf_counter()
+            try:
+                response = await self._client.chat.completions.create(
+                    model=model,
+                    messages=messages,
+                    timeout=self.timeout,
+                    **params
+                )
+            except asyncio.CancelledError:
+                llm_request_duration.observe(time.perf_counter() - started, model=model, outcome="cancelled")
+                raise
+            except Exception:
+                llm_request_duration.observe(time.perf_counter() - started, model=model, outcome="error")
+                raise
+        llm_request_duration.observe(time.perf_counter() - started, model=model, outcome="ok")
+        record_llm_usage(model, response.usage)
+        return response.choices[0].message.content
+
+    async def stream_chat_completion(
+        self,
+        messages: List[Dict],
+        model: Optional[str] = None,
+        cache: bool = False,
+        use_cache: bool = True,
+        deadline: Optional[float] = None,
+        reservation: Optional[SlotReservation] = None,
+        **params
+    ) -> AsyncIterator[str]:
+        """
+        토큰이 도착하는 대로 텍스트 조각을 내보낸다. 스트림이 끝날 때까지 슬롯을 점유한다.
+        reservation(limiter.reserve)을 주면 첫 호출은 예약한 슬롯을 사용
+        """
+        try:
+            model = model or self.model
+            cache_key = self._cache_key(cache, messages, model, params)
+            if cache_key and use_cache:
+                cached = await self.response_cache.get(cache_key)
+                if cached is not None:
+                    llm_request_duration.observe(0.0, model=model, outcome="cache_hit")
+                    yield cached
+                    return
+
+            expires_at = time.monotonic() + (deadline or self.policy.deadline)
+            models = self.policy.candidates(model)
+            last_error: Optional[BaseException] = None
+            for candidate in models:
+                if not self.policy.breaker(candidate).allow():
+                    continue
+                remaining = expires_at - time.monotonic()
+                if remaining <= 0:
+                    break
+
+                # 첫 토큰이 deadline 안에 오지 않거나 그 전에 실패하면 다음 모델로
+                stream = self._stream_once(messages, candidate, params, reservation)
+                try:
+                    first = await asyncio.wait_for(stream.__anext__(), remaining)
+                except StopAsyncIteration:
+                    self.policy.record(candidate, ok=True)
+                    return
+                except Exception as exc:
+                    await stream.aclose()
+                    if not isinstance(exc, asyncio.TimeoutError) and not self.policy.is_retryable(exc):
+                        self.policy.record(candidate, ok=True)
+                        raise
+                    self.policy.record(candidate, ok=False)
+                    last_error = exc
+                    continue
+
+                self.policy.record(candidate, ok=True)
+                chunks = [first]
+                yield first
+                async for delta in stream:
+                    chunks.append(delta)
+                    yield delta
+
+                if cache_key and candidate == model:
+                    await self.response_cache.set(cache_key, "".join(chunks))
+                return
+
+            self.policy.raise_exhausted(models, last_error, expires_at)
+        finally:
+            if reservation is not None:
+                reservation.release()  # 캐시 적중 등으로 쓰지 않은 예약 반납
+
+    async def _stream_once(
+        self,
+        messages: List[Dict],
+        model: str,
+        params: Dict,
+        reservation: Optional[SlotReservation] = None,
+    ) -> AsyncIterator[str]:
+        async with self.limiter.slot(reservation=reservation):
+            started = time.perf_counter()
+            outcome = "error"
+            try:
+                stream = await self._client.chat.completions.create(
+                    model=model,
+                    messages=messages,
+                    timeout=self.timeout,
+                    stream=True,
+                    stream_options={"include_usage": True},  # 마지막 chunk에 토큰 사용량 포함
+                    **params
+                )
+                async for chunk in stream:
+                    record_llm_usage(model, getattr(chunk, "usage", None))
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        yield chunk.choices[0].delta.content
+                outcome = "ok"
+            finally:
+                llm_request_duration.observe(time.perf_counter() - started, model=model, outcome=outcome)
+
+    async def aclose(self):
+        await self._client.close()
+        if self.response_cache is not None:
+            self.response_cache.close()
+
+
+@lru_cache()
+def get_llm_gateway() -> LLMGateway:
+    settings = get_settings()
+    gateway = LLMGateway(
+        api_key=settings.OPENAI_API_KEY,
+        base_url=settings.OPENAI_BASE_URL,
+        model=settings.LLM_MODEL,
+        max_concurrency=settings.LLM_MAX_CONCURRENCY,
+        max_connections=settings.LLM_MAX_CONNECTIONS,
+        timeout=settings.LLM_TIMEOUT,
+        response_cache=LLMResponseCache(
+            settings.LLM_CACHE_PATH,
+            max_entries=settings.LLM_CACHE_MAX_ENTRIES,
+            ttl=settings.LLM_CACHE_TTL,
+        ) if settings.LLM_CACHE_ENABLED else None,
+        policy=LLMCallPolicy(
+            deadline=settings.LLM_DEADLINE,
+            hedge_percentile=settings.LLM_HEDGE_PERCENTILE,
+            hedge_min_delay=settings.LLM_HEDGE_MIN_DELAY,
+            hedge_budget=settings.LLM_HEDGE_BUDGET,
+            fallback_models=settings.LLM_FALLBACK_MODELS_LIST,
+            failure_threshold=settings.LLM_BREAKER_FAILURES,
+            cooldown=settings.LLM_BREAKER_COOLDOWN,
+            is_retryable=is_retryable_error,
+        ),
+        limiter=PriorityLimiter(settings.LLM_MAX_CONCURRENCY, settings.ADMISSION_QUEUE_TIMEOUT),
+    )
+
+    limiter = gateway.limiter
+    registry.register(Gauge(
+        "llm_admission_in_flight",
+        "LLM 슬롯을 점유 중인 호출 수",
+        collect=lambda: {(): limiter.in_flight},
+    ))
+    registry.register(Gauge(
+        "llm_admission_queued",
+        "LLM 슬롯을 기다리는 호출 수",
+        ("priority",),
+        collect=lambda: {(PRIORITY_NAMES[p],): n for p, n in limiter.queued().items()},
+    ))
+    return gateway
@@ -0,0 +1,218 @@
+"""
+LLM 호출 정책: deadline, hedged request, fallback 모델, circuit breaker
+
+- deadline: 호출 전체(재시도/fallback 포함)에 주어지는 시간. 넘기면 LLMDeadlineExceeded
+- hedge: 첫 요청이 최근 응답 시간의 hedge_percentile 백분위보다 오래 걸리면 같은 요청을 한 번 더 보내
+  먼저 끝난 응답을 사용하고 나머지는 취소. 부하가 늘지 않도록 전체 호출의 hedge_budget 비율까지만 보냄
+- fallback: 기본 모델이 실패하거나 circuit이 열려 있으면 fallback_models를 순서대로 시도
+- circuit breaker: 모델별로 연속 failure_threshold번 실패하면 cooldown 초 동안 호출하지 않고,
+  이후 한 건만 시험 삼아 보내 성공하면 다시 닫힘
+"""
+import asyncio
+import time
+from collections import deque
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence, TypeVar
+
+from app.utils.metrics import llm_breaker_state, llm_fallbacks, llm_hedges
+
+T = TypeVar("T")
+
+MIN_LATENCY_SAMPLES = 20
+
+
+class LLMDeadlineExceeded(Exception):
+    pass
+
+
+class LLMUnavailable(Exception):
+    """모든 후보 모델의 circuit이 열려 있음"""
+
+    def __init__(self, retry_after: float):
+        super().__init__("LLM provider unavailable")
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, failure_threshold: int = 5, cooldown: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probe_started: Optional[float] = None
+
+    def allow(self) -> bool:
+        now = time.monotonic()
+        if self.state == self.OPEN and now - self.opened_at >= self.cooldown:
+            self.state = self.HALF_OPEN
+        if self.state == self.CLOSED:
+            return True
+        # half-open에서는 한 건만 시험 (그 요청이 취소돼 결과가 안 오면 cooldown 후 다시 시험)
+        if self.state == self.HALF_OPEN and (self.probe_started is None or now - self.probe_started >= self.cooldown):
+            self.probe_started = now
+            return True
+        return False
+
+    def retry_after(self) -> float:
+        if self.state != self.OPEN:
+            return 0.0
+        return max(0.0, self.cooldown - (time.monotonic() - self.opened_at))
+
+    def record_success(self):
+        self.state = self.CLOSED
+        self.failures = 0
+        self.probe_started = None
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+        self.probe_started = None
+
+
+class LLMCallPolicy:
+    def __init__(
+        self,
+        deadline: float = 30.0,
+        hedge_percentile: float = 95.0,
+        hedge_min_delay: float = 1.0,
+        hedge_budget: float = 0.1,
+        fallback_models: Sequence[str] = (),
+        failure_threshold: int = 5,
+        cooldown: float = 30.0,
+        is_retryable: Callable[[BaseException], bool] = lambda exc: True,
+    ):
+        self.deadline = deadline
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_delay = hedge_min_delay
+        self.hedge_budget = hedge_budget
+        self.fallback_models = list(fallback_models)
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.is_retryable = is_retryable
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._latencies: Dict[str, deque] = {}
+        self._calls = 0
+        self._hedges = 0
+
+    def breaker(self, model: str) -> CircuitBreaker:
+        breaker = self._breakers.get(model)
+        if breaker is None:
+            breaker = self._breakers[model] = CircuitBreaker(self.failure_threshold, self.cooldown)
+        return breaker
+
+    def candidates(self, model: str) -> List[str]:
+        return [model] + [m for m in self.fallback_models if m != model]
+
+    def record(self, model: str, ok: bool, elapsed: Optional[float] = None):
+        breaker = self.breaker(model)
+        if ok:
+            breaker.record_success()
+            if elapsed is not None:
+                self._latencies.setdefault(model, deque(maxlen=500)).append(elapsed)
+        else:
+            breaker.record_failure()
+        llm_breaker_state.set(1 if breaker.state == CircuitBreaker.OPEN else 0, model=model)
+
+    def hedge_delay(self, model: str) -> Optional[float]:
+        """hedge를 보낼 시점 (샘플이 부족하거나 예산을 다 쓰면 None)"""
+        if not self.hedge_percentile or self._hedges >= self.hedge_budget * self._calls + 1:
+            return None
+        samples = self._latencies.get(model)
+        if not samples or len(samples) < MIN_LATENCY_SAMPLES:
+            return None
+        ordered = sorted(samples)
+        index = min(len(ordered) - 1, int(len(ordered) * self.hedge_percentile / 100))
+        return max(self.hedge_min_delay, ordered[index])
+
+    def retry_after(self, models: Sequence[str]) -> float:
+        return min(self.breaker(m).retry_after() for m in models)
+
+    async def run(
+        self,
+        model: str,
+        call: Callable[[str, bool], Awaitable[T]],
+        deadline: Optional[float] = None,
+    ) -> T:
+        """
+        call(model, hedge)를 정책에 따라 실행. 재시도할 수 없는 오류(잘못된 요청 등)는 그대로 전달
+        hedge=True인 호출은 여유 슬롯이 없으면 기다리지 말고 바로 실패해야 한다
+        """
+        self._calls += 1
+        expires_at = time.monotonic() + (deadline or self.deadline)
+        models = self.candidates(model)
+        last_error: Optional[BaseException] = None
+
+        for index, candidate in enumerate(models):
+            if not self.breaker(candidate).allow():
+                continue
+            remaining = expires_at - time.monotonic()
+            if remaining <= 0:
+                break
+            if index > 0:
+                llm_fallbacks.inc(model=model, fallback=candidate)
+            try:
+                return await self._hedged(candidate, call, remaining)
+            except asyncio.TimeoutError as exc:
+                self.record(candidate, ok=False)
+                last_error = exc
+            except Exception as exc:
+                if not self.is_retryable(exc):
+                    # 요청 자체의 문제이므로 공급자는 정상으로 본다
+                    self.record(candidate, ok=True)
+                    raise
+                self.record(candidate, ok=False)
+                last_error = exc
+
+        self.raise_exhausted(models, last_error, expires_at)
+
+    def raise_exhausted(self, models: Sequence[str], last_error: Optional[BaseException], expires_at: float):
+        """모든 후보를 쓰고도 응답을 못 받았을 때 원인에 맞는 예외를 던짐"""
+        if last_error is None and expires_at - time.monotonic() > 0:
+            raise LLMUnavailable(self.retry_after(models))
+        if last_error is None or isinstance(last_error, asyncio.TimeoutError) or expires_at - time.monotonic() <= 0:
+            raise LLMDeadlineExceeded() from last_error
+        raise last_error
+
+    async def _hedged(self, model: str, call: Callable[[str, bool], Awaitable[T]], timeout: float) -> T:
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        expires_at = started + timeout
+        primary = asyncio.ensure_future(call(model, False))
+        pending = {primary}
+        hedge_at = self.hedge_delay(model)
+        error: Optional[BaseException] = None
+
+        try:
+            while pending:
+                now = loop.time()
+                if now >= expires_at:
+                    raise asyncio.TimeoutError()
+                wait_until = expires_at if hedge_at is None else min(expires_at, started + hedge_at)
+                done, pending = await asyncio.wait(
+                    pending, timeout=wait_until - now, return_when=asyncio.FIRST_COMPLETED
+                )
+
+                winner = next((task for task in done if task.exception() is None), None)
+                if winner is not None:
+                    if winner is not primary:
+                        llm_hedges.inc(model=model, outcome="won")
+                    self.record(model, ok=True, elapsed=loop.time() - started)
+                    return winner.result()
+                # 실패한 요청이 있어도 아직 진행 중인 요청이 있으면 그 결과를 기다림
+                for task in done:
+                    error = task.exception()
+
+                # 첫 요청이 hedge 시점까지 끝나지 않았으면 같은 요청을 한 번 더
+                if not done and hedge_at is not None and loop.time() - started >= hedge_at:
+                    self._hedges += 1
+                    llm_hedges.inc(model=model, outcome="sent")
+                    pending.add(asyncio.ensure_future(call(model, True)))
+                    hedge_at = None
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
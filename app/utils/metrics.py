@@ -0,0 +1,264 @@
+"""
+Prometheus 텍스트 형식 메트릭
+
+외부 의존성 없이 카운터/게이지/히스토그램만 구현한 최소 레지스트리입니다.
+워커 프로세스마다 값이 따로 집계되므로 여러 워커를 띄우면 /metrics는 요청을 받은 워커의 값만 보여줍니다.
+"""
+import asyncio
+import functools
+import inspect
+import time
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    type_name = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in sorted(self._values.items())
+        ]
+
+
+class Gauge(_Metric):
+    """set()으로 값을 넣거나, collect 콜백이 scrape 시점에 {라벨값 튜플: 값}을 반환"""
+
+    type_name = "gauge"
+
+    def __init__(self, *args, collect: Optional[Callable[[], Dict[Tuple[str, ...], float]]] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._collect = collect
+
+    def set(self, value: float, **labels):
+        self._values[self._key(labels)] = value
+
+    def samples(self) -> List[str]:
+        values = dict(self._values)
+        if self._collect is not None:
+            values.update(self._collect())
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in sorted(values.items())
+        ]
+
+
+class Histogram(_Metric):
+    type_name = "histogram"
+
+    def __init__(self, *args, buckets: Tuple[float, ...] = DEFAULT_BUCKETS, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        # 라벨값 → [버킷별 개수(누적 아님), 합계, 개수]
+        self._values: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        entry = self._values.get(key)
+        if entry is None:
+            entry = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                entry[0][i] += 1
+                break
+        entry[1] += value
+        entry[2] += 1
+
+    def samples(self) -> List[str]:
+        lines = []
+        for key, (counts, total, count) in sorted(self._values.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        return "\n".join(metric.render() for metric in self._metrics.values()) + "\n"
+
+
+registry = Registry()
+
+http_request_duration = registry.register(Histogram(
+    "http_request_duration_seconds",
+    "HTTP 요청 처리 시간 (스트리밍 응답은 헤더 전송까지)",
+    ("method", "route", "status"),
+))
+db_query_duration = registry.register(Histogram(
+    "db_query_duration_seconds",
+    "CRUD 함수 실행 시간",
+    ("function",),
+))
+db_query_errors = registry.register(Counter(
+    "db_query_errors_total",
+    "예외로 끝난 CRUD 함수 호출 수",
+    ("function",),
+))
+llm_request_duration = registry.register(Histogram(
+    "llm_request_duration_seconds",
+    "LLM 호출 시간 (스트리밍은 마지막 토큰까지)",
+    ("model", "outcome"),
+))
+llm_tokens = registry.register(Counter(
+    "llm_tokens_total",
+    "LLM 토큰 사용량",
+    ("model", "type"),
+))
+llm_hedges = registry.register(Counter(
+    "llm_hedges_total",
+    "hedged LLM 요청 수 (sent: 보냄, won: hedge 응답이 먼저 도착)",
+    ("model", "outcome"),
+))
+llm_fallbacks = registry.register(Counter(
+    "llm_fallbacks_total",
+    "fallback 모델로 넘어간 호출 수",
+    ("model", "fallback"),
+))
+llm_breaker_state = registry.register(Gauge(
+    "llm_circuit_open",
+    "모델별 circuit breaker 상태 (1: open)",
+    ("model",),
+))
+llm_admission_rejected = registry.register(Counter(
+    "llm_admission_rejected_total",
+    "429로 거절된 LLM 요청 수 (rate_limit: 사용자별 한도, queue_timeout: 슬롯 대기 시간 초과)",
+    ("reason",),
+))
+db_pool_checkout_wait = registry.register(Histogram(
+    "db_pool_checkout_wait_seconds",
+    "커넥션 풀에서 커넥션을 받기까지 걸린 시간 (새 커넥션 생성 포함)",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+))
+db_pool_timeouts = registry.register(Counter(
+    "db_pool_timeouts_total",
+    "DB_POOL_TIMEOUT 안에 커넥션을 받지 못한 횟수",
+))
+db_slow_queries = registry.register(Counter(
+    "db_slow_queries_total",
+    "DB_SLOW_QUERY_MS 이상 걸린 SQL 실행 수",
+))
+db_statement_timeouts = registry.register(Counter(
+    "db_statement_timeouts_total",
+    "statement_timeout으로 취소된 SQL 실행 수",
+))
+event_loop_lag = registry.register(Histogram(
+    "event_loop_lag_seconds",
+    "이벤트 루프가 예약된 시각보다 늦게 깨어난 시간",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+))
+
+
+def record_llm_usage(model: str, usage) -> None:
+    """OpenAI 응답의 usage 객체(없으면 무시)를 토큰 카운터에 반영"""
+    if usage is None:
+        return
+    llm_tokens.inc(usage.prompt_tokens or 0, model=model, type="prompt")
+    llm_tokens.inc(usage.completion_tokens or 0, model=model, type="completion")
+
+
+# 실행 중인 바깥쪽 CRUD 호출이 있는지 (안쪽 호출은 중복 집계하지 않음)
+_in_crud: ContextVar[bool] = ContextVar("in_crud", default=False)
+
+
+def timed_crud(func: Callable) -> Callable:
+    """비동기 CRUD 함수의 실행 시간을 함수 이름 라벨로 기록 (CRUD 안에서 부른 CRUD는 제외)"""
+    name = f"{func.__module__.rsplit('.', 1)[-1]}.{func.__name__}"
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        if _in_crud.get():
+            return await func(*args, **kwargs)
+        token = _in_crud.set(True)
+        started = time.perf_counter()
+        try:
+            return await func(*args, **kwargs)
+        except Exception:
+            db_query_errors.inc(function=name)
+            raise
+        finally:
+            db_query_duration.observe(time.perf_counter() - started, function=name)
+            _in_crud.reset(token)
+
+    wrapper.__wrapped_crud__ = True
+    return wrapper
+
+
+def instrument_crud_module(module) -> None:
+    """모듈에 정의된 async 함수를 timed_crud로 교체 (모듈 속성으로 호출하는 곳 모두에 적용)"""
+    for attr, value in list(vars(module).items()):
+        if (
+            inspect.iscoroutinefunction(value)
+            and value.__module__ == module.__name__
+            and not getattr(value, "__wrapped_crud__", False)
+        ):
+            setattr(module, attr, timed_crud(value))
+
+
+async def monitor_event_loop_lag(interval: float = 0.5):
+    loop = asyncio.get_running_loop()
+    while True:
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        event_loop_lag.observe(max(0.0, loop.time() - expected))
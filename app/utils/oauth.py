@@ -1,34 +1,122 @@
+import hashlib
+import time
+from collections import OrderedDict
+from functools import lru_cache
 from typing import Dict, Optional
-import requests
 
-class OAuthHandler:
+import httpx
+
+from app.core.config import get_settings
+
+# 제공자별 토큰 검증(사용자 정보 조회) 엔드포인트
+PROVIDER_URLS = {
+    "kakao": "https://kapi.kakao.com/v2/user/me",
+    "naver": "https://openapi.naver.com/v1/nid/me",
+    "google": "https://www.googleapis.com/oauth2/v3/tokeninfo",
+}
+
+
+class VerifiedTokenCache:
+    """검증된 토큰 → user_info 단기 캐시 (토큰 원문 대신 sha256 해시를 키로 사용)"""
+
+    def __init__(self, ttl: float = 300, max_entries: int = 10000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+
     @staticmethod
-    async def verify_kakao_token(access_token: str) -> Optional[Dict]:
-        try:
-            headers = {"Authorization": f"Bearer {access_token}"}
-            response = requests.get("https://kauth.kakao.com/oauth/authorize", headers=headers)
-            response.raise_for_status()
-            return response.json()
-        except Exception as e:
+    def key(provider: str, access_token: str) -> str:
+        return hashlib.sha256(f"{provider}:{access_token}".encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict]:
+        entry = self._entries.get(key)
+        if entry is None:
             return None
+        expires_at, user_info = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        return user_info
 
-    @staticmethod
-    async def verify_naver_token(access_token: str) -> Optional[Dict]:
-        try:
-            headers = {"Authorization": f"Bearer {access_token}"}
-            response = requests.get("https://openapi.naver.com/v1/nid/me", headers=headers)
-            response.raise_for_status()
-            return response.json()
-        except Exception as e:
+    def set(self, key: str, user_info: Dict):
+        self._entries[key] = (time.monotonic() + self.ttl, user_info)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+class OAuthHandler:
+    """
+    제공자별 keep-alive 커넥션 풀을 유지하는 비동기 OAuth 토큰 검증기
+    """
+
+    def __init__(self, timeout: float = 5.0, max_connections: int = 20, cache_ttl: float = 300):
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._cache = VerifiedTokenCache(ttl=cache_ttl)
+
+    def _client(self, provider: str) -> httpx.AsyncClient:
+        client = self._clients.get(provider)
+        if client is None:
+            client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+                timeout=httpx.Timeout(self.timeout),
+            )
+            self._clients[provider] = client
+        return client
+
+    async def verify_token(self, provider: str, access_token: str) -> Optional[Dict]:
+        if provider not in PROVIDER_URLS or not access_token:
             return None
 
-    @staticmethod
-    async def verify_google_token(access_token: str) -> Optional[Dict]:
+        key = self._cache.key(provider, access_token)
+        user_info = self._cache.get(key)
+        if user_info is not None:
+            return user_info
+
         try:
-            response = requests.get(
-                f"https://www.googleapis.com/oauth2/v3/tokeninfo?access_token={access_token}"
-            )
+            if provider == "google":
+                response = await self._client(provider).get(
+                    PROVIDER_URLS[provider],
+                    params={"access_token": access_token},
+                )
+            else:
+                response = await self._client(provider).get(
+                    PROVIDER_URLS[provider],
+                    headers={"Authorization": f"Bearer {access_token}"},
+                )
             response.raise_for_status()
-            return response.json()
-        except Exception as e:
-            return None 
\ No newline at end of file
+            user_info = response.json()
+        except Exception:
+            return None
+
+        self._cache.set(key, user_info)
+        return user_info
+
+    async def verify_kakao_token(self, access_token: str) -> Optional[Dict]:
+        return await self.verify_token("kakao", access_token)
+
+    async def verify_naver_token(self, access_token: str) -> Optional[Dict]:
+        return await self.verify_token("naver", access_token)
+
+    async def verify_google_token(self, access_token: str) -> Optional[Dict]:
+        return await self.verify_token("google", access_token)
+
+    async def aclose(self):
+        for client in self._clients.values():
+            await client.aclose()
+        self._clients.clear()
+
+
+@lru_cache()
+def get_oauth_handler() -> OAuthHandler:
+    settings = get_settings()
+    return OAuthHandler(
+        timeout=settings.OAUTH_TIMEOUT,
+        max_connections=settings.OAUTH_MAX_CONNECTIONS,
+        cache_ttl=settings.OAUTH_TOKEN_CACHE_TTL,
+    )
@@ -0,0 +1,373 @@
+"""
+기존 초안 검색 (few-shot 참고 문단용 로컬 BM25 인덱스)
+
+- 초안 HTML을 문단 단위 passage로 나누고, 한글/영문/숫자를 글자 bigram으로 나눠 BM25로 색인
+  (형태소 분석기나 임베딩 서비스 없이 오프라인으로 동작)
+- (case_type, doc_type)별로 인덱스를 따로 두고, 세션의 현재 초안(생성/수정된 마지막 버전)만 유지
+  (인덱스마다 최근 초안 RETRIEVAL_MAX_DRAFTS개까지)
+- 색인/검색은 파일 I/O, flock, BM25 계산을 포함하므로 async 코드에서는 전용 스레드 하나에서
+  실행 (asearch/aadd_draft/aupdate_draft). 같은 스레드에서만 실행되므로 인덱스 접근도 직렬화됨
+- 변경 사항은 JSONL 로그 파일에 한 줄씩 추가해 영속화하고, 각 워커는 검색 전에 로그의
+  새 줄을 읽어 반영(다른 워커가 추가한 초안 포함). 로그가 살아있는 문서 수보다 충분히 커지면
+  시작 시 압축 (추가/압축은 flock으로 직렬화)
+
+    python -m app.utils.retrieval --compact   # 로그 압축
+"""
+import argparse
+import asyncio
+import fcntl
+import heapq
+import json
+import math
+import operator
+import os
+import re
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache, partial
+from html import unescape
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.core.config import get_settings
+
+BLOCK_END_RE = re.compile(r"</(?:p|h[1-6]|li|blockquote|pre|tr)>|<br\s*/?>", re.IGNORECASE)
+TAG_RE = re.compile(r"<[^>]+>")
+NON_WORD_RE = re.compile(r"[^0-9a-z가-힣]+")
+SENTENCE_END_RE = re.compile(r"(?<=[.?!다])\s+")
+
+Partition = Tuple[str, str]
+
+
+def html_to_text(html: str) -> str:
+    return unescape(TAG_RE.sub("", BLOCK_END_RE.sub("\n\n", html)))
+
+
+def term_counts(text: str) -> Counter:
+    """한글/영문/숫자 연속 구간의 글자 bigram 빈도 (한 글자 단어와 구간을 넘는 bigram은 제외)"""
+    text = NON_WORD_RE.sub(" ", text.lower())
+    counts = Counter(map(operator.add, text, text[1:]))
+    for term in [term for term in counts if " " in term]:
+        del counts[term]
+    return counts
+
+
+def split_passages(text: str, max_chars: int = 400) -> List[str]:
+    """빈 줄 기준 문단을 max_chars 이하로 묶거나(짧은 문단) 문장 단위로 자른다(긴 문단)"""
+    pieces = []
+    for paragraph in re.split(r"\n\s*\n", text):
+        paragraph = " ".join(paragraph.split())
+        if not paragraph:
+            continue
+        if len(paragraph) <= max_chars:
+            pieces.append(paragraph)
+            continue
+        for sentence in SENTENCE_END_RE.split(paragraph):
+            pieces.extend(sentence[i:i + max_chars] for i in range(0, len(sentence), max_chars))
+
+    passages: List[str] = []
+    for piece in pieces:
+        if passages and len(passages[-1]) + 1 + len(piece) <= max_chars:
+            passages[-1] += "\n" + piece
+        else:
+            passages.append(piece)
+    return passages
+
+
+class BM25Index:
+    """passage 단위 BM25 역색인 (문서 key별로 passage를 추가/교체/삭제)"""
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.passages: Dict[int, Tuple[str, str]] = {}  # passage id → (문서 key, 원문)
+        self.lengths: Dict[int, int] = {}
+        self.postings: Dict[str, Dict[int, int]] = defaultdict(dict)  # term → {passage id: tf}
+        self.documents: Dict[str, List[int]] = {}
+        self.total_length = 0
+        self._next_id = 0
+        self._norm_cache: Optional[Dict[int, float]] = None
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def add(self, key: str, passages: Iterable[str]):
+        self.remove(key)
+        self._norm_cache = None
+        ids = []
+        for passage in passages:
+            terms = term_counts(passage)
+            if not terms:
+                continue
+            pid = self._next_id
+            self._next_id += 1
+            self.passages[pid] = (key, passage)
+            self.lengths[pid] = sum(terms.values())
+            self.total_length += self.lengths[pid]
+            for term, tf in terms.items():
+                self.postings[term][pid] = tf
+            ids.append(pid)
+        self.documents[key] = ids
+
+    def remove(self, key: str):
+        if key in self.documents:
+            self._norm_cache = None
+        for pid in self.documents.pop(key, []):
+            _, passage = self.passages.pop(pid)
+            self.total_length -= self.lengths.pop(pid)
+            for term in term_counts(passage):
+                posting = self.postings[term]
+                posting.pop(pid, None)
+                if not posting:
+                    del self.postings[term]
+
+    def _norms(self) -> Dict[int, float]:
+        """passage별 BM25 길이 정규화 값 (색인이 바뀐 뒤 첫 검색에서 다시 계산)"""
+        if self._norm_cache is None:
+            average_length = self.total_length / len(self.passages)
+            base = self.k1 * (1 - self.b)
+            scale = self.k1 * self.b / average_length
+            self._norm_cache = {pid: base + scale * length for pid, length in self.lengths.items()}
+        return self._norm_cache
+
+    def search(
+        self,
+        query: str,
+        k: int = 3,
+        exclude: Optional[str] = None,
+        per_document: int = 1,
+        max_terms: int = 16
+    ) -> List[Tuple[float, str]]:
+        """
+        (점수, passage) 목록을 점수 높은 순으로. 한 문서에서는 per_document개까지
+        긴 질의는 idf가 높은(드문) term max_terms개만 사용
+        """
+        if not self.passages:
+            return []
+        n = len(self.passages)
+        terms = [(term, self.postings[term]) for term in term_counts(query) if term in self.postings]
+        terms.sort(key=lambda item: len(item[1]))
+        norms = self._norms()
+        k1 = self.k1 + 1
+        scores: Dict[int, float] = defaultdict(float)
+        for term, posting in terms[:max_terms]:
+            idf = math.log(1 + (n - len(posting) + 0.5) / (len(posting) + 0.5))
+            for pid, tf in posting.items():
+                scores[pid] += idf * tf * k1 / (tf + norms[pid])
+
+        results = []
+        taken: Counter = Counter()
+        ranked = ((score, pid) for pid, score in scores.items())
+        for score, pid in heapq.nlargest(k * per_document * 4, ranked):
+            key, passage = self.passages[pid]
+            if key == exclude or taken[key] >= per_document:
+                continue
+            taken[key] += 1
+            results.append((score, passage))
+            if len(results) == k:
+                break
+        return results
+
+
+class DraftRetriever:
+    """
+    (case_type, doc_type)별 BM25Index 묶음 + JSONL 로그 영속화
+    인덱스마다 가장 최근에 생성/수정된 초안 max_drafts개만 남긴다
+    로그 한 줄 = {"key", "case_type", "doc_type", "passages"}; passages가 null이면 삭제
+    path가 None이면 메모리에만 유지
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        passage_chars: int = 400,
+        max_drafts: int = 1000,
+        compact_ratio: float = 2.0
+    ):
+        self.path = Path(path) if path else None
+        self.passage_chars = passage_chars
+        self.max_drafts = max_drafts
+        self.compact_ratio = compact_ratio
+        self.indexes: Dict[Partition, BM25Index] = {}
+        self.partitions: Dict[str, Partition] = {}  # 문서 key → 소속 인덱스
+        self._offset = 0
+        self._inode: Optional[int] = None
+        self._records = 0
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def __len__(self) -> int:
+        return len(self.partitions)
+
+    async def _run(self, fn, *args, **kwargs):
+        """이벤트 루프를 막지 않도록 전용 스레드 하나에서 실행 (호출 순서대로 직렬화)"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="draft-retriever")
+        return await asyncio.get_running_loop().run_in_executor(self._executor, partial(fn, *args, **kwargs))
+
+    async def asearch(self, case_type: str, doc_type: str, query: str, k: int = 3, exclude: Optional[str] = None) -> List[str]:
+        return await self._run(self.search, case_type, doc_type, query, k, exclude=exclude)
+
+    async def aadd_draft(self, key: str, case_type: str, doc_type: str, html: str):
+        await self._run(self.add_draft, key, case_type, doc_type, html)
+
+    async def aupdate_draft(self, key: str, html: str, case_type: Optional[str] = None, doc_type: Optional[str] = None):
+        await self._run(self.update_draft, key, html, case_type, doc_type)
+
+    def load(self):
+        """로그를 처음부터 다시 읽음"""
+        self._reset()
+        self.sync()
+
+    def _reset(self):
+        self.indexes.clear()
+        self.partitions.clear()
+        self._offset = 0
+        self._inode = None
+        self._records = 0
+
+    def needs_compaction(self) -> bool:
+        return self._records > max(100, self.compact_ratio * len(self.partitions))
+
+    def sync(self):
+        """다른 워커를 포함해 로그에 새로 추가된 줄을 반영"""
+        if self.path is None:
+            return
+        try:
+            f = open(self.path, "rb")
+        except FileNotFoundError:
+            return
+        with f:
+            stat = os.fstat(f.fileno())
+            if stat.st_ino != self._inode or stat.st_size < self._offset:
+                self._reset()  # 처음 읽거나 다른 워커가 압축함
+                self._inode = stat.st_ino
+            if stat.st_size == self._offset:
+                return
+            f.seek(self._offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # 아직 쓰는 중인 줄
+                self._offset += len(line)
+                try:
+                    self._apply(json.loads(line))
+                except (ValueError, KeyError):
+                    continue
+                self._records += 1
+
+    def _apply(self, record: Dict):
+        key = record["key"]
+        partition = self.partitions.pop(key, None)
+        if partition is not None:
+            self.indexes[partition].remove(key)
+        if record.get("passages") is None:
+            return
+        partition = (record["case_type"], record["doc_type"])
+        index = self.indexes.get(partition)
+        if index is None:
+            index = self.indexes[partition] = BM25Index()
+        index.add(key, record["passages"])
+        self.partitions[key] = partition
+        # 인덱스별로 최근에 저장된 max_drafts개만 유지 (검색 시간/메모리 상한)
+        while len(index) > self.max_drafts:
+            oldest = next(iter(index.documents))
+            index.remove(oldest)
+            del self.partitions[oldest]
+
+    @contextmanager
+    def _locked_log(self):
+        """로그 파일을 배타적으로 연다 (기다리는 사이 압축으로 파일이 바뀌었으면 새 파일을 다시 연다)"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        while True:
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            if os.fstat(fd).st_ino == os.stat(self.path).st_ino:
+                break
+            os.close(fd)
+        try:
+            yield fd
+        finally:
+            os.close(fd)  # close하면 lock도 풀림
+
+    def _write(self, record: Dict):
+        if self.path is None:
+            self._apply(record)
+            return
+        line = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+        with self._locked_log() as fd:
+            os.write(fd, line)
+        self.sync()
+
+    def add_draft(self, key: str, case_type: str, doc_type: str, html: str):
+        passages = split_passages(html_to_text(html), self.passage_chars)
+        self._write({"key": key, "case_type": case_type, "doc_type": doc_type, "passages": passages})
+
+    def update_draft(self, key: str, html: str, case_type: Optional[str] = None, doc_type: Optional[str] = None):
+        """
+        수정된 초안을 다시 색인. case_type/doc_type을 주면 인덱스에서 밀려난 초안도 다시 추가하고,
+        주지 않으면 현재 색인된 초안만 갱신
+        """
+        self.sync()
+        partition = (case_type, doc_type) if case_type and doc_type else self.partitions.get(key)
+        if partition is not None:
+            self.add_draft(key, partition[0], partition[1], html)
+
+    def remove_draft(self, key: str):
+        self.sync()
+        if key in self.partitions:
+            self._write({"key": key, "passages": None})
+
+    def search(self, case_type: str, doc_type: str, query: str, k: int = 3, exclude: Optional[str] = None) -> List[str]:
+        self.sync()
+        index = self.indexes.get((case_type, doc_type))
+        if index is None:
+            return []
+        return [passage for _, passage in index.search(query, k, exclude=exclude)]
+
+    def compact(self):
+        """살아있는 문서만 남긴 로그로 교체"""
+        if self.path is None:
+            return
+        with self._locked_log():
+            self.sync()  # lock을 잡기 전에 추가된 줄까지 반영
+            tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                for key, (case_type, doc_type) in self.partitions.items():
+                    index = self.indexes[(case_type, doc_type)]
+                    passages = [index.passages[pid][1] for pid in index.documents.get(key, [])]
+                    f.write(json.dumps(
+                        {"key": key, "case_type": case_type, "doc_type": doc_type, "passages": passages},
+                        ensure_ascii=False,
+                    ) + "\n")
+            os.replace(tmp, self.path)
+            stat = self.path.stat()
+            self._inode, self._offset, self._records = stat.st_ino, stat.st_size, len(self.partitions)
+
+
+@lru_cache()
+def get_draft_retriever() -> DraftRetriever:
+    settings = get_settings()
+    retriever = DraftRetriever(
+        settings.RETRIEVAL_INDEX_PATH or None,
+        passage_chars=settings.RETRIEVAL_PASSAGE_CHARS,
+        max_drafts=settings.RETRIEVAL_MAX_DRAFTS,
+    )
+    retriever.load()
+    if retriever.needs_compaction():
+        retriever.compact()
+    return retriever
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--compact", action="store_true")
+    args = parser.parse_args()
+
+    retriever = get_draft_retriever()
+    if args.compact:
+        retriever.compact()
+    print(f"{len(retriever)} drafts in {len(retriever.indexes)} indexes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+import hmac
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+
+from fastapi import Depends, Header, HTTPException, Request, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from jose import JWTError, jwt
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.database import AsyncSessionLocal
+from app.database.cache import principal_cache
+from app.database.crud import auth as crud_auth
+from app.database.crud import users as crud_users
+from app.utils.admission import AdmissionRejected, get_rate_limiter, priority_for, set_llm_priority
+
+settings = get_settings()
+bearer_scheme = HTTPBearer(auto_error=False)
+
+
+def create_access_token(user_id: int) -> str:
+    expires_at = datetime.now(timezone.utc) + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    payload = {"sub": str(user_id), "exp": expires_at}
+    return jwt.encode(payload, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
+
+
+def decode_access_token(token: str) -> Optional[Dict]:
+    """서명/만료를 검증하고 payload를 반환. 유효하지 않으면 None (DB 조회 없음)"""
+    try:
+        return jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
+    except JWTError:
+        return None
+
+
+async def load_principal(db: AsyncSession, user_id: int) -> Optional[Dict]:
+    user = await crud_users.get_user(db, user_id)
+    if not user:
+        return None
+    verification = await crud_auth.get_attorney_verification(db, user_id)
+    return {
+        "id": user["id"],
+        "email": user["email"],
+        "name": user["name"],
+        "user_type": user["user_type"],
+        "subscription_type": user["subscription_type"],
+        "attorney_status": verification["verification_status"] if verification else None,
+    }
+
+
+async def get_principal(user_id: int) -> Optional[Dict]:
+    """캐시에 없을 때만 DB에서 principal을 만들어 캐시"""
+    principal = principal_cache.get(user_id)
+    if principal is None:
+        async with AsyncSessionLocal() as db:
+            principal = await load_principal(db, user_id)
+        if principal is not None:
+            principal_cache.set(user_id, principal)
+    return principal
+
+
+async def get_optional_user(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(bearer_scheme)
+) -> Optional[Dict]:
+    """
+    Authorization 헤더가 있으면 검증해서 principal을 반환, 없으면 None (비로그인 사용자)
+    """
+    if credentials is None:
+        return None
+
+    payload = decode_access_token(credentials.credentials)
+    if not payload or "sub" not in payload:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid access token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    try:
+        user_id = int(payload["sub"])
+    except (KeyError, ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid access token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    principal = await get_principal(user_id)
+    if principal is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return principal
+
+
+async def get_current_user(user: Optional[Dict] = Depends(get_optional_user)) -> Dict:
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return user
+
+
+async def admit_llm_request(
+    request: Request,
+    user: Optional[Dict] = Depends(get_optional_user)
+) -> Optional[Dict]:
+    """
+    LLM을 호출하는 엔드포인트용 get_optional_user: 사용자(비로그인은 IP)별 호출 빈도를 확인하고
+    이번 요청의 LLM 우선순위를 구독 여부에 따라 기록
+    """
+    if user:
+        key = f"user:{user['id']}"
+    else:
+        key = f"ip:{request.client.host if request.client else 'unknown'}"
+    try:
+        get_rate_limiter().check(key)
+    except AdmissionRejected as exc:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="요청이 너무 많습니다. 잠시 후 다시 시도해주세요.",
+            headers={"Retry-After": exc.retry_after_header},
+        )
+
+    set_llm_priority(priority_for(user))
+    return user
+
+
+def require_api_token(setting: str, header: str):
+    """
+    내부용(운영/지원팀) API 의존성: header 값이 settings.<setting>과 같아야 통과
+    설정 값이 없으면 해당 API는 404로 비활성화
+    """
+    def verify(token: Optional[str] = Header(None, alias=header)):
+        expected = getattr(settings, setting)
+        if not expected:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+        if not token or not hmac.compare_digest(token, expected):
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="잘못된 API 토큰입니다.")
+
+    return verify
@@ -0,0 +1,119 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, Dict, Hashable, List, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    같은 key의 작업이 이미 실행 중이면 새로 실행하지 않고 그 결과를 함께 기다린다
+
+    작업은 별도 task로 실행되므로 처음 요청한 클라이언트가 연결을 끊어도
+    함께 기다리는 요청들은 결과를 받는다.
+    """
+
+    def __init__(self):
+        self._tasks: Dict[Hashable, asyncio.Task] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._tasks[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task):
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+
+    def in_flight(self, key: Hashable) -> bool:
+        return key in self._tasks
+
+
+class _Flight:
+    """별도 task로 source를 끝까지 읽으며 받은 항목을 쌓아 두는 스트림 하나"""
+
+    def __init__(self, source: AsyncIterator):
+        self.items: List = []
+        self.done = False
+        self._changed = asyncio.Event()
+        self.task = asyncio.ensure_future(self._run(source))
+
+    async def _run(self, source: AsyncIterator):
+        try:
+            async for item in source:
+                self.items.append(item)
+                self._notify()
+        finally:
+            self.done = True
+            self._notify()
+
+    def _notify(self):
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def follow(self) -> AsyncIterator:
+        # 늦게 합류해도 처음 항목부터 받음
+        i = 0
+        while True:
+            while i < len(self.items):
+                yield self.items[i]
+                i += 1
+            if self.done:
+                return
+            await self._changed.wait()
+
+
+class StreamFlight:
+    """
+    스트리밍 응답용 SingleFlight: 같은 key의 스트림이 실행 중이면 새로 시작하지 않고 함께 받는다
+
+    source는 별도 task로 끝까지 실행되므로 구독자가 연결을 끊어도 나머지 구독자는 계속 받는다.
+    """
+
+    def __init__(self):
+        self._flights: Dict[Hashable, _Flight] = {}
+
+    def in_flight(self, key: Hashable) -> bool:
+        return key in self._flights
+
+    def start(self, key: Hashable, source: AsyncIterator):
+        if key in self._flights:
+            raise RuntimeError(f"stream already in flight: {key!r}")
+        flight = _Flight(source)
+        self._flights[key] = flight
+        flight.task.add_done_callback(lambda done: self._forget(key, flight))
+
+    def follow(self, key: Hashable) -> AsyncIterator:
+        """진행 중인 스트림의 구독자를 만듦 (호출 시점의 스트림에 묶임)"""
+        return self._flights[key].follow()
+
+    def _forget(self, key: Hashable, flight: _Flight):
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        if not flight.task.cancelled() and flight.task.exception() is not None:
+            logger.error("stream flight %r failed", key, exc_info=flight.task.exception())
+
+
+class KeyedLock:
+    """key(세션)별 asyncio.Lock. 기다리는 쪽이 없으면 lock을 정리한다"""
+
+    def __init__(self):
+        self._locks: Dict[Hashable, List] = {}
+
+    @asynccontextmanager
+    async def acquire(self, key: Hashable):
+        entry = self._locks.setdefault(key, [asyncio.Lock(), 0])
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                yield
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0:
+                self._locks.pop(key, None)
@@ -0,0 +1,24 @@
+import json
+from typing import AsyncIterator, Dict, Optional
+
+from fastapi.responses import StreamingResponse
+
+
+def sse_event(data: Dict, event: Optional[str] = None) -> str:
+    """server-sent event 한 건을 직렬화"""
+    lines = []
+    if event:
+        lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data, ensure_ascii=False, default=str)}")
+    return "\n".join(lines) + "\n\n"
+
+
+def sse_response(events: AsyncIterator[str]) -> StreamingResponse:
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",  # nginx 프록시 버퍼링 비활성화
+        },
+    )
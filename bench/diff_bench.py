@@ -0,0 +1,98 @@
+"""
+초안 diff 벤치마크: 기존 문자 단위 difflib.SequenceMatcher vs 토큰 단위 patience/Myers
+
+    python -m bench.diff_bench --sizes 1000,5000,10000,25000,50000 --edit-ratios 0.02,0.3,rewrite
+
+edit ratio 대신 rewrite를 주면 같은 길이의 무관한 초안과 비교 (전면 수정, Myers 최악 경우)
+"""
+import argparse
+import difflib
+import random
+import time
+
+from app.utils.diff import get_text_changes
+
+WORDS = [
+    "임대인", "임차인", "보증금", "반환", "청구", "계약", "기간", "만료", "원고", "피고",
+    "금", "원", "및", "이에", "대한", "지연손해금", "지급하라", "주택", "서울특별시", "강남구",
+]
+
+
+def make_draft(size: int, rng: random.Random) -> str:
+    parts = []
+    length = 0
+    while length < size:
+        sentence = " ".join(rng.choice(WORDS) for _ in range(rng.randint(6, 14)))
+        paragraph = f"<p>{sentence} {rng.randint(1, 99999):,}원.</p>\n"
+        parts.append(paragraph)
+        length += len(paragraph)
+    return "".join(parts)[:size]
+
+
+def edit_draft(text: str, edit_ratio: float, rng: random.Random) -> str:
+    words = text.split(" ")
+    for _ in range(max(1, int(len(words) * edit_ratio))):
+        i = rng.randrange(len(words))
+        action = rng.random()
+        if action < 0.4:
+            words[i] = rng.choice(WORDS)
+        elif action < 0.7:
+            words.insert(i, rng.choice(WORDS))
+        else:
+            words.pop(i)
+    return " ".join(words)
+
+
+def char_level_changes(old_text: str, new_text: str) -> dict:
+    """이전 구현 (문자 단위 SequenceMatcher)"""
+    differ = difflib.SequenceMatcher(None, old_text, new_text)
+    changes = []
+    for tag, i1, i2, j1, j2 in differ.get_opcodes():
+        if tag != 'equal':
+            changes.append({
+                'type': tag,
+                'oldText': old_text[i1:i2],
+                'newText': new_text[j1:j2],
+                'position': {'start': i1, 'end': i2}
+            })
+    return {'changes': changes}
+
+
+def timed(fn, *args, repeat: int = 3):
+    best = None
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn(*args)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="1000,5000,10000,25000,50000")
+    parser.add_argument("--edit-ratios", default="0.02,0.3,rewrite")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f"{'edit':>8} {'chars':>8} {'difflib ms':>12} {'changes':>8} {'token ms':>10} {'changes':>8} {'speedup':>8}")
+    for edit in args.edit_ratios.split(","):
+        for size in (int(s) for s in args.sizes.split(",")):
+            old_text = make_draft(size, rng)
+            if edit == "rewrite":
+                new_text = make_draft(size, rng)
+            else:
+                new_text = edit_draft(old_text, float(edit), rng)
+            old_time, old_result = timed(char_level_changes, old_text, new_text, repeat=args.repeat)
+            new_time, new_result = timed(get_text_changes, old_text, new_text, repeat=args.repeat)
+            print(
+                f"{edit:>8} {size:>8} {old_time * 1000:>12.1f} {len(old_result['changes']):>8} "
+                f"{new_time * 1000:>10.1f} {len(new_result['changes']):>8} {old_time / new_time:>7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
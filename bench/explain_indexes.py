@@ -0,0 +1,219 @@
+"""
+CRUD 쿼리 인덱스 사용 검증
+
+빈 로컬 Postgres에 인덱스 없는 테이블을 만들고 마이그레이션만으로 인덱스를 적용하고 현실적인 규모의 데이터를 채운 뒤,
+각 CRUD 함수를 실제로 호출해 실행된 SQL을 캡처하고 EXPLAIN으로 대상 테이블에
+Seq Scan이 없는지 확인합니다. 작은 테이블에서도 "쓸 수 있는 인덱스가 있는지"를
+검증하기 위해 EXPLAIN은 enable_seqscan = off 상태에서 실행합니다.
+
+    python -m bench.explain_indexes --database-url postgresql://user:pw@localhost:5432/holo_bench --scale 1
+
+주의: 대상 DB의 public 스키마를 지우고 다시 만듭니다. 전용 DB에서만 실행하세요.
+"""
+import argparse
+import asyncio
+import json
+import re
+import sys
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Tuple
+
+from sqlalchemy import MetaData, create_engine, event, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.database.cache import chat_history_cache
+from app.database.crud import auth as crud_auth
+from app.database.crud import cases as crud_cases
+from app.database.crud import chat as crud_chat
+from app.database.crud import doc_prompts as crud_prompts
+from app.database.crud import documents as crud_documents
+from app.database.crud import search as crud_search
+from app.database.crud import users as crud_users
+from app.database.migrate import MIGRATIONS_DIR, list_migrations, migrate
+from app.models import Base
+from app.models import auth, cases, chat, doc_prompts, documents, users  # noqa: F401 (metadata 등록)
+
+SEED_SQL = [
+    """
+    INSERT INTO users (email, password, name, user_type, subscription_type, created_at, updated_at)
+    SELECT 'user' || g || '@example.com', 'x', '사용자' || g,
+           CASE WHEN g % 20 = 0 THEN 'attorney' ELSE 'customer' END,
+           CASE WHEN g % 3 = 0 THEN 'subscription' ELSE 'per_doc' END,
+           now() - (g || ' minutes')::interval, now()
+    FROM generate_series(1, :users) g
+    """,
+    """
+    INSERT INTO cases (case_type, plaintiff_id, defendant_id, assigned_attorney_id, status, created_at, updated_at)
+    SELECT '민사-임대차', 1 + (g % :users), 1 + ((g * 7) % :users), 20 * (1 + (g % (:users / 20))),
+           'in_progress', now() - (g || ' seconds')::interval, now()
+    FROM generate_series(1, :cases) g
+    """,
+    """
+    INSERT INTO chat_sessions (id, context_data, created_at, updated_at)
+    SELECT g, '{}', now(), now() FROM generate_series(1, :sessions) g
+    """,
+    # id를 직접 넣었으므로 /chat/의 새 세션 생성이 겹치지 않도록 시퀀스를 맞춤
+    "SELECT setval(pg_get_serial_sequence('chat_sessions', 'id'), :sessions)",
+    """
+    INSERT INTO chat_messages (session_id, role, content, created_at)
+    SELECT 1 + (g % :sessions), CASE WHEN g % 2 = 0 THEN 'user' ELSE 'assistant' END,
+           '보증금 ' || g || '만원 반환 관련 문의입니다.', now() - (g || ' seconds')::interval
+    FROM generate_series(1, :messages) g
+    """,
+    """
+    INSERT INTO drafts (session_id, title, content, updated_at)
+    SELECT g::text, '소장', '<p>초안 ' || g || '</p>', now()
+    FROM generate_series(1, :sessions) g
+    """,
+    """
+    INSERT INTO doc_prompts (case_type, doc_type, prompt_text)
+    SELECT '유형' || (g / 10), '문서' || (g % 10), '프롬프트 ' || g
+    FROM generate_series(1, :prompts) g
+    """,
+    """
+    INSERT INTO oauth_accounts (user_id, provider, provider_account_id, provider_data, created_at, updated_at)
+    SELECT g, (ARRAY['kakao', 'naver', 'google'])[1 + g % 3], g::text, '{}', now(), now()
+    FROM generate_series(1, :users) g
+    """,
+    """
+    INSERT INTO attorney_verifications (user_id, license_number, bar_association, verification_status, created_at, updated_at)
+    SELECT 20 * g, 'L' || g, '서울지방변호사회',
+           CASE WHEN g % 4 = 0 THEN 'pending' ELSE 'approved' END,
+           now() - (g || ' minutes')::interval, now()
+    FROM generate_series(1, :users / 20) g
+    """,
+]
+
+
+def migration_tables(directory: Path = MIGRATIONS_DIR) -> set:
+    """마이그레이션이 직접 만드는 테이블 이름"""
+    names = set()
+    for _, path in list_migrations(directory):
+        names.update(re.findall(r"CREATE TABLE IF NOT EXISTS (\w+)", path.read_text(encoding="utf-8")))
+    return names
+
+
+def create_base_tables(engine):
+    """
+    마이그레이션이 만들지 않는 모델 테이블을 인덱스 없이 생성
+    (모델에 선언된 인덱스가 먼저 생기면 마이그레이션의 CREATE INDEX IF NOT EXISTS가
+    아무 일도 하지 않아 마이그레이션에 빠진 인덱스를 찾아낼 수 없음)
+    """
+    metadata = MetaData()
+    owned = migration_tables()
+    for table in Base.metadata.sorted_tables:
+        if table.name in owned:
+            continue
+        table.to_metadata(metadata).indexes.clear()
+    metadata.create_all(engine)
+
+
+def seed(database_url: str, scale: int):
+    """빈 스키마에 인덱스 없는 테이블을 만들고 마이그레이션만으로 인덱스를 적용한 뒤 데이터를 채움"""
+    engine = create_engine(database_url)
+    with engine.begin() as conn:
+        conn.exec_driver_sql("DROP SCHEMA public CASCADE")
+        conn.exec_driver_sql("CREATE SCHEMA public")
+    create_base_tables(engine)
+    migrate(engine)
+
+    volumes = {
+        "users": 20000 * scale,
+        "cases": 100000 * scale,
+        "sessions": 5000 * scale,
+        "messages": 500000 * scale,
+        "prompts": 200,
+    }
+    with engine.begin() as conn:
+        for sql in SEED_SQL:
+            conn.execute(text(sql), volumes)
+        conn.exec_driver_sql("ANALYZE")
+    engine.dispose()
+
+
+async def paged(fn: Callable[..., Awaitable[Dict]], *args):
+    """첫 페이지와 cursor를 사용한 두 번째 페이지를 모두 실행"""
+    page = await fn(*args, limit=20)
+    if page["next_cursor"]:
+        await fn(*args, cursor=page["next_cursor"], limit=20)
+
+
+# (검사 이름, 대상 테이블, CRUD 호출)
+CHECKS: List[Tuple[str, str, Callable[[AsyncSession], Awaitable]]] = [
+    ("get_chat_history", "chat_messages", lambda db: crud_chat.get_chat_history(db, 42)),
+    ("get_doc_prompts", "doc_prompts", lambda db: paged(crud_prompts.get_doc_prompts, db)),
+    ("get_draft", "drafts", lambda db: crud_documents.get_draft(db, "42")),
+    ("get_oauth_account", "oauth_accounts", lambda db: crud_auth.get_oauth_account(db, "naver", "4")),
+    ("get_attorney_verification", "attorney_verifications", lambda db: crud_auth.get_attorney_verification(db, 40)),
+    ("get_attorney_by_license", "attorney_verifications", lambda db: crud_auth.get_attorney_by_license(db, "L2")),
+    ("get_pending_verifications", "attorney_verifications", lambda db: paged(crud_auth.get_pending_verifications, db)),
+    ("get_case", "cases", lambda db: crud_cases.get_case(db, 42)),
+    ("get_user_cases", "cases", lambda db: paged(crud_cases.get_user_cases, db, 42)),
+    ("get_attorney_cases", "cases", lambda db: paged(crud_cases.get_attorney_cases, db, 40)),
+    ("get_my_cases", "cases", lambda db: paged(crud_cases.get_my_cases, db, 40)),
+    ("get_user", "users", lambda db: crud_users.get_user(db, 42)),
+    ("get_user_by_email", "users", lambda db: crud_users.get_user_by_email(db, "user42@example.com")),
+    ("get_users", "users", lambda db: paged(crud_users.get_users, db)),
+    ("search_content", "chat_messages", lambda db: paged(crud_search.search_content, db, "보증금 4242")),
+    ("search_content(draft)", "drafts", lambda db: crud_search.search_content(db, "초안 42", source="draft")),
+]
+
+
+def seq_scanned_tables(plan: Dict) -> List[str]:
+    tables = []
+    if plan.get("Node Type") == "Seq Scan":
+        tables.append(plan.get("Relation Name"))
+    for child in plan.get("Plans", []):
+        tables.extend(seq_scanned_tables(child))
+    return tables
+
+
+async def explain_checks(database_url: str) -> bool:
+    engine = create_async_engine(database_url.replace("postgresql://", "postgresql+asyncpg://", 1))
+    captured: List[Tuple[str, tuple]] = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        captured.append((statement, parameters))
+
+    ok = True
+    async with AsyncSession(engine) as db:
+        for name, table, call in CHECKS:
+            chat_history_cache.clear()
+            captured.clear()
+            event.listen(engine.sync_engine, "before_cursor_execute", capture)
+            try:
+                await call(db)
+            finally:
+                event.remove(engine.sync_engine, "before_cursor_execute", capture)
+
+            conn = await db.connection()
+            await conn.exec_driver_sql("SET enable_seqscan = off")
+            for statement, parameters in list(captured):
+                result = await conn.exec_driver_sql("EXPLAIN (FORMAT JSON) " + statement, parameters)
+                plan = result.scalar()
+                plan = json.loads(plan) if isinstance(plan, str) else plan
+                scanned = seq_scanned_tables(plan[0]["Plan"])
+                status = "FAIL" if table in scanned else "ok"
+                ok = ok and status == "ok"
+                print(f"{status:>4}  {name:<28} {table:<24} seq scans: {scanned or '-'}")
+            await conn.exec_driver_sql("RESET enable_seqscan")
+            await db.rollback()
+    await engine.dispose()
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--database-url", required=True, help="postgresql://... (전용 벤치마크 DB)")
+    parser.add_argument("--scale", type=int, default=1)
+    parser.add_argument("--skip-seed", action="store_true")
+    args = parser.parse_args()
+
+    if not args.skip_seed:
+        seed(args.database_url, args.scale)
+    if not asyncio.run(explain_checks(args.database_url)):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
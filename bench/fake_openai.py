@@ -0,0 +1,228 @@
+"""
+로컬 부하 테스트용 OpenAI 호환 가짜 completion 서버
+
+    python -m bench.fake_openai --port 8100 --latency 0.5 --jitter 0.1 --response-chars 2000
+
+- latency(±jitter) 초 뒤에 응답하며, stream=true면 첫 chunk까지 latency를 기다린 뒤
+  chunk 사이에 token_interval 초씩 쉬면서 SSE로 나눠 보냅니다.
+- response_chars를 주면 그 길이의 초안 형태 텍스트를 만들어 돌려줍니다.
+- 초안 수정 요청("Draft content: ..." 메시지)에는 보낸 초안에서 단어의 edit_ratio 비율만 바꾼 사본을
+  돌려줍니다. edit_ratio가 1 이상이면 같은 길이의 새 텍스트로 전면 수정합니다.
+  실행 중에 POST /bench/edit_ratio {"edit_ratio": 0.3}으로 바꿀 수 있습니다.
+- slow_ratio 비율의 요청은 slow_latency 초 뒤에, error_ratio 비율의 요청은 500으로 응답하고,
+  fail_models에 있는 모델은 항상 500으로 응답합니다 (hedge/fallback/circuit breaker 검증용).
+  실행 중에 app.state.faults 값을 바꿔 장애 상황을 바꿀 수 있습니다.
+- 같은 seed면 같은 순서로 같은 응답/지연이 나옵니다.
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+import uuid
+from typing import Optional, Sequence
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+WORDS = [
+    "임대인", "임차인", "보증금", "반환", "청구", "계약", "기간", "만료", "원고", "피고",
+    "지연손해금", "지급하라", "주택", "서울특별시", "강남구", "이에", "대한", "및",
+]
+
+
+def make_content(rng: random.Random, chars: Optional[int]) -> str:
+    if not chars:
+        return "가짜 응답입니다."
+    paragraphs = []
+    length = 0
+    while length < chars:
+        sentence = " ".join(rng.choice(WORDS) for _ in range(rng.randint(6, 14)))
+        paragraph = f"{sentence} {rng.randint(1, 99999):,}원.\n\n"
+        paragraphs.append(paragraph)
+        length += len(paragraph)
+    return "".join(paragraphs)[:chars]
+
+
+DRAFT_PREFIX = "Draft content: "
+
+
+def edit_content(rng: random.Random, text: str, edit_ratio: float) -> str:
+    """단어의 edit_ratio 비율을 바꾸거나 끼워 넣거나 지운 사본"""
+    if edit_ratio >= 1:
+        return make_content(rng, len(text))
+    words = text.split(" ")
+    for _ in range(max(1, int(len(words) * edit_ratio))):
+        i = rng.randrange(len(words))
+        action = rng.random()
+        if action < 0.4:
+            words[i] = rng.choice(WORDS)
+        elif action < 0.7:
+            words.insert(i, rng.choice(WORDS))
+        elif len(words) > 1:
+            words.pop(i)
+    return " ".join(words)
+
+
+def sent_draft(body: dict) -> Optional[str]:
+    for message in reversed(body.get("messages", [])):
+        content = message.get("content") or ""
+        if message.get("role") == "user" and content.startswith(DRAFT_PREFIX):
+            return content[len(DRAFT_PREFIX):]
+    return None
+
+
+def create_app(
+    latency: float = 0.5,
+    jitter: float = 0.0,
+    response_chars: Optional[int] = None,
+    chunk_chars: int = 8,
+    token_interval: float = 0.0,
+    seed: int = 0,
+    edit_ratio: float = 0.02,
+    slow_ratio: float = 0.0,
+    slow_latency: float = 5.0,
+    error_ratio: float = 0.0,
+    fail_models: Sequence[str] = (),
+) -> FastAPI:
+    app = FastAPI(title="Fake OpenAI")
+    rng = random.Random(seed)
+    app.state.faults = {
+        "slow_ratio": slow_ratio,
+        "slow_latency": slow_latency,
+        "error_ratio": error_ratio,
+        "fail_models": set(fail_models),
+    }
+    app.state.edit_ratio = edit_ratio
+
+    def delay() -> float:
+        if rng.random() < app.state.faults["slow_ratio"]:
+            return app.state.faults["slow_latency"]
+        return max(0.0, latency + rng.uniform(-jitter, jitter))
+
+    def failure(model: str) -> Optional[JSONResponse]:
+        if model in app.state.faults["fail_models"] or rng.random() < app.state.faults["error_ratio"]:
+            return JSONResponse(
+                status_code=500,
+                content={"error": {"message": "injected failure", "type": "server_error", "code": None}},
+            )
+        return None
+
+    def usage(body: dict, content: str) -> dict:
+        prompt_tokens = sum(len(m.get("content") or "") for m in body.get("messages", []))
+        return {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": len(content),
+            "total_tokens": prompt_tokens + len(content),
+        }
+
+    async def stream(body: dict, completion_id: str, content: str, wait: float):
+        model = body.get("model", "gpt-4o-mini")
+        await asyncio.sleep(wait)
+        for i in range(0, len(content), chunk_chars):
+            chunk = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{"index": 0, "delta": {"content": content[i:i + chunk_chars]}, "finish_reason": None}],
+            }
+            yield f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n"
+            if token_interval:
+                await asyncio.sleep(token_interval)
+        final = {
+            "id": completion_id,
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+        }
+        yield f"data: {json.dumps(final)}\n\n"
+        if (body.get("stream_options") or {}).get("include_usage"):
+            usage_chunk = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [],
+                "usage": usage(body, content),
+            }
+            yield f"data: {json.dumps(usage_chunk)}\n\n"
+        yield "data: [DONE]\n\n"
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+        draft = sent_draft(body)
+        if draft is not None:
+            content = edit_content(rng, draft, app.state.edit_ratio)
+        else:
+            content = make_content(rng, response_chars)
+        wait = delay()
+        error = failure(body.get("model", "gpt-4o-mini"))
+        if error is not None:
+            await asyncio.sleep(min(wait, latency))
+            return error
+
+        if body.get("stream"):
+            return StreamingResponse(stream(body, completion_id, content, wait), media_type="text/event-stream")
+
+        await asyncio.sleep(wait)
+        return {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "gpt-4o-mini"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": usage(body, content),
+        }
+
+    @app.post("/bench/edit_ratio")
+    async def set_edit_ratio(request: Request):
+        app.state.edit_ratio = float((await request.json())["edit_ratio"])
+        return {"edit_ratio": app.state.edit_ratio}
+
+    return app
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency", type=float, default=0.5)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--response-chars", type=int, default=None)
+    parser.add_argument("--chunk-chars", type=int, default=8)
+    parser.add_argument("--token-interval", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--edit-ratio", type=float, default=0.02, help="초안 수정 응답에서 바꿀 단어 비율 (1 이상이면 전면 수정)")
+    parser.add_argument("--slow-ratio", type=float, default=0.0)
+    parser.add_argument("--slow-latency", type=float, default=5.0)
+    parser.add_argument("--error-ratio", type=float, default=0.0)
+    parser.add_argument("--fail-models", default="", help="항상 500으로 응답할 모델 (쉼표 구분)")
+    args = parser.parse_args()
+    app = create_app(
+        args.latency,
+        jitter=args.jitter,
+        response_chars=args.response_chars,
+        chunk_chars=args.chunk_chars,
+        token_interval=args.token_interval,
+        seed=args.seed,
+        edit_ratio=args.edit_ratio,
+        slow_ratio=args.slow_ratio,
+        slow_latency=args.slow_latency,
+        error_ratio=args.error_ratio,
+        fail_models=[m for m in args.fail_models.split(",") if m],
+    )
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
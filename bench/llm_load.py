@@ -0,0 +1,68 @@
+"""
+LLMGateway 부하 테스트
+
+가짜 completion 서버를 같은 프로세스에서 띄우고 동시성 단계별 처리량을 측정합니다.
+동시성에 비례해 처리량이 늘어나면 게이트웨이가 이벤트 루프를 막지 않는다는 뜻입니다.
+
+    python -m bench.llm_load --latency 0.5 --rounds 5 --concurrency 1,8,32,64
+"""
+import argparse
+import asyncio
+import time
+
+import uvicorn
+
+from app.utils.llm import LLMGateway
+from bench.fake_openai import create_app
+
+
+async def run_level(gateway: LLMGateway, total: int, concurrency: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            await gateway.chat_completion([{"role": "user", "content": "안녕하세요"}])
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    return total / (time.perf_counter() - started)
+
+
+async def main_async(args):
+    server = uvicorn.Server(uvicorn.Config(
+        create_app(args.latency), host="127.0.0.1", port=args.port, log_level="warning"
+    ))
+    server_task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+
+    levels = [int(c) for c in args.concurrency.split(",")]
+    gateway = LLMGateway(
+        api_key="fake",
+        base_url=f"http://127.0.0.1:{args.port}/v1",
+        max_concurrency=max(levels),
+        max_connections=max(levels),
+    )
+    try:
+        print(f"{'concurrency':>12} {'req/s':>10} {'ideal':>10}")
+        for level in levels:
+            # 단계마다 동시성 × rounds 건을 보내 소요 시간을 비슷하게 맞춘다
+            throughput = await run_level(gateway, level * args.rounds, level)
+            print(f"{level:>12} {throughput:>10.1f} {level / args.latency:>10.1f}")
+    finally:
+        await gateway.aclose()
+        server.should_exit = True
+        await server_task
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency", type=float, default=0.5)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--concurrency", default="1,8,32,64")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
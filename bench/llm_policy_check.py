@@ -0,0 +1,169 @@
+"""
+LLM 호출 정책(hedge / fallback / circuit breaker / deadline) 검증
+
+느린 응답과 오류를 섞어 보내는 가짜 completion 서버를 같은 프로세스에서 띄우고
+LLMGateway를 정책별로 호출해 기대한 동작을 하는지 확인합니다. 하나라도 실패하면 exit 1.
+
+    python -m bench.llm_policy_check --calls 200 --slow-ratio 0.05 --slow-latency 3
+"""
+import argparse
+import asyncio
+import sys
+import time
+from typing import List
+
+import uvicorn
+
+from app.utils.llm import LLMGateway, is_retryable_error
+from app.utils.llm_policy import LLMCallPolicy, LLMDeadlineExceeded, LLMUnavailable
+from bench.fake_openai import create_app
+
+MESSAGES = [{"role": "user", "content": "보증금 반환 소송 절차를 알려주세요."}]
+
+
+def make_gateway(port: int, **policy) -> LLMGateway:
+    return LLMGateway(
+        api_key="fake",
+        base_url=f"http://127.0.0.1:{port}/v1",
+        model="gpt-4o-mini",
+        max_retries=0,  # 재시도는 정책만으로
+        policy=LLMCallPolicy(is_retryable=is_retryable_error, **policy),
+    )
+
+
+def p99(values: List[float]) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+
+
+async def timed_calls(gateway: LLMGateway, calls: int, concurrency: int = 8) -> List[float]:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+
+    async def one():
+        async with semaphore:
+            started = time.perf_counter()
+            await gateway.chat_completion(MESSAGES)
+            latencies.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(one() for _ in range(calls)))
+    return latencies
+
+
+async def check_hedge(app, args) -> bool:
+    app.state.faults.update(slow_ratio=args.slow_ratio, error_ratio=0.0, fail_models=set())
+    results = {}
+    for label, percentile in (("off", 0.0), ("p95", 95.0)):
+        gateway = make_gateway(args.port, deadline=30, hedge_percentile=percentile, hedge_min_delay=0.2)
+        try:
+            results[label] = p99(await timed_calls(gateway, args.calls))
+        finally:
+            await gateway.aclose()
+    ok = results["p95"] < results["off"] / 2
+    print(f"{'ok' if ok else 'FAIL':>4}  hedge            p99 off={results['off']:.2f}s hedged={results['p95']:.2f}s")
+    return ok
+
+
+async def check_fallback(app, args) -> bool:
+    app.state.faults.update(slow_ratio=0.0, error_ratio=0.0, fail_models={"gpt-4o-mini"})
+    gateway = make_gateway(args.port, deadline=10, hedge_percentile=0, fallback_models=["gpt-4o"])
+    try:
+        await timed_calls(gateway, 20)
+        ok = True
+    except Exception as exc:
+        print(f"      fallback error: {exc!r}")
+        ok = False
+    finally:
+        await gateway.aclose()
+    print(f"{'ok' if ok else 'FAIL':>4}  fallback         gpt-4o-mini 500 -> gpt-4o 응답")
+    return ok
+
+
+async def check_breaker(app, args) -> bool:
+    app.state.faults.update(slow_ratio=0.0, error_ratio=0.0, fail_models={"gpt-4o-mini"})
+    gateway = make_gateway(args.port, deadline=10, hedge_percentile=0, failure_threshold=3, cooldown=60)
+    outcomes = []
+    try:
+        for _ in range(6):
+            started = time.perf_counter()
+            try:
+                await gateway.chat_completion(MESSAGES)
+                outcomes.append(("ok", time.perf_counter() - started))
+            except LLMUnavailable:
+                outcomes.append(("shed", time.perf_counter() - started))
+            except Exception:
+                outcomes.append(("error", time.perf_counter() - started))
+    finally:
+        await gateway.aclose()
+    kinds = [kind for kind, _ in outcomes]
+    shed_latency = max((elapsed for kind, elapsed in outcomes if kind == "shed"), default=None)
+    ok = kinds == ["error"] * 3 + ["shed"] * 3 and shed_latency < 0.01
+    print(f"{'ok' if ok else 'FAIL':>4}  circuit breaker  {kinds} (차단된 호출 최대 {(shed_latency or 0) * 1000:.1f}ms)")
+    return ok
+
+
+async def check_deadline(app, args) -> bool:
+    app.state.faults.update(slow_ratio=1.0, error_ratio=0.0, fail_models=set())
+    gateway = make_gateway(args.port, deadline=0.5, hedge_percentile=0)
+    started = time.perf_counter()
+    try:
+        await gateway.chat_completion(MESSAGES)
+        ok = False
+    except LLMDeadlineExceeded:
+        ok = time.perf_counter() - started < 0.7
+    finally:
+        await gateway.aclose()
+    print(f"{'ok' if ok else 'FAIL':>4}  deadline         0.5s deadline -> {time.perf_counter() - started:.2f}s")
+    return ok
+
+
+async def check_stream_fallback(app, args) -> bool:
+    app.state.faults.update(slow_ratio=0.0, error_ratio=0.0, fail_models={"gpt-4o-mini"})
+    gateway = make_gateway(args.port, deadline=10, fallback_models=["gpt-4o"])
+    try:
+        text = "".join([delta async for delta in gateway.stream_chat_completion(MESSAGES)])
+        ok = bool(text)
+    except Exception as exc:
+        print(f"      stream error: {exc!r}")
+        ok = False
+    finally:
+        await gateway.aclose()
+    print(f"{'ok' if ok else 'FAIL':>4}  stream fallback  첫 토큰 전 실패 시 gpt-4o로 전환")
+    return ok
+
+
+async def main_async(args) -> bool:
+    app = create_app(args.latency, jitter=args.latency / 2, slow_latency=args.slow_latency, seed=args.seed)
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=args.port, log_level="warning"))
+    server_task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+
+    try:
+        results = [
+            await check_hedge(app, args),
+            await check_fallback(app, args),
+            await check_breaker(app, args),
+            await check_deadline(app, args),
+            await check_stream_fallback(app, args),
+        ]
+    finally:
+        server.should_exit = True
+        await server_task
+    return all(results)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency", type=float, default=0.1)
+    parser.add_argument("--slow-ratio", type=float, default=0.05)
+    parser.add_argument("--slow-latency", type=float, default=3.0)
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    if not asyncio.run(main_async(parser.parse_args())):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
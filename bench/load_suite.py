@@ -0,0 +1,394 @@
+"""
+API 부하 테스트 / 회귀 검사 스위트
+
+시드된 로컬 Postgres와 가짜 OpenAI 서버(bench.fake_openai)를 상대로 실제 API 서버(uvicorn)를
+띄우고, 시나리오별로 동시성 단계마다 p50/p95/p99 지연 시간과 처리량을 측정해 JSON으로 저장합니다.
+
+    python -m bench.load_suite --database-url postgresql://user:pw@localhost:5432/holo_bench \\
+        --concurrency 1,8,32 --requests 20 --output bench/results/latest.json
+
+    # 이전 결과 대비 p95가 20% 넘게 느려진 시나리오가 있으면 exit 1
+    python -m bench.load_suite --database-url ... --skip-seed --compare bench/results/baseline.json
+
+시나리오:
+    chat            세션 하나에서 /chat/ 멀티턴 대화 (워커마다 다른 세션)
+    generate_draft  /documents/generate_draft (응답 캐시 미사용)
+    update_draft    --draft-chars 크기의 초안을 /documents/update_draft로 수정 (diff 포함)
+                    가짜 LLM은 보낸 초안에서 --edit-ratio 비율의 단어만 바꿔 돌려줌
+    update_draft_rewrite
+                    update_draft와 같지만 가짜 LLM이 초안을 전면 수정 (diff 최악 경우)
+    cases           /cases/user/{id}, /cases/attorney/{id} 첫 페이지 조회 (해당 사용자의 토큰으로)
+
+주의: --skip-seed가 아니면 대상 DB의 public 스키마를 지우고 다시 만듭니다. 전용 DB에서만 실행하세요.
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional
+from urllib.parse import urlparse
+
+import httpx
+from jose import jwt
+from sqlalchemy import create_engine, text
+
+from bench.explain_indexes import seed
+from bench.fake_openai import make_content
+
+SCENARIOS = ("chat", "generate_draft", "update_draft", "update_draft_rewrite", "cases")
+DRAFT_SCENARIOS = ("update_draft", "update_draft_rewrite")
+REWRITE_EDIT_RATIO = 1.0
+
+# 시드 데이터 기준 값 (bench.explain_indexes.SEED_SQL)
+SESSIONS_PER_SCALE = 5000
+USERS_PER_SCALE = 20000
+DRAFT_CASE_TYPE = "유형0"
+DRAFT_DOC_TYPE = "문서1"
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """nearest-rank 백분위수"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(q / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class SessionPool:
+    """시나리오마다 겹치지 않는 chat/draft 세션 id 구간을 나눠 준다"""
+
+    def __init__(self, sessions: int):
+        self.block = sessions // len(SCENARIOS)
+        self.next = {name: i * self.block + 1 for i, name in enumerate(SCENARIOS)}
+
+    def range(self, scenario: str) -> range:
+        start = SCENARIOS.index(scenario) * self.block + 1
+        return range(start, start + self.block)
+
+    def take(self, scenario: str) -> str:
+        session_id = self.next[scenario]
+        if session_id >= self.range(scenario).stop:
+            raise RuntimeError(f"{scenario}: 시드된 세션이 부족합니다. --scale을 늘리세요.")
+        self.next[scenario] += 1
+        return str(session_id)
+
+
+def prepare_large_drafts(database_url: str, session_ids: range, chars: int, seed_value: int):
+    """update_draft 시나리오용 세션의 초안을 chars 길이의 HTML로 교체"""
+    rng = random.Random(seed_value)
+    engine = create_engine(database_url)
+    with engine.begin() as conn:
+        conn.execute(
+            text("UPDATE drafts SET content = :content WHERE session_id = :session_id"),
+            [
+                {
+                    "session_id": str(session_id),
+                    "content": "".join(f"<p>{p}</p>\n" for p in make_content(rng, chars).split("\n\n") if p),
+                }
+                for session_id in session_ids
+            ],
+        )
+    engine.dispose()
+
+
+def app_env(args) -> Dict[str, str]:
+    url = urlparse(args.database_url)
+    env = {
+        # .env가 없어도 Settings가 만들어지도록 필수 값의 기본값
+        "JWT_SECRET_KEY": "bench-secret",
+        "JWT_ALGORITHM": "HS256",
+        "ACCESS_TOKEN_EXPIRE_MINUTES": "30",
+        "DOCUMENTS_DIR": "/tmp/holo-bench-documents",
+        "ALLOWED_DOCUMENT_TYPES": "docx,pdf",
+        "MAX_DOCUMENT_SIZE": "10485760",
+    }
+    env.update(os.environ)
+    env.update({
+        "POSTGRES_USER": url.username or "",
+        "POSTGRES_PASSWORD": url.password or "",
+        "POSTGRES_HOST": url.hostname or "localhost",
+        "POSTGRES_PORT": str(url.port or 5432),
+        "POSTGRES_DB": url.path.lstrip("/"),
+        "OPENAI_API_KEY": "fake",
+        "OPENAI_BASE_URL": f"http://127.0.0.1:{args.llm_port}/v1",
+        "LLM_CACHE_ENABLED": "false",
+        "JOB_BACKEND": "memory",
+        "PROMPT_REFRESH_INTERVAL": "0",
+    })
+    return env
+
+
+def start_processes(args) -> List[subprocess.Popen]:
+    fake_llm = subprocess.Popen([
+        sys.executable, "-m", "bench.fake_openai",
+        "--port", str(args.llm_port),
+        "--latency", str(args.llm_latency),
+        "--jitter", str(args.llm_jitter),
+        "--response-chars", str(args.draft_chars),
+        "--edit-ratio", str(args.edit_ratio),
+        "--seed", str(args.seed),
+    ])
+    api = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "app.main:app",
+            "--host", "127.0.0.1", "--port", str(args.app_port),
+            "--workers", str(args.app_workers), "--log-level", "warning",
+        ],
+        env=app_env(args),
+    )
+    return [fake_llm, api]
+
+
+async def wait_until_ready(client: httpx.AsyncClient, url: str, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            if (await client.get(url)).status_code < 500:
+                return
+        except httpx.TransportError:
+            pass
+        if time.monotonic() > deadline:
+            raise RuntimeError(f"{url} 이 {timeout}초 안에 응답하지 않습니다.")
+        await asyncio.sleep(0.2)
+
+
+# 시나리오: (client, session_id, iteration, rng) -> response
+Request = Callable[[httpx.AsyncClient, str, int, random.Random], Awaitable[httpx.Response]]
+
+
+async def chat_turn(client, session_id, iteration, rng):
+    return await client.post("/chat/", json={
+        "session_id": session_id,
+        "message": {"role": "user", "content": f"{iteration + 1}번째 질문입니다. 보증금 {rng.randint(1, 9999)}만원을 돌려받으려면?"},
+    })
+
+
+async def generate_draft(client, session_id, iteration, rng):
+    return await client.post("/documents/generate_draft", json={
+        "session_id": session_id,
+        "case_type": DRAFT_CASE_TYPE,
+        "doc_type": DRAFT_DOC_TYPE,
+        "use_cache": False,
+    })
+
+
+async def update_draft(client, session_id, iteration, rng):
+    return await client.post("/documents/update_draft", json={"session_id": session_id})
+
+
+def bearer(user_id: int, env: Dict[str, str]) -> Dict[str, str]:
+    """API 서버와 같은 JWT 설정으로 만든 사용자 토큰 헤더"""
+    token = jwt.encode(
+        {"sub": str(user_id), "exp": datetime.now(timezone.utc) + timedelta(hours=1)},
+        env["JWT_SECRET_KEY"],
+        algorithm=env["JWT_ALGORITHM"],
+    )
+    return {"Authorization": f"Bearer {token}"}
+
+
+def list_cases(users: int, env: Dict[str, str]):
+    """본인 사건만 조회할 수 있으므로 조회 대상 사용자의 토큰으로 요청"""
+    async def request(client, session_id, iteration, rng):
+        if iteration % 2:
+            attorney_id = 20 * rng.randint(1, users // 20)
+            return await client.get(
+                f"/cases/attorney/{attorney_id}", params={"limit": 20}, headers=bearer(attorney_id, env)
+            )
+        user_id = rng.randint(1, users)
+        return await client.get(f"/cases/user/{user_id}", params={"limit": 20}, headers=bearer(user_id, env))
+    return request
+
+
+async def run_level(
+    client: httpx.AsyncClient,
+    scenario: str,
+    request: Request,
+    sessions: SessionPool,
+    concurrency: int,
+    requests_per_worker: int,
+    seed_value: int,
+) -> Dict:
+    """concurrency개의 워커가 각자 세션 하나로 requests_per_worker번 연달아 요청 (closed loop)"""
+    latencies: List[float] = []
+    errors: Dict[str, int] = {}
+
+    async def worker(worker_id: int):
+        rng = random.Random(f"{seed_value}:{scenario}:{concurrency}:{worker_id}")
+        session_id = sessions.take(scenario)
+        for iteration in range(requests_per_worker):
+            started = time.perf_counter()
+            try:
+                response = await request(client, session_id, iteration, rng)
+                status = str(response.status_code) if response.status_code >= 400 else None
+            except httpx.HTTPError as exc:
+                status = exc.__class__.__name__
+            elapsed = time.perf_counter() - started
+            if status:
+                errors[status] = errors.get(status, 0) + 1
+            else:
+                latencies.append(elapsed)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    wall = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "scenario": scenario,
+        "concurrency": concurrency,
+        "requests": concurrency * requests_per_worker,
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / wall, 2) if wall else 0.0,
+        "latency_ms": {
+            "p50": round(percentile(latencies, 50) * 1000, 2),
+            "p95": round(percentile(latencies, 95) * 1000, 2),
+            "p99": round(percentile(latencies, 99) * 1000, 2),
+            "mean": round(sum(latencies) / len(latencies) * 1000, 2) if latencies else 0.0,
+            "max": round(latencies[-1] * 1000, 2) if latencies else 0.0,
+        },
+    }
+
+
+def compare(results: List[Dict], baseline_path: str, tolerance: float) -> List[str]:
+    """baseline 대비 p95가 tolerance 비율 넘게 늘었거나 오류가 새로 생긴 항목"""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {(r["scenario"], r["concurrency"]): r for r in json.load(f)["results"]}
+
+    regressions = []
+    for result in results:
+        before = baseline.get((result["scenario"], result["concurrency"]))
+        if before is None:
+            continue
+        label = f"{result['scenario']}@{result['concurrency']}"
+        old_p95, new_p95 = before["latency_ms"]["p95"], result["latency_ms"]["p95"]
+        if old_p95 and new_p95 > old_p95 * (1 + tolerance):
+            regressions.append(f"{label}: p95 {old_p95}ms -> {new_p95}ms")
+        if result["errors"] and not before["errors"]:
+            regressions.append(f"{label}: errors {result['errors']}")
+    return regressions
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def set_llm_edit_ratio(args, edit_ratio: float):
+    """가짜 LLM이 초안 수정 요청에 돌려줄 수정 비율을 바꿈"""
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{args.llm_port}") as llm:
+        response = await llm.post("/bench/edit_ratio", json={"edit_ratio": edit_ratio})
+        response.raise_for_status()
+
+
+async def run_suite(args, sessions: SessionPool) -> List[Dict]:
+    levels = [int(c) for c in args.concurrency.split(",")]
+    requests: Dict[str, Request] = {
+        "chat": chat_turn,
+        "generate_draft": generate_draft,
+        "update_draft": update_draft,
+        "update_draft_rewrite": update_draft,
+        "cases": list_cases(USERS_PER_SCALE * args.scale, app_env(args)),
+    }
+    results = []
+    async with httpx.AsyncClient(
+        base_url=f"http://127.0.0.1:{args.app_port}",
+        limits=httpx.Limits(max_connections=max(levels), max_keepalive_connections=max(levels)),
+        timeout=args.timeout,
+    ) as client:
+        await wait_until_ready(client, "/")
+        print(f"{'scenario':<16} {'conc':>5} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}  errors")
+        for scenario in args.scenarios.split(","):
+            if scenario in DRAFT_SCENARIOS:
+                await set_llm_edit_ratio(
+                    args, REWRITE_EDIT_RATIO if scenario == "update_draft_rewrite" else args.edit_ratio
+                )
+            # 커넥션 풀/프롬프트 캐시 준비용 워밍업 (결과에서 제외)
+            await run_level(client, scenario, requests[scenario], sessions, 1, 1, args.seed)
+            for level in levels:
+                result = await run_level(
+                    client, scenario, requests[scenario], sessions, level, args.requests, args.seed
+                )
+                latency = result["latency_ms"]
+                print(
+                    f"{scenario:<16} {level:>5} {result['throughput_rps']:>8.1f} {latency['p50']:>9.1f} "
+                    f"{latency['p95']:>9.1f} {latency['p99']:>9.1f}  {result['errors'] or '-'}"
+                )
+                results.append(result)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--database-url", required=True, help="postgresql://... (전용 벤치마크 DB)")
+    parser.add_argument("--scale", type=int, default=1)
+    parser.add_argument("--skip-seed", action="store_true")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--concurrency", default="1,8,32")
+    parser.add_argument("--requests", type=int, default=20, help="워커당 요청 수")
+    parser.add_argument("--llm-latency", type=float, default=0.3)
+    parser.add_argument("--llm-jitter", type=float, default=0.1)
+    parser.add_argument("--draft-chars", type=int, default=20000)
+    parser.add_argument("--edit-ratio", type=float, default=0.02, help="update_draft에서 가짜 LLM이 바꿀 단어 비율")
+    parser.add_argument("--app-port", type=int, default=8001)
+    parser.add_argument("--app-workers", type=int, default=1)
+    parser.add_argument("--llm-port", type=int, default=8100)
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=None, help="결과 JSON 경로 (기본: bench/results/<시각>.json)")
+    parser.add_argument("--compare", default=None, help="비교할 이전 결과 JSON")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="허용하는 p95 증가 비율")
+    args = parser.parse_args()
+
+    unknown = set(args.scenarios.split(",")) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"알 수 없는 시나리오: {', '.join(sorted(unknown))}")
+
+    if not args.skip_seed:
+        seed(args.database_url, args.scale)
+    sessions = SessionPool(SESSIONS_PER_SCALE * args.scale)
+    for scenario in DRAFT_SCENARIOS:
+        prepare_large_drafts(args.database_url, sessions.range(scenario), args.draft_chars, args.seed)
+
+    processes = start_processes(args)
+    try:
+        results = asyncio.run(run_suite(args, sessions))
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.wait()
+
+    output = Path(args.output or f"bench/results/{datetime.now():%Y%m%d-%H%M%S}.json")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    report = {
+        "meta": {
+            "revision": git_revision(),
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "args": {k: v for k, v in vars(args).items() if k != "database_url"},
+        },
+        "results": results,
+    }
+    output.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"saved {output}")
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
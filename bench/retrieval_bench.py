@@ -0,0 +1,139 @@
+"""
+초안 참고 인덱스(BM25) 색인/검색 성능 측정
+
+합성 초안 N개를 (case_type, doc_type) 파티션에 나눠 색인하고 다음을 측정합니다.
+- build: 메모리 인덱스에 초안을 하나씩 추가하는 시간 (문단 분리/토큰화 포함)
+- persist: JSONL 로그에 추가하며 색인하는 시간 (워커가 초안을 저장할 때와 같은 경로)
+- load: 로그를 처음부터 다시 읽는 시간 (워커 시작 시), compact 후 다시 읽는 시간
+- query: 대화 형태의 질의로 top-k 발췌를 찾는 시간 p50/p95/p99
+
+    python -m bench.retrieval_bench --drafts 20000 --partitions 4 --queries 1000
+"""
+import argparse
+import json
+import random
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from app.utils.retrieval import DraftRetriever
+
+PARTIES = ["김민수", "이영희", "박철수", "최지은", "정하늘", "강도윤", "윤서연", "장우진"]
+PLACES = ["서울특별시 강남구", "서울특별시 마포구", "부산광역시 해운대구", "경기도 성남시", "인천광역시 남동구"]
+CLAUSES = [
+    "원고는 {date} 피고와 {place} 소재 주택에 관하여 보증금 {amount}원의 임대차계약을 체결하였습니다.",
+    "임대차계약은 {date} 기간 만료로 종료되었으나 피고는 보증금을 반환하지 않고 있습니다.",
+    "원고는 피고에게 내용증명을 발송하여 보증금 {amount}원의 반환을 청구하였습니다.",
+    "피고는 원고에게 {amount}원 및 이에 대한 소장 부본 송달 다음 날부터 다 갚는 날까지 연 12%의 비율로 계산한 돈을 지급하라.",
+    "원고는 {date} 피고에게 {amount}원을 대여하였고 변제기는 {date}로 정하였습니다.",
+    "피고는 변제기가 지났음에도 차용금을 변제하지 않고 있으므로 원고는 이 사건 청구에 이르렀습니다.",
+    "피고 {party}은 {date} {place}에서 원고 소유 차량을 손괴하여 수리비 {amount}원 상당의 손해를 입혔습니다.",
+    "소송비용은 피고가 부담한다. 제1항은 가집행할 수 있다.",
+    "원고와 피고는 {date} 근로계약을 체결하였으며 피고는 임금 {amount}원을 지급하지 않았습니다.",
+    "이에 원고는 청구취지와 같은 판결을 구하기 위하여 이 사건 소를 제기합니다.",
+]
+CASE_TYPES = ["민사-임대차", "민사-대여금", "민사-손해배상", "노동-임금"]
+DOC_TYPES = ["소장", "내용증명", "지급명령신청서"]
+
+
+def fill(rng: random.Random, template: str) -> str:
+    return template.format(
+        date=f"20{rng.randint(15, 24)}. {rng.randint(1, 12)}. {rng.randint(1, 28)}.",
+        place=rng.choice(PLACES),
+        amount=f"{rng.randint(1, 500) * 1000000:,}",
+        party=rng.choice(PARTIES),
+    )
+
+
+def make_draft(rng: random.Random, chars: int) -> str:
+    """markdown → HTML 변환 결과와 비슷한 <p> 문단 초안"""
+    paragraphs = []
+    length = 0
+    while length < chars:
+        paragraph = " ".join(fill(rng, rng.choice(CLAUSES)) for _ in range(rng.randint(1, 3)))
+        paragraphs.append(f"<p>{paragraph}</p>")
+        length += len(paragraph)
+    return "\n".join(paragraphs)
+
+
+def make_query(rng: random.Random) -> str:
+    """채팅에서 사용자가 사건을 설명하는 형태의 질의"""
+    return " ".join(fill(rng, rng.choice(CLAUSES)) for _ in range(rng.randint(2, 5)))
+
+
+def percentile(values: List[float], p: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))]
+
+
+def run(args) -> Dict:
+    rng = random.Random(args.seed)
+    partitions = [(c, d) for c in CASE_TYPES for d in DOC_TYPES][:args.partitions]
+    drafts = [(f"s{i}", rng.choice(partitions), make_draft(rng, args.chars)) for i in range(args.drafts)]
+    queries = [(rng.choice(partitions), make_query(rng)) for _ in range(args.queries)]
+    result: Dict = {"drafts": args.drafts, "partitions": len(partitions), "draft_chars": args.chars}
+
+    retriever = DraftRetriever(passage_chars=args.passage_chars, max_drafts=args.max_drafts)
+    started = time.perf_counter()
+    for key, (case_type, doc_type), html in drafts:
+        retriever.add_draft(key, case_type, doc_type, html)
+    result["build_seconds"] = round(time.perf_counter() - started, 3)
+    result["indexed_drafts"] = len(retriever)
+    result["indexed_passages"] = sum(len(index.passages) for index in retriever.indexes.values())
+    result["terms"] = sum(len(index.postings) for index in retriever.indexes.values())
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "draft_index.jsonl"
+        retriever = DraftRetriever(path, passage_chars=args.passage_chars, max_drafts=args.max_drafts)
+        started = time.perf_counter()
+        for key, (case_type, doc_type), html in drafts:
+            retriever.add_draft(key, case_type, doc_type, html)
+        result["persist_seconds"] = round(time.perf_counter() - started, 3)
+        result["log_mb"] = round(path.stat().st_size / 1024 / 1024, 2)
+
+        retriever = DraftRetriever(path, passage_chars=args.passage_chars, max_drafts=args.max_drafts)
+        started = time.perf_counter()
+        retriever.load()
+        result["load_seconds"] = round(time.perf_counter() - started, 3)
+        started = time.perf_counter()
+        retriever.compact()
+        result["compact_seconds"] = round(time.perf_counter() - started, 3)
+        result["compacted_log_mb"] = round(path.stat().st_size / 1024 / 1024, 2)
+        retriever = DraftRetriever(path, passage_chars=args.passage_chars, max_drafts=args.max_drafts)
+        started = time.perf_counter()
+        retriever.load()
+        result["compacted_load_seconds"] = round(time.perf_counter() - started, 3)
+
+        latencies = []
+        hits = 0
+        for (case_type, doc_type), query in queries:
+            started = time.perf_counter()
+            found = retriever.search(case_type, doc_type, query, k=args.top_k)
+            latencies.append(time.perf_counter() - started)
+            hits += bool(found)
+
+    result["query_ms"] = {
+        "p50": round(percentile(latencies, 50) * 1000, 2),
+        "p95": round(percentile(latencies, 95) * 1000, 2),
+        "p99": round(percentile(latencies, 99) * 1000, 2),
+    }
+    result["queries_with_hits"] = hits
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--drafts", type=int, default=20000)
+    parser.add_argument("--partitions", type=int, default=4)
+    parser.add_argument("--chars", type=int, default=1500, help="초안 하나의 대략적인 글자 수")
+    parser.add_argument("--passage-chars", type=int, default=400)
+    parser.add_argument("--max-drafts", type=int, default=1000, help="인덱스별 유지 초안 수 (RETRIEVAL_MAX_DRAFTS)")
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--top-k", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    print(json.dumps(run(parser.parse_args()), ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
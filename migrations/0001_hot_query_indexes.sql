@@ -0,0 +1,36 @@
+-- 핫 쿼리용 인덱스와 유니크 제약
+-- (운영 DB에 적용할 때는 쓰기 잠금 시간을 고려해 트래픽이 적은 시간에 실행)
+
+-- get_chat_history: 세션별 대화를 시간순으로 조회
+CREATE INDEX IF NOT EXISTS ix_chat_messages_session_id_created_at
+    ON chat_messages (session_id, created_at);
+
+-- get_doc_prompt / get_doc_prompts
+CREATE UNIQUE INDEX IF NOT EXISTS uq_doc_prompts_case_type_doc_type
+    ON doc_prompts (case_type, doc_type);
+CREATE INDEX IF NOT EXISTS ix_doc_prompts_case_type_doc_type_id
+    ON doc_prompts (case_type, doc_type, id);
+
+-- get_draft / update_draft
+CREATE INDEX IF NOT EXISTS ix_drafts_session_id
+    ON drafts (session_id);
+
+-- get_oauth_account
+CREATE UNIQUE INDEX IF NOT EXISTS uq_oauth_accounts_provider_account_id
+    ON oauth_accounts (provider, provider_account_id);
+
+-- get_user_cases / get_attorney_cases
+CREATE INDEX IF NOT EXISTS ix_cases_plaintiff_created_at_id
+    ON cases (plaintiff_id, created_at, id);
+CREATE INDEX IF NOT EXISTS ix_cases_attorney_created_at_id
+    ON cases (assigned_attorney_id, created_at, id);
+
+-- get_attorney_verification / get_pending_verifications
+CREATE INDEX IF NOT EXISTS ix_attorney_verifications_user_id
+    ON attorney_verifications (user_id);
+CREATE INDEX IF NOT EXISTS ix_attorney_verifications_status_created_at_id
+    ON attorney_verifications (verification_status, created_at, id);
+
+-- get_users
+CREATE INDEX IF NOT EXISTS ix_users_created_at_id
+    ON users (created_at, id);
@@ -0,0 +1,14 @@
+-- 초안 revision 이력 (주기적 스냅샷 + 직전 revision 대비 delta)
+CREATE TABLE IF NOT EXISTS draft_revisions (
+    id SERIAL PRIMARY KEY,
+    session_id VARCHAR(50) NOT NULL,
+    revision INTEGER NOT NULL,
+    is_snapshot BOOLEAN NOT NULL,
+    content TEXT,
+    delta JSONB,
+    created_at TIMESTAMP NOT NULL DEFAULT now(),
+    CONSTRAINT uq_draft_revisions_session_id_revision UNIQUE (session_id, revision),
+    CONSTRAINT ck_draft_revisions_payload CHECK (
+        (is_snapshot AND content IS NOT NULL) OR (NOT is_snapshot AND delta IS NOT NULL)
+    )
+);
@@ -0,0 +1,18 @@
+-- 백그라운드 작업 큐 (초안 생성 등)
+CREATE TABLE IF NOT EXISTS jobs (
+    id VARCHAR(36) PRIMARY KEY,
+    kind VARCHAR(50) NOT NULL,
+    status VARCHAR(20) NOT NULL DEFAULT 'pending',  -- pending, running, succeeded, failed
+    payload JSONB NOT NULL,
+    result JSONB,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    created_at TIMESTAMP NOT NULL DEFAULT now(),
+    started_at TIMESTAMP,
+    heartbeat_at TIMESTAMP,
+    finished_at TIMESTAMP
+);
+
+-- claim_job: 가장 오래된 pending 작업 / requeue_stale_jobs: 오래된 running 작업
+CREATE INDEX IF NOT EXISTS ix_jobs_status_created_at
+    ON jobs (status, created_at);
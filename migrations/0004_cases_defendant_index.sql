@@ -0,0 +1,3 @@
+-- get_my_cases: 피고로 참여한 사건도 (created_at, id) 순서로 읽도록
+CREATE INDEX IF NOT EXISTS ix_cases_defendant_created_at_id
+    ON cases (defendant_id, created_at, id);
@@ -0,0 +1,19 @@
+-- search_content: chat_messages.content / drafts.content 본문 검색용 bigram(2글자) 인덱스
+-- 형태소 분석기 없이 한국어 부분 문자열 검색을 하기 위해 공백을 제외한 연속 2글자를 GIN으로 색인한다
+-- (pg_trgm은 3글자 단위라 2글자 검색어에 인덱스를 쓰지 못하고, C locale에서는 한글을 단어 문자로 보지 않음)
+CREATE OR REPLACE FUNCTION text_bigrams(value text) RETURNS text[]
+    LANGUAGE sql IMMUTABLE STRICT PARALLEL SAFE
+AS $$
+    SELECT coalesce(array_agg(DISTINCT gram), '{}')
+    FROM (SELECT string_to_array(lower(value), NULL) AS chars) s,
+         LATERAL (
+             SELECT chars[i] || chars[i + 1] AS gram
+             FROM generate_series(1, cardinality(chars) - 1) AS i
+         ) grams
+    WHERE gram !~ '\s'
+$$;
+
+CREATE INDEX IF NOT EXISTS ix_chat_messages_content_bigrams
+    ON chat_messages USING gin (text_bigrams(content));
+CREATE INDEX IF NOT EXISTS ix_drafts_content_bigrams
+    ON drafts USING gin (text_bigrams(content));
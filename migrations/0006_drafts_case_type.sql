@@ -0,0 +1,3 @@
+-- 초안의 case_type (참고 인덱스에서 밀려난 초안을 수정할 때 다시 색인할 파티션)
+-- 기존 행은 NULL로 남고, 다음 생성부터 채워짐
+ALTER TABLE drafts ADD COLUMN IF NOT EXISTS case_type VARCHAR(50);
@@ -0,0 +1,36 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.database import get_db
+from app.router import cases
+from app.utils.security import get_current_user
+
+CASE = {"id": 1, "plaintiff_id": 10, "defendant_id": 20, "assigned_attorney_id": 30}
+
+def make_client(monkeypatch, user_id=None) -> TestClient:
+    async def fake_get_case(db, case_id):
+        return dict(CASE) if case_id == CASE["id"] else None
+
+    async def fake_db():
+        yield None
+
+    monkeypatch.setattr(cases.crud_cases, "get_case", fake_get_case)
+    app = FastAPI()
+    app.include_router(cases.router)
+    app.dependency_overrides[get_db] = fake_db
+    if user_id is not None:
+        app.dependency_overrides[get_current_user] = lambda: {"id": user_id}
+    return TestClient(app)
+
+def test_get_case_allows_parties(monkeypatch):
+    for user_id in (10, 20, 30):
+        response = make_client(monkeypatch, user_id).get("/cases/1")
+        assert response.status_code == 200
+        assert response.json()["id"] == 1
+
+def test_get_case_rejects_stranger(monkeypatch):
+    response = make_client(monkeypatch, 99).get("/cases/1")
+    assert response.status_code == 404
+
+def test_get_case_requires_login(monkeypatch):
+    response = make_client(monkeypatch).get("/cases/1")
+    assert response.status_code == 401